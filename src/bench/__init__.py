@@ -0,0 +1,23 @@
+"""Headless benchmarks for SnakeAI: seeded workloads, JSON output and baseline comparison.
+
+Run ``python -m src.bench --help`` for the command line.
+"""
+
+from .generators import GENERATORS, Workload, generate, workloads
+from .runner import ALGORITHMS, SIZES, Measurement, Regression, compare, load, measure, run_suite, save
+
+__all__ = [
+	"ALGORITHMS",
+	"GENERATORS",
+	"SIZES",
+	"Measurement",
+	"Regression",
+	"Workload",
+	"compare",
+	"generate",
+	"load",
+	"measure",
+	"run_suite",
+	"save",
+	"workloads",
+]
@@ -0,0 +1,127 @@
+"""Route growing crowds of agents through one grid with the cooperative planner.
+
+Every run places ``agents`` agents on distinct free cells of a seeded
+workload, each with its own distinct goal, and steps the planner until all
+of them have arrived or ``max_steps`` ran out. Start and goal cells are drawn
+from the component holding the workload's start, so every goal is reachable
+when the board is empty. Only ``step`` calls are timed; the collision check
+that follows every step is not.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from random import Random
+from time import perf_counter
+from typing import List, Optional, Sequence
+import argparse
+import sys
+
+from src.game.snake.cooperative import CooperativePlanner
+from src.game.snake.field import distance_field
+from .generators import GENERATORS, generate
+
+
+COUNTS = (1, 10, 100, 1000)
+
+
+@dataclass
+class AgentReport:
+    agents: int
+    workload: str
+    seed: int
+    window: int
+    steps: int
+    arrived: int
+    rounds: int
+    # agents planned, one per agent per round
+    routed: int
+    failures: int
+    # steps in which two agents shared a cell or swapped along an edge; always 0 unless broken
+    collisions: int
+    # seconds spent in planner steps
+    time: float
+
+    @property
+    def throughput(self) -> float:
+        """Agents routed per second."""
+        return self.routed / self.time if self.time else 0.0
+
+
+def run_agents(
+    counts: Sequence[int] = COUNTS,
+    kind: str = "random10",
+    size: int = 100,
+    window: int = 16,
+    seed: int = 0,
+    max_steps: Optional[int] = None,
+) -> List[AgentReport]:
+    workload = generate(kind, size, seed)
+    grid = workload.grid
+    field = distance_field(grid.index(*workload.start), grid)
+    reachable = [cell for cell, distance in enumerate(field.distances) if distance >= 0]
+    max_steps = max_steps if max_steps is not None else 4 * size
+    reports: List[AgentReport] = []
+    for count in counts:
+        if 2 * count > len(reachable):
+            raise ValueError(f"{workload.name} has {len(reachable)} reachable cells, too few for {count} agents")
+        cells = Random(f"agents:{count}:{seed}").sample(reachable, 2 * count)
+        planner = CooperativePlanner(grid, window)
+        for start, goal in zip(cells[:count], cells[count:]):
+            planner.add_agent(start, goal)
+
+        collisions = 0
+        elapsed = 0.0
+        before = list(planner.positions)
+        while planner.time < max_steps and not planner.done:
+            began = perf_counter()
+            after = planner.step()
+            elapsed += perf_counter() - began
+            moves = {(source, target) for source, target in zip(before, after) if source != target}
+            if len(set(after)) < count or any((target, source) in moves for source, target in moves):
+                collisions += 1
+            before = list(after)
+
+        reports.append(
+            AgentReport(
+                count,
+                workload.name,
+                seed,
+                window,
+                planner.time,
+                planner.arrived,
+                planner.rounds,
+                planner.routed,
+                planner.failures,
+                collisions,
+                elapsed,
+            )
+        )
+    return reports
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench.agents", description="Benchmark cooperative multi-agent routing.")
+    parser.add_argument("--counts", type=lambda text: [int(count) for count in text.split(",")], default=list(COUNTS))
+    parser.add_argument("--kind", choices=list(GENERATORS), default="random10")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--window", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, help="stop each run after this many steps (default 4 * size)")
+    args = parser.parse_args(argv)
+
+    reports = run_agents(args.counts, args.kind, args.size, args.window, args.seed, args.max_steps)
+    for report in reports:
+        print(
+            f"{report.agents:6d} agents {report.arrived:6d} arrived in {report.steps:5d} steps "
+            f"{report.rounds:4d} rounds {report.failures:4d} failures {report.collisions:3d} collisions "
+            f"{report.time:8.3f} s {report.throughput:10.1f} agents/s"
+        )
+    if any(report.collisions for report in reports):
+        print("FAILED: agents collided", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
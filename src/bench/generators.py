@@ -0,0 +1,134 @@
+"""Seeded grid workloads for the benchmark runner.
+
+Every generator builds a FlatGrid directly, so even 2000x2000 grids are
+produced without going through nested lists. The same (kind, size, seed)
+always yields the same grid and the same endpoints.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from random import Random
+from typing import Callable, Dict, List, Tuple
+
+from src.game.snake.field import distance_field
+from src.utils.grid import Coord, FlatGrid
+
+
+# side length of the square rooms in "rooms" workloads, walls included
+ROOM_SIZE = 12
+DENSITIES = (0.1, 0.2, 0.3)
+# free square at the origin of random workloads, where the start is placed
+CLEAR_CORNER = 4
+
+
+@dataclass
+class Workload:
+    name: str
+    kind: str
+    size: int
+    seed: int
+    grid: FlatGrid
+    start: Coord
+    goal: Coord
+
+
+def open_field(size: int, rng: Random) -> FlatGrid:
+    return FlatGrid(size, size)
+
+
+def random_obstacles(size: int, rng: Random, density: float) -> FlatGrid:
+    grid = FlatGrid(size, size)
+    cells = grid.cells
+    stride = grid.stride
+    for x in range(size):
+        begin = (x + 1) * stride + 1
+        cells[begin : begin + size] = bytes(rng.random() < density for _ in range(size))
+    # below the percolation threshold most free cells form one component; a clear corner
+    # keeps the start out of the small pockets
+    for x in range(min(CLEAR_CORNER, size)):
+        begin = grid.index(x, 0)
+        cells[begin : begin + min(CLEAR_CORNER, size)] = bytes(min(CLEAR_CORNER, size))
+    return grid
+
+
+def maze(size: int, rng: Random) -> FlatGrid:
+    """Recursive-backtracker maze: passages on even coordinates, walls in between."""
+    grid = FlatGrid(size, size)
+    cells = grid.cells
+    for x in range(size):
+        begin = grid.index(x, 0)
+        cells[begin : begin + size] = b"\x01" * size
+    # the walk moves two cells at a time, and clears the wall it jumps over
+    stride = grid.stride
+    steps = (2 * stride, -2 * stride, 2, -2)
+    start = grid.index(0, 0)
+    cells[start] = 0
+    stack = [start]
+    while stack:
+        current = stack[-1]
+        options = []
+        for step in steps:
+            # the border is blocked too, so unvisited cells are told apart by their coordinates
+            x, y = divmod(current + step, stride)
+            if 1 <= x <= size and 1 <= y <= size and cells[current + step]:
+                options.append(step)
+        if not options:
+            stack.pop()
+            continue
+        step = rng.choice(options)
+        cells[current + step // 2] = 0
+        cells[current + step] = 0
+        stack.append(current + step)
+    return grid
+
+
+def rooms(size: int, rng: Random) -> FlatGrid:
+    """Square rooms on a regular lattice, with one door per wall between two rooms."""
+    grid = FlatGrid(size, size)
+    cells = grid.cells
+    inner = ROOM_SIZE - 1
+    for wall in range(inner, size, ROOM_SIZE):
+        for begin in range(0, size, ROOM_SIZE):
+            # doors never fall on a wall line, so crossing walls cannot close them
+            across = rng.randrange(begin, min(begin + inner, size))
+            down = rng.randrange(begin, min(begin + inner, size))
+            for along in range(begin, min(begin + ROOM_SIZE, size)):
+                if along != across:
+                    cells[grid.index(wall, along)] = 1
+                if along != down:
+                    cells[grid.index(along, wall)] = 1
+    return grid
+
+
+def _endpoints(grid: FlatGrid) -> Tuple[Coord, Coord]:
+    # start at the first free cell, aim for the reachable cell farthest from it
+    start = grid.cells.find(0)
+    if start < 0:
+        raise ValueError("workload grid has no free cell")
+    distances = distance_field(start, grid).distances
+    goal = distances.index(max(distances))
+    return grid.coord(start), grid.coord(goal)
+
+
+GENERATORS: Dict[str, Callable[[int, Random], FlatGrid]] = {
+    "open": open_field,
+    **{f"random{round(density * 100)}": partial(random_obstacles, density=density) for density in DENSITIES},
+    "maze": maze,
+    "rooms": rooms,
+}
+
+
+def generate(kind: str, size: int, seed: int = 0) -> Workload:
+    try:
+        generator = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"unknown workload kind {kind!r}, expected one of {sorted(GENERATORS)}") from None
+    grid = generator(size, Random(f"{kind}:{size}:{seed}"))
+    start, goal = _endpoints(grid)
+    return Workload(f"{kind}-{size}", kind, size, seed, grid, start, goal)
+
+
+def workloads(kinds: List[str], sizes: List[int], seed: int = 0) -> List[Workload]:
+    return [generate(kind, size, seed) for size in sizes for kind in kinds]
@@ -0,0 +1,255 @@
+"""Run SnakeAI algorithms over seeded workloads and compare against a baseline.
+
+Each (workload, algorithm) pair is timed on fresh SnakeAI instances with
+trace "none", so the lean loops are measured and persistent planners (HPA*,
+D* Lite) are measured cold, build included. The fastest of ``repeat`` runs
+is kept. Expansions come from one extra run with SearchStats attached, and
+peak memory, when requested, from one more under tracemalloc, so neither
+instrument skews the timing.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+
+from src.game.snake.ai import SnakeAI
+from src.utils.stats import SearchStats
+from .generators import GENERATORS, Workload, workloads
+
+
+SIZES = (20, 100, 500, 2000)
+ALGORITHMS = (
+    "dfs",
+    "bfs",
+    "ucs",
+    "a_star",
+    "bi_bfs",
+    "bi_a_star",
+    "jps",
+    "ucs_heading",
+    "a_star_heading",
+    "wavefront",
+    "hpa_star",
+    "d_star_lite",
+)
+# differences below these are noise, whatever the relative change
+TIME_FLOOR = 0.001
+MEMORY_FLOOR = 64 * 1024
+
+
+@dataclass
+class Measurement:
+    workload: str
+    kind: str
+    size: int
+    seed: int
+    algorithm: str
+    found: bool
+    path_length: int
+    path_cost: Optional[float]
+    expansions: int
+    # seconds, best of the timed runs
+    time: float
+    # bytes, None unless memory was measured
+    peak_memory: Optional[int]
+
+    @property
+    def key(self) -> Tuple[str, int, str]:
+        return (self.workload, self.seed, self.algorithm)
+
+
+@dataclass
+class Regression:
+    workload: str
+    seed: int
+    algorithm: str
+    metric: str
+    baseline: object
+    current: object
+
+    def __str__(self) -> str:
+        return f"{self.workload} (seed {self.seed}) {self.algorithm}: {self.metric} {self.baseline} -> {self.current}"
+
+
+def available_algorithms() -> List[str]:
+    """ALGORITHMS that can run here: wavefront needs numpy."""
+    return [name for name in ALGORITHMS if name != "wavefront" or importlib.util.find_spec("numpy")]
+
+
+def path_cost(path: Sequence[int], turn_penalty: float) -> float:
+    """Cost of an index path under the SnakeAI cost model: 1 per move plus the turn penalty."""
+    cost = float(len(path) - 1)
+    for before, current, after in zip(path, path[1:], path[2:]):
+        if current - before != after - current:
+            cost += turn_penalty
+    return cost
+
+
+def measure(workload: Workload, algorithm: str, repeat: int = 3, memory: bool = False, turn_penalty: float = 0.5) -> Measurement:
+    grid = workload.grid
+    start, goal = grid.index(*workload.start), grid.index(*workload.goal)
+
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        ai = SnakeAI(turn_penalty=turn_penalty, trace="none")
+        began = perf_counter()
+        result = ai.search(algorithm, start, goal, grid)
+        best = min(best, perf_counter() - began)
+
+    stats = SearchStats()
+    SnakeAI(turn_penalty=turn_penalty, trace="none", stats=stats).search(algorithm, start, goal, grid)
+
+    peak_memory = None
+    if memory:
+        tracked = SearchStats(track_memory=True)
+        ai = SnakeAI(turn_penalty=turn_penalty, trace="none")
+        with tracked.measure():
+            ai.search(algorithm, start, goal, grid)
+        peak_memory = tracked.peak_memory
+
+    path = result.path
+    return Measurement(
+        workload=workload.name,
+        kind=workload.kind,
+        size=workload.size,
+        seed=workload.seed,
+        algorithm=algorithm,
+        found=bool(path),
+        path_length=len(path),
+        path_cost=path_cost(path, turn_penalty) if path else None,
+        expansions=stats.expansions,
+        time=best,
+        peak_memory=peak_memory,
+    )
+
+
+def run_suite(
+    kinds: Iterable[str],
+    sizes: Iterable[int],
+    algorithms: Iterable[str],
+    seed: int = 0,
+    repeat: int = 3,
+    memory: bool = False,
+    progress=None,
+) -> List[Measurement]:
+    """Measure every algorithm on every workload; ``progress`` is called with each Measurement."""
+    algorithms = list(algorithms)
+    results: List[Measurement] = []
+    for workload in workloads(list(kinds), list(sizes), seed):
+        for algorithm in algorithms:
+            measurement = measure(workload, algorithm, repeat, memory)
+            results.append(measurement)
+            if progress is not None:
+                progress(measurement)
+    return results
+
+
+def compare(results: Iterable[Measurement], baseline: Iterable[Measurement], tolerance: float = 0.25) -> List[Regression]:
+    """Regressions of ``results`` against ``baseline``.
+
+    Paths and expansion counts are deterministic, so any loss of a path and
+    any increase in path cost or expansions is flagged. Time and memory are
+    flagged when they grow by more than ``tolerance`` (a fraction) and by
+    more than the noise floor. Pairs missing from the baseline are skipped.
+    """
+    previous: Dict[Tuple[str, int, str], Measurement] = {old.key: old for old in baseline}
+    regressions: List[Regression] = []
+    for new in results:
+        old = previous.get(new.key)
+        if old is None:
+            continue
+
+        def flag(metric: str) -> None:
+            regressions.append(Regression(new.workload, new.seed, new.algorithm, metric, getattr(old, metric), getattr(new, metric)))
+
+        if old.found and not new.found:
+            flag("found")
+            continue
+        if new.found and old.path_cost is not None and new.path_cost > old.path_cost + 1e-9:
+            flag("path_cost")
+        if new.expansions > old.expansions:
+            flag("expansions")
+        if new.time > old.time * (1 + tolerance) and new.time - old.time > TIME_FLOOR:
+            flag("time")
+        if (
+            old.peak_memory is not None
+            and new.peak_memory is not None
+            and new.peak_memory > old.peak_memory * (1 + tolerance)
+            and new.peak_memory - old.peak_memory > MEMORY_FLOOR
+        ):
+            flag("peak_memory")
+    return regressions
+
+
+def save(path: str, results: List[Measurement], **meta) -> None:
+    document = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), **meta},
+        "results": [asdict(measurement) for measurement in results],
+    }
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2)
+
+
+def load(path: str) -> List[Measurement]:
+    with open(path) as handle:
+        document = json.load(handle)
+    return [Measurement(**entry) for entry in document["results"]]
+
+
+def _format(measurement: Measurement) -> str:
+    memory = f"{measurement.peak_memory / 1024:10.0f} KiB" if measurement.peak_memory is not None else ""
+    cost = f"{measurement.path_cost:10.1f}" if measurement.path_cost is not None else f"{'-':>10}"
+    return (
+        f"{measurement.workload:<16} {measurement.algorithm:<15} {measurement.time * 1000:10.2f} ms "
+        f"{measurement.expansions:10d} exp {cost} cost {memory}"
+    )
+
+
+def _names(text: str, known: Sequence[str], what: str) -> List[str]:
+    names = [name for name in text.split(",") if name]
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown {what}: {', '.join(unknown)} (expected some of {', '.join(known)})")
+    return names
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    algorithms = available_algorithms()
+    parser = argparse.ArgumentParser(prog="python -m src.bench", description="Benchmark SnakeAI on seeded workloads.")
+    parser.add_argument("--kinds", type=lambda text: _names(text, list(GENERATORS), "kinds"), default=list(GENERATORS))
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")], default=list(SIZES))
+    parser.add_argument("--algorithms", type=lambda text: _names(text, algorithms, "algorithms"), default=algorithms)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per pair; the fastest is kept")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory (one extra run under tracemalloc)")
+    parser.add_argument("--output", help="write the measurements to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth of time and memory")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.kinds,
+        args.sizes,
+        args.algorithms,
+        seed=args.seed,
+        repeat=args.repeat,
+        memory=args.memory,
+        progress=lambda measurement: print(_format(measurement), flush=True),
+    )
+    if args.output:
+        save(args.output, results, seed=args.seed, repeat=args.repeat)
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("no regressions against the baseline")
+    return 0
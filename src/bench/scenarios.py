@@ -0,0 +1,137 @@
+"""Run Moving AI ``.scen`` files through SnakeAI, checking optimality and throughput.
+
+SnakeAI moves in four directions, while the optimal lengths published with
+``type octile`` maps allow diagonals, so by default every query is checked
+against a four-connected bfs instead (``reference="bfs"``). Use
+``reference="scen"`` for scenario files computed for four-connected moves.
+Searches run with turn_penalty 0, so the move count is the cost every
+algorithm minimises. One SnakeAI is kept per map and algorithm, so the
+persistent planners (HPA*, D* Lite) amortise their tables across queries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+import argparse
+import os
+import sys
+
+from src.game.snake.ai import SnakeAI
+from src.utils.grid import FlatGrid
+from src.utils.movingai import Scenario, load_map, load_scenarios
+from .runner import _names, available_algorithms
+
+
+REFERENCES = ("bfs", "scen")
+# algorithms that do not promise shortest paths, so longer ones are not failures
+APPROXIMATE = ("dfs", "hpa_star")
+
+
+@dataclass
+class ScenarioReport:
+    algorithm: str
+    queries: int = 0
+    solved: int = 0
+    # found a path longer than the reference
+    suboptimal: int = 0
+    # found no path although the reference did
+    missed: int = 0
+    # seconds spent in searches
+    time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Queries per second."""
+        return self.queries / self.time if self.time else 0.0
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.missed or (self.suboptimal and self.algorithm not in APPROXIMATE))
+
+
+def _map_path(scen_path: str, scenario: Scenario) -> str:
+    # scenario files name their map relative to a benchmark root; try it next to the .scen too
+    folder = os.path.dirname(scen_path)
+    for candidate in (os.path.join(folder, scenario.map), os.path.join(folder, os.path.basename(scenario.map))):
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"map {scenario.map!r} for {scen_path} not found; pass map_path")
+
+
+def run_scenarios(
+    scen_path: str,
+    algorithms: Sequence[str],
+    map_path: Optional[str] = None,
+    reference: str = "bfs",
+    limit: Optional[int] = None,
+) -> List[ScenarioReport]:
+    if reference not in REFERENCES:
+        raise ValueError(f"unknown reference {reference!r}, expected one of {REFERENCES}")
+    scenarios = load_scenarios(scen_path)[:limit]
+    reports = {algorithm: ScenarioReport(algorithm) for algorithm in algorithms}
+    grids: Dict[str, FlatGrid] = {}
+    planners: Dict[tuple, SnakeAI] = {}
+    checker = SnakeAI(turn_penalty=0.0, trace="none")
+
+    for scenario in scenarios:
+        path = map_path or _map_path(scen_path, scenario)
+        grid = grids.get(path)
+        if grid is None:
+            grid = grids[path] = load_map(path)
+        if (grid.width, grid.height) != (scenario.width, scenario.height):
+            raise ValueError(
+                f"{scen_path}: scenario expects a {scenario.width}x{scenario.height} map, {path} is {grid.width}x{grid.height}"
+            )
+        start, goal = grid.index(*scenario.start), grid.index(*scenario.goal)
+        if reference == "scen":
+            optimal = scenario.optimal
+        else:
+            moves = len(checker.search("bfs", start, goal, grid).path) - 1
+            optimal = float(moves) if moves >= 0 else None
+
+        for algorithm in algorithms:
+            ai = planners.get((path, algorithm))
+            if ai is None:
+                ai = planners[(path, algorithm)] = SnakeAI(turn_penalty=0.0, trace="none")
+            began = perf_counter()
+            found = ai.search(algorithm, start, goal, grid).path
+            report = reports[algorithm]
+            report.time += perf_counter() - began
+            report.queries += 1
+            if found:
+                report.solved += 1
+                if optimal is not None and len(found) - 1 > optimal + 1e-6:
+                    report.suboptimal += 1
+            elif optimal is not None:
+                report.missed += 1
+
+    return list(reports.values())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    algorithms = available_algorithms()
+    parser = argparse.ArgumentParser(prog="python -m src.bench.scenarios", description="Run a Moving AI .scen file through SnakeAI.")
+    parser.add_argument("scen", help="Moving AI scenario file")
+    parser.add_argument("--map", help="map file to use instead of the one named by each scenario")
+    parser.add_argument("--algorithms", type=lambda text: _names(text, algorithms, "algorithms"), default=algorithms)
+    parser.add_argument("--reference", choices=REFERENCES, default="bfs", help="where optimal lengths come from")
+    parser.add_argument("--limit", type=int, help="only run the first LIMIT scenarios")
+    args = parser.parse_args(argv)
+
+    reports = run_scenarios(args.scen, args.algorithms, args.map, args.reference, args.limit)
+    for report in reports:
+        print(
+            f"{report.algorithm:<15} {report.solved:6d}/{report.queries:<6d} solved {report.suboptimal:6d} suboptimal "
+            f"{report.missed:6d} missed {report.throughput:10.1f} queries/s"
+        )
+    failures = [report.algorithm for report in reports if report.failed]
+    if failures:
+        print(f"FAILED {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
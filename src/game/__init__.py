@@ -1,15 +1,31 @@
 """Game package exports for Pathfinding Arena."""
 
-from .arena import Arena
-from .snake import SearchResult, SnakeAI, SnakeGame
-from .tictactoe import MinimaxResult, TicTacToeAI, TicTacToeGame
+from importlib import import_module
+
+from .snake import SearchResult, SnakeAI, SnakeSimulation
+from .tictactoe import MinimaxResult, TicTacToeAI
 
 __all__ = [
 	"Arena",
 	"SnakeGame",
 	"SnakeAI",
+	"SnakeSimulation",
 	"SearchResult",
 	"TicTacToeGame",
 	"TicTacToeAI",
 	"MinimaxResult",
-]
\ No newline at end of file
+]
+
+
+# pygame front ends, imported on first use so the AIs and the simulation run without a display library
+_LAZY = {
+	"Arena": ".arena",
+	"SnakeGame": ".snake",
+	"TicTacToeGame": ".tictactoe",
+}
+
+
+def __getattr__(name):
+	if name in _LAZY:
+		return getattr(import_module(_LAZY[name], __name__), name)
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
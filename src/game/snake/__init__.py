@@ -1,4 +1,13 @@
-from .game import SnakeGame
 from .ai import SnakeAI, SearchResult
+from .simulation import SnakeSimulation
 
-__all__ = ["SnakeGame", "SnakeAI", "SearchResult"]
\ No newline at end of file
+__all__ = ["SnakeGame", "SnakeAI", "SearchResult", "SnakeSimulation"]
+
+
+def __getattr__(name):
+    # the game needs pygame; importing it lazily keeps SnakeAI and the simulation headless
+    if name == "SnakeGame":
+        from .game import SnakeGame
+
+        return SnakeGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,212 +1,865 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from collections import deque
-from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 import heapq
+import os
+
+from src.utils.components import Components
+from src.utils.grid import FlatGrid
+from src.utils.stats import SearchStats
+from .anytime import AnytimeSearch
+from .batch import decode, run_pool, solve_one
+from .bidirectional import bidirectional_a_star, bidirectional_a_star_path, bidirectional_bfs, bidirectional_bfs_path
+from .cache import PathCache, grid_fingerprint
+from .cooperative import CooperativePlanner
+from .field import DistanceField, distance_field
+from .heading import heading_path, heading_search
+from .hierarchical import CLUSTER_SIZE, HierarchicalPlanner
+from .incremental import DStarLite
+from .jps import jump_point_search
+from .landmarks import LandmarkTable
+from .trace import Coord, FrontierLog, Node, SearchResult, SearchStep, SearchStepper, Steps
 
 
 Grid = List[List[int]]
-Coord = Tuple[int, int]
+Engine = Callable[[int, int, FlatGrid], SearchResult]
+StepEngine = Callable[[int, int, FlatGrid], Steps]
+
+# how much of the exploration a search records:
+#   "none"    - path only
+#   "visited" - path and expansion order
+#   "full"    - path, expansion order and the frontier after every expansion
+TRACE_LEVELS = ("none", "visited", "full")
 
 
 @dataclass
-class SearchResult:
-    path: List[Coord]
-    visited_order: List[Coord]
-    frontier_history: List[Set[Coord]]
-
-    def __iter__(self) -> Iterator:
-        yield self.path
-        yield list(self.visited_order)
-        if self.frontier_history:
-            yield set(self.frontier_history[-1])
-        else:
-            yield set()
+class EngineSpec:
+    steps: StepEngine
+    # trace "none"/"visited" loop; engines without a dedicated one drain ``steps``
+    lean: Engine | None = None
+    # searches grown from both ends start with the goal on the frontier as well
+    bidirectional: bool = False
+    # engines whose queue outlives a query report it here, once ``steps`` has been created
+    frontier: Callable[[], Tuple[int, ...]] | None = None
 
-    @property
-    def succeeded(self) -> bool:
-        return bool(self.path)
 
-    def frontier_at(self, step: int) -> Set[Coord]:
-        if not self.frontier_history:
-            return set()
-        index = min(step, len(self.frontier_history) - 1)
-        return set(self.frontier_history[index])
+def _no_steps() -> Steps:
+    # step engine for queries that cannot start: finishes without expanding anything
+    yield from ()
+    return []
 
 
 class SnakeAI:
-    def __init__(self, grid_size: int | None = None, turn_penalty: float = 0.5):
+    def __init__(
+        self,
+        grid_size: int | None = None,
+        turn_penalty: float = 0.5,
+        trace: str = "full",
+        cache_size: int = 0,
+        landmarks: int = 0,
+        stats: SearchStats | None = None,
+        components: bool = False,
+    ):
         """Create a SnakeAI.
 
         turn_penalty: extra cost added when the move changes direction from the previous move.
+        trace: one of TRACE_LEVELS; "none" and "visited" run lean loops without frontier logging.
+        cache_size: keep up to this many results in an LRU PathCache (0 disables caching).
+        landmarks: guide a_star with this many ALT landmarks (0 keeps plain Manhattan distance).
+        stats: when set, every search refills it; leave None to run without instrumentation.
+        components: keep a Components index of the grid and fail searches between disconnected
+            (or blocked) cells at once, without expanding anything.
         """
         self.grid_size = grid_size
         self.turn_penalty = float(turn_penalty)
-        self._directions: Tuple[Coord, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        self.trace = trace
+        self.cache: PathCache | None = PathCache(cache_size) if cache_size else None
+        self.landmarks = landmarks
+        self.stats = stats
+        self.components = components
+        # union-find over the last grid searched, updated from its diff on every query
+        self._component_index: Components | None = None
+        # built for one grid layout and reused until the layout or the count changes
+        self._landmark_table: LandmarkTable | None = None
+        # D* Lite tables kept between d_star_lite queries
+        self._planner: DStarLite | None = None
+        # HPA* abstraction kept between hpa_star queries, rebuilt per cluster on obstacle edits
+        self.cluster_size = CLUSTER_SIZE
+        self._hierarchy: HierarchicalPlanner | None = None
+        # full traces drain the stepwise engine, lean ones use the dedicated loop
+        self._engines: Dict[str, EngineSpec] = {
+            "dfs": EngineSpec(self._dfs_steps, self._dfs_lean),
+            "bfs": EngineSpec(self._bfs_steps, self._bfs_lean),
+            "ucs": EngineSpec(self._ucs_steps, self._ucs_lean),
+            "a_star": EngineSpec(self._a_star_steps, self._a_star_lean),
+            "bi_bfs": EngineSpec(bidirectional_bfs, self._bi_bfs_lean, bidirectional=True),
+            "bi_a_star": EngineSpec(self._bi_a_star_steps, self._bi_a_star_lean, bidirectional=True),
+            "jps": EngineSpec(jump_point_search),
+            "ucs_heading": EngineSpec(self._ucs_heading_steps, self._ucs_heading_lean),
+            "a_star_heading": EngineSpec(self._a_star_heading_steps, self._a_star_heading_lean),
+            "wavefront": EngineSpec(self._wavefront_steps, self._wavefront_lean),
+            "hpa_star": EngineSpec(self._hpa_star_steps),
+            "d_star_lite": EngineSpec(self._d_star_lite_steps, frontier=self._d_star_lite_frontier),
+        }
+
+    @property
+    def trace(self) -> str:
+        return self._trace
+
+    @trace.setter
+    def trace(self, level: str) -> None:
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"unknown trace level {level!r}, expected one of {TRACE_LEVELS}")
+        self._trace = level
+
+    # Tuple API: coordinates in, coordinates out
+    def dfs(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("dfs", start, goal, grid)
+
+    def bfs(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("bfs", start, goal, grid)
+
+    def ucs(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("ucs", start, goal, grid)
+
+    def a_star(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("a_star", start, goal, grid)
+
+    def bi_bfs(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("bi_bfs", start, goal, grid)
+
+    def bi_a_star(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        return self._run("bi_a_star", start, goal, grid)
+
+    def jps(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """Jump Point Search: unit-cost optimal, ignores turn_penalty like bfs."""
+        return self._run("jps", start, goal, grid)
+
+    def ucs_heading(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """Like ucs, but optimal under turn_penalty: states are (cell, heading) pairs."""
+        return self._run("ucs_heading", start, goal, grid)
+
+    def a_star_heading(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """Like a_star, but optimal under turn_penalty: states are (cell, heading) pairs."""
+        return self._run("a_star_heading", start, goal, grid)
+
+    def wavefront(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """bfs with each layer expanded by NumPy: the same path and visit order, much faster
+        on large open grids. Requires numpy."""
+        return self._run("wavefront", start, goal, grid)
+
+    def hpa_star(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """Hierarchical A* over cluster_size squares: near-optimal unit-cost paths whose
+        abstract search stays small on large grids. Ignores turn_penalty like bfs."""
+        return self._run("hpa_star", start, goal, grid)
+
+    def d_star_lite(self, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchResult:
+        """Incremental unit-cost search: repeated queries towards the same goal only
+        re-expand what changed since the last one (start moves, cells toggled).
+        Ignores turn_penalty like bfs."""
+        return self._run("d_star_lite", start, goal, grid)
+
+    def landmark_table(self, grid: Grid | FlatGrid) -> LandmarkTable | None:
+        """The ALT tables a_star uses on ``grid``, built on first use; None when landmarks is 0."""
+        if not self.landmarks:
+            return None
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        table = self._landmark_table
+        if table is None or table.requested != self.landmarks or table.fingerprint != grid_fingerprint(flat):
+            table = self._landmark_table = LandmarkTable.build(flat, self.landmarks)
+        return table
+
+    def component_index(self, grid: Grid | FlatGrid) -> Components | None:
+        """The Components index searches consult on ``grid``, brought up to date; None when disabled."""
+        if not self.components:
+            return None
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        index = self._component_index
+        if index is None or (index.grid.width, index.grid.height) != (flat.width, flat.height):
+            index = self._component_index = Components(flat)
+        else:
+            index.update(flat)
+        return index
+
+    def anytime(self, start: Coord, goal: Coord, grid: Grid | FlatGrid, weight: float = 3.0) -> AnytimeSearch:
+        """ARA* under turn_penalty: call ``improve(budget_ms=...)`` for the best path so far and its bound."""
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        for cell in (start, goal):
+            if not flat.in_bounds(*cell):
+                raise IndexError(f"cell {cell} is outside the {flat.width}x{flat.height} grid")
+        return AnytimeSearch(flat.index(*start), flat.index(*goal), flat, self.turn_penalty, weight, decode=flat.coord)
+
+    def cooperative(
+        self,
+        agents: Sequence[Tuple[Coord, Coord]],
+        grid: Grid | FlatGrid,
+        window: int = 16,
+        replan: int | None = None,
+    ) -> CooperativePlanner:
+        """WHCA* for (start, goal) pairs sharing ``grid``: call ``step()`` to move every agent
+        one collision-free step, ``locations()`` for where they stand. Ignores turn_penalty like bfs."""
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        planner = CooperativePlanner(flat, window, replan, decode=flat.coord)
+        for start, goal in agents:
+            for cell in (start, goal):
+                if not flat.in_bounds(*cell):
+                    raise IndexError(f"cell {cell} is outside the {flat.width}x{flat.height} grid")
+            planner.add_agent(flat.index(*start), flat.index(*goal))
+        return planner
+
+    def distance_field(self, source: Coord, grid: Grid | FlatGrid) -> DistanceField:
+        """One BFS from source; paths to any cell are then read off the field."""
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        if not flat.in_bounds(*source):
+            raise IndexError(f"source {source} is outside the {flat.width}x{flat.height} grid")
+        return distance_field(flat.index(*source), flat)
+
+    def stepper(self, algorithm: str, start: Coord, goal: Coord, grid: Grid | FlatGrid) -> SearchStepper:
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        if not (flat.in_bounds(*start) and flat.in_bounds(*goal)):
+            stepper = SearchStepper(_no_steps(), (), flat.coord)
+            stepper.run()
+            return stepper
+        start_index, goal_index = flat.index(*start), flat.index(*goal)
+        if self._unreachable(start_index, goal_index, flat):
+            self._lookup(algorithm)
+            stepper = SearchStepper(_no_steps(), (), flat.coord)
+            stepper.run()
+            return stepper
+        steps = self.iter_search(algorithm, start_index, goal_index, flat)
+        seeds = self._seeds(self._lookup(algorithm), start_index, goal_index)
+        return SearchStepper(steps, seeds, flat.coord)
+
+    def solve_many(
+        self,
+        queries: Iterable[Tuple[Coord, Coord]],
+        grid: Grid | FlatGrid,
+        algorithm: str = "a_star",
+        workers: int | None = None,
+        trace: str = "none",
+        chunk_size: int | None = None,
+    ) -> Iterator[SearchResult]:
+        """Solve independent (start, goal) queries on one grid, yielding results in query order.
+
+        workers: processes to spread the queries over (default: one per core); 0 or 1 solves
+            them in this process.
+        trace: trace level of the returned results; the default "none" ships paths only.
+        Queries run on fresh SnakeAIs with this one's turn_penalty and landmarks, so they
+        neither use nor fill this instance's cache, stats or planners.
+        """
+        self._lookup(algorithm)
+        if trace not in TRACE_LEVELS:
+            raise ValueError(f"unknown trace level {trace!r}, expected one of {TRACE_LEVELS}")
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        indexed = [
+            (flat.index(*start), flat.index(*goal)) if flat.in_bounds(*start) and flat.in_bounds(*goal) else (-1, -1)
+            for start, goal in queries
+        ]
+        options = {"turn_penalty": self.turn_penalty, "trace": trace, "landmarks": self.landmarks, "components": self.components}
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1 or len(indexed) <= 1:
+            ai = type(self)(**options)
+            return (decode(solve_one(ai, algorithm, start, goal, flat), flat) for start, goal in indexed)
+        # a few chunks per worker keeps them all busy without paying IPC per query
+        chunk_size = chunk_size or max(1, -(-len(indexed) // (workers * 4)))
+        return run_pool(type(self), options, algorithm, indexed, flat, workers, chunk_size)
+
+    # Flat API: FlatGrid indices in, FlatGrid indices out
+    def search(self, algorithm: str, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        spec = self._lookup(algorithm)
+        key = self._cache_key(spec, "index", algorithm, start, goal, grid)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        result = self._search(spec, start, goal, grid)
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def iter_search(self, algorithm: str, start: int, goal: int, grid: FlatGrid) -> Steps:
+        """Yield one SearchStep per expansion; the generator returns the path."""
+        spec = self._lookup(algorithm)
+        if self._unreachable(start, goal, grid):
+            return _no_steps()
+        return spec.steps(start, goal, grid)
+
+    def _search(
+        self,
+        spec: EngineSpec,
+        start: int,
+        goal: int,
+        grid: FlatGrid,
+        decode: Callable[[int], Node] | None = None,
+    ) -> SearchResult:
+        if self._unreachable(start, goal, grid):
+            if self.stats is not None:
+                self.stats.reset()
+            return SearchResult(path=[], visited_order=[], frontier_history=FrontierLog())
+        if self.stats is not None:
+            return self._instrumented(spec, start, goal, grid, decode)
+        if self._trace != "full" and spec.lean is not None:
+            return spec.lean(start, goal, grid)
+        steps = spec.steps(start, goal, grid)
+        if self._trace == "full":
+            return self._drain(steps, self._seeds(spec, start, goal))
+        return self._collect(steps)
 
     # Depth-first search
-    def dfs(self, start: Coord, goal: Coord, grid: Grid) -> SearchResult:
-        stack: List[Coord] = [start]
-        parents: Dict[Coord, Coord | None] = {start: None}
-        visited: Set[Coord] = set()
-        visited_order: List[Coord] = []
-        frontier_history: List[Set[Coord]] = [set(stack)]
+    def _dfs_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        cells = grid.cells
+        offsets = grid.offsets[::-1]
+        stack: List[int] = [start]
+        parents = self._new_parents(grid, start)
+        closed = bytearray(len(cells))
+        stale: List[int] = []
 
         while stack:
             current = stack.pop()
-            if current in visited:
+            if closed[current]:
+                stale.append(current)
                 continue
-            visited.add(current)
-            visited_order.append(current)
+            closed[current] = 1
             if current == goal:
-                return self._success(parents, goal, visited_order, frontier_history)
-            for neighbor in reversed(list(self._neighbors(current, grid))):
-                if neighbor in parents:
+                yield SearchStep(current, (), tuple(stale), last=True)
+                return self._reconstruct(parents, start, goal)
+            pushed: List[int] = []
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or parents[neighbor] >= 0:
                     continue
                 parents[neighbor] = current
                 stack.append(neighbor)
-            frontier_history.append(set(stack))
+                pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed), tuple(stale))
+            stale.clear()
 
-        return self._failure(visited_order, frontier_history)
+        return []
 
     # Breadth-first search
-    def bfs(self, start: Coord, goal: Coord, grid: Grid) -> SearchResult:
-        queue: deque[Coord] = deque([start])
-        parents: Dict[Coord, Coord | None] = {start: None}
-        visited: Set[Coord] = set()
-        visited_order: List[Coord] = []
-        frontier_history: List[Set[Coord]] = [set(queue)]
+    def _bfs_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        cells = grid.cells
+        offsets = grid.offsets
+        queue: deque[int] = deque([start])
+        parents = self._new_parents(grid, start)
 
+        # BFS never queues a cell twice, so there are no stale pops to report
         while queue:
             current = queue.popleft()
-            if current in visited:
-                continue
-            visited.add(current)
-            visited_order.append(current)
             if current == goal:
-                return self._success(parents, goal, visited_order, frontier_history)
-            for neighbor in self._neighbors(current, grid):
-                if neighbor in parents:
+                yield SearchStep(current, (), last=True)
+                return self._reconstruct(parents, start, goal)
+            pushed: List[int] = []
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or parents[neighbor] >= 0:
                     continue
                 parents[neighbor] = current
                 queue.append(neighbor)
-            frontier_history.append(set(queue))
+                pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed))
 
-        return self._failure(visited_order, frontier_history)
+        return []
 
     # Uniform cost search
-    def ucs(self, start: Coord, goal: Coord, grid: Grid) -> SearchResult:
-        heap: List[Tuple[float, Coord]] = [(0.0, start)]
-        parents: Dict[Coord, Coord | None] = {start: None}
-        costs: Dict[Coord, float] = {start: 0.0}
-        visited: Set[Coord] = set()
-        visited_order: List[Coord] = []
-        frontier_history: List[Set[Coord]] = [set(node for _, node in heap)]
+    def _ucs_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        cells = grid.cells
+        offsets = grid.offsets
+        penalty = self.turn_penalty
+        heap: List[Tuple[float, int]] = [(0.0, start)]
+        parents = self._new_parents(grid, start)
+        costs = array("d", [float("inf")]) * len(cells)
+        costs[start] = 0.0
+        closed = bytearray(len(cells))
+        stale: List[int] = []
 
         while heap:
             cost, current = heapq.heappop(heap)
-            if current in visited:
+            if closed[current]:
+                stale.append(current)
                 continue
-            visited.add(current)
-            visited_order.append(current)
+            closed[current] = 1
             if current == goal:
-                return self._success(parents, goal, visited_order, frontier_history)
-            for neighbor in self._neighbors(current, grid):
+                yield SearchStep(current, (), tuple(stale), last=True)
+                return self._reconstruct(parents, start, goal)
+            # heading is 0 at the start, which matches no offset and so never turns
+            heading = current - parents[current]
+            pushed: List[int] = []
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
                 # base move cost = 1, add turn penalty if direction changed
-                parent = parents.get(current)
-                turn_cost = 0.0
-                if parent is not None:
-                    prev_dir = (current[0] - parent[0], current[1] - parent[1])
-                    new_dir = (neighbor[0] - current[0], neighbor[1] - current[1])
-                    if prev_dir != new_dir:
-                        turn_cost = self.turn_penalty
-                new_cost = cost + 1.0 + turn_cost
-                if neighbor not in costs or new_cost < costs[neighbor]:
+                new_cost = cost + 1.0
+                if heading and step != heading:
+                    new_cost += penalty
+                if new_cost < costs[neighbor]:
                     costs[neighbor] = new_cost
                     parents[neighbor] = current
                     heapq.heappush(heap, (new_cost, neighbor))
-            frontier_history.append(set(node for _, node in heap))
+                    pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed), tuple(stale))
+            stale.clear()
 
-        return self._failure(visited_order, frontier_history)
+        return []
 
     # A* search
-    def a_star(self, start: Coord, goal: Coord, grid: Grid) -> SearchResult:
-        heap: List[Tuple[float, float, Coord]] = [(self._heuristic(start, goal), 0.0, start)]
-        parents: Dict[Coord, Coord | None] = {start: None}
-        costs: Dict[Coord, float] = {start: 0.0}
-        visited: Set[Coord] = set()
-        visited_order: List[Coord] = []
-        frontier_history: List[Set[Coord]] = [set(node for _, _, node in heap)]
+    def _a_star_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        cells = grid.cells
+        offsets = grid.offsets
+        stride = grid.stride
+        penalty = self.turn_penalty
+        goal_x, goal_y = divmod(goal, stride)
+        estimate = self._landmark_estimate(goal, grid)
+        h_start = estimate(start) if estimate else self._heuristic(start, goal, stride)
+        heap: List[Tuple[float, float, int]] = [(h_start, 0.0, start)]
+        parents = self._new_parents(grid, start)
+        costs = array("d", [float("inf")]) * len(cells)
+        costs[start] = 0.0
+        closed = bytearray(len(cells))
+        stale: List[int] = []
 
         while heap:
             f_cost, g_cost, current = heapq.heappop(heap)
-            if current in visited:
+            if closed[current]:
+                stale.append(current)
                 continue
-            visited.add(current)
-            visited_order.append(current)
+            closed[current] = 1
             if current == goal:
-                return self._success(parents, goal, visited_order, frontier_history)
-            for neighbor in self._neighbors(current, grid):
+                yield SearchStep(current, (), tuple(stale), last=True)
+                return self._reconstruct(parents, start, goal)
+            heading = current - parents[current]
+            pushed: List[int] = []
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
                 # base move cost = 1, add turn penalty when changing direction
-                parent = parents.get(current)
-                turn_cost = 0.0
-                if parent is not None:
-                    prev_dir = (current[0] - parent[0], current[1] - parent[1])
-                    new_dir = (neighbor[0] - current[0], neighbor[1] - current[1])
-                    if prev_dir != new_dir:
-                        turn_cost = self.turn_penalty
-                tentative_g = g_cost + 1.0 + turn_cost
-                if neighbor not in costs or tentative_g < costs[neighbor]:
+                tentative_g = g_cost + 1.0
+                if heading and step != heading:
+                    tentative_g += penalty
+                if tentative_g < costs[neighbor]:
                     costs[neighbor] = tentative_g
                     parents[neighbor] = current
-                    priority = tentative_g + self._heuristic(neighbor, goal)
+                    if estimate:
+                        priority = tentative_g + estimate(neighbor)
+                    else:
+                        x, y = divmod(neighbor, stride)
+                        priority = tentative_g + abs(x - goal_x) + abs(y - goal_y)
                     heapq.heappush(heap, (priority, tentative_g, neighbor))
-            frontier_history.append(set(node for _, _, node in heap))
+                    pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed), tuple(stale))
+            stale.clear()
+
+        return []
+
+    # Bidirectional A* search
+    def _bi_a_star_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        return bidirectional_a_star(start, goal, grid, self.turn_penalty)
+
+    def _bi_bfs_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        if self._trace == "visited":
+            return self._collect(bidirectional_bfs(start, goal, grid))
+        path = bidirectional_bfs_path(start, goal, grid)
+        return SearchResult(path=path, visited_order=[], frontier_history=FrontierLog())
+
+    def _bi_a_star_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        if self._trace == "visited":
+            return self._collect(self._bi_a_star_steps(start, goal, grid))
+        path = bidirectional_a_star_path(start, goal, grid, self.turn_penalty)
+        return SearchResult(path=path, visited_order=[], frontier_history=FrontierLog())
+
+    # Vectorized BFS; numpy is only imported once the engine is used
+    def _wavefront_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        from .wavefront import wavefront_bfs
+
+        return wavefront_bfs(start, goal, grid)
+
+    def _wavefront_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        from .wavefront import wavefront_search
+
+        path, layers = wavefront_search(start, goal, grid, trace=self._trace == "visited")
+        visited_order = [cell for layer in layers for cell in layer.tolist()]
+        return SearchResult(path=path, visited_order=visited_order, frontier_history=FrontierLog())
+
+    # Hierarchical A*
+    def _hpa_star_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        hierarchy = self._hierarchy
+        if (
+            hierarchy is None
+            or hierarchy.cluster_size != self.cluster_size
+            or len(hierarchy.grid) != len(grid)
+            or hierarchy.grid.stride != grid.stride
+        ):
+            hierarchy = self._hierarchy = HierarchicalPlanner(grid, self.cluster_size)
+        else:
+            hierarchy.sync(grid)
+        return hierarchy.search(start, goal)
+
+    # D* Lite
+    def _d_star_lite_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        # synchronise eagerly, so the queue is up to date before the first step is taken
+        planner = self._planner
+        if planner is None or planner.goal != goal or len(planner.grid) != len(grid) or planner.grid.stride != grid.stride:
+            planner = self._planner = DStarLite(grid, start, goal)
+        else:
+            planner.move_start(start)
+            planner.sync(grid)
+        return planner.compute()
+
+    def _d_star_lite_frontier(self) -> Tuple[int, ...]:
+        return self._planner.queued() if self._planner else ()
+
+    # Heading-aware searches
+    def _ucs_heading_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        return heading_search(start, goal, grid, self.turn_penalty, guided=False)
+
+    def _a_star_heading_steps(self, start: int, goal: int, grid: FlatGrid) -> Steps:
+        return heading_search(start, goal, grid, self.turn_penalty)
+
+    def _ucs_heading_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        if self._trace == "visited":
+            return self._collect(self._ucs_heading_steps(start, goal, grid))
+        path = heading_path(start, goal, grid, self.turn_penalty, guided=False)
+        return SearchResult(path=path, visited_order=[], frontier_history=FrontierLog())
+
+    def _a_star_heading_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        if self._trace == "visited":
+            return self._collect(self._a_star_heading_steps(start, goal, grid))
+        path = heading_path(start, goal, grid, self.turn_penalty)
+        return SearchResult(path=path, visited_order=[], frontier_history=FrontierLog())
 
-        return self._failure(visited_order, frontier_history)
+    # Lean searches: same expansion order as above, without frontier logging
+    def _dfs_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        cells = grid.cells
+        offsets = grid.offsets[::-1]
+        stack: List[int] = [start]
+        parents = self._new_parents(grid, start)
+        closed = bytearray(len(cells))
+        visited_order: List[int] | None = [] if self._trace == "visited" else None
+
+        while stack:
+            current = stack.pop()
+            if closed[current]:
+                continue
+            closed[current] = 1
+            if visited_order is not None:
+                visited_order.append(current)
+            if current == goal:
+                return self._lean_result(parents, start, goal, visited_order)
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or parents[neighbor] >= 0:
+                    continue
+                parents[neighbor] = current
+                stack.append(neighbor)
+
+        return self._lean_result(parents, start, -1, visited_order)
+
+    def _bfs_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        cells = grid.cells
+        offsets = grid.offsets
+        queue: deque[int] = deque([start])
+        parents = self._new_parents(grid, start)
+        visited_order: List[int] | None = [] if self._trace == "visited" else None
+
+        # BFS never queues a cell twice, so the parent table doubles as the closed set
+        while queue:
+            current = queue.popleft()
+            if visited_order is not None:
+                visited_order.append(current)
+            if current == goal:
+                return self._lean_result(parents, start, goal, visited_order)
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or parents[neighbor] >= 0:
+                    continue
+                parents[neighbor] = current
+                queue.append(neighbor)
+
+        return self._lean_result(parents, start, -1, visited_order)
+
+    def _ucs_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        cells = grid.cells
+        offsets = grid.offsets
+        penalty = self.turn_penalty
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        heap: List[Tuple[float, int]] = [(0.0, start)]
+        parents = self._new_parents(grid, start)
+        costs = array("d", [float("inf")]) * len(cells)
+        costs[start] = 0.0
+        closed = bytearray(len(cells))
+        visited_order: List[int] | None = [] if self._trace == "visited" else None
+
+        while heap:
+            cost, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            if visited_order is not None:
+                visited_order.append(current)
+            if current == goal:
+                return self._lean_result(parents, start, goal, visited_order)
+            heading = current - parents[current]
+            straight = cost + 1.0
+            turned = straight + penalty if heading else straight
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
+                new_cost = straight if step == heading else turned
+                if new_cost < costs[neighbor]:
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = current
+                    heappush(heap, (new_cost, neighbor))
+
+        return self._lean_result(parents, start, -1, visited_order)
+
+    def _a_star_lean(self, start: int, goal: int, grid: FlatGrid) -> SearchResult:
+        cells = grid.cells
+        offsets = grid.offsets
+        stride = grid.stride
+        penalty = self.turn_penalty
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        goal_x, goal_y = divmod(goal, stride)
+        estimate = self._landmark_estimate(goal, grid)
+        h_start = estimate(start) if estimate else self._heuristic(start, goal, stride)
+        heap: List[Tuple[float, float, int]] = [(h_start, 0.0, start)]
+        parents = self._new_parents(grid, start)
+        costs = array("d", [float("inf")]) * len(cells)
+        costs[start] = 0.0
+        closed = bytearray(len(cells))
+        visited_order: List[int] | None = [] if self._trace == "visited" else None
+
+        while heap:
+            _, g_cost, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            if visited_order is not None:
+                visited_order.append(current)
+            if current == goal:
+                return self._lean_result(parents, start, goal, visited_order)
+            heading = current - parents[current]
+            straight = g_cost + 1.0
+            turned = straight + penalty if heading else straight
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
+                tentative_g = straight if step == heading else turned
+                if tentative_g < costs[neighbor]:
+                    costs[neighbor] = tentative_g
+                    parents[neighbor] = current
+                    if estimate:
+                        heappush(heap, (tentative_g + estimate(neighbor), tentative_g, neighbor))
+                    else:
+                        x, y = divmod(neighbor, stride)
+                        heappush(heap, (tentative_g + abs(x - goal_x) + abs(y - goal_y), tentative_g, neighbor))
+
+        return self._lean_result(parents, start, -1, visited_order)
 
     # Helpers
-    def _neighbors(self, node: Coord, grid: Grid) -> Iterable[Coord]:
-        width = len(grid[0])
-        height = len(grid)
-        x, y = node
-        for dx, dy in self._directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height and not grid[ny][nx]:
-                yield (nx, ny)
-
-    def _heuristic(self, a: Coord, b: Coord) -> int:
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    def _reconstruct(self, parents: Dict[Coord, Coord | None], goal: Coord) -> List[Coord]:
-        if goal not in parents:
+    def _lookup(self, algorithm: str) -> EngineSpec:
+        try:
+            return self._engines[algorithm]
+        except KeyError:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(self._engines)}") from None
+
+    def _run(
+        self,
+        algorithm: str,
+        start: Coord,
+        goal: Coord,
+        grid: Grid | FlatGrid,
+    ) -> SearchResult:
+        spec = self._lookup(algorithm)
+        # keyed before the conversion, so a hit skips building the FlatGrid as well
+        key = self._cache_key(spec, "coord", algorithm, start, goal, grid)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        flat = grid if isinstance(grid, FlatGrid) else FlatGrid.from_rows(grid)
+        if not (flat.in_bounds(*start) and flat.in_bounds(*goal)):
+            return SearchResult(path=[], visited_order=[], frontier_history=FrontierLog())
+        result = self._search(spec, flat.index(*start), flat.index(*goal), flat, flat.coord)
+        coord = flat.coord
+        result.path = [coord(node) for node in result.path]
+        result.visited_order = [coord(node) for node in result.visited_order]
+        result.frontier_history.decode = coord
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def _cache_key(
+        self,
+        spec: EngineSpec,
+        kind: str,
+        algorithm: str,
+        start: Node,
+        goal: Node,
+        grid: Grid | FlatGrid,
+    ) -> Tuple | None:
+        # engines with a persistent queue (D* Lite) report work relative to earlier queries,
+        # and attached stats must observe every search, so neither is served from the cache
+        if self.cache is None or self.stats is not None or spec.frontier is not None:
+            return None
+        return (
+            grid_fingerprint(grid),
+            kind,
+            algorithm,
+            start,
+            goal,
+            self.turn_penalty,
+            self._trace,
+            self.landmarks,
+            self.cluster_size,
+            self.components,
+        )
+
+    def _unreachable(self, start: int, goal: int, grid: FlatGrid) -> bool:
+        return self.components and not self.component_index(grid).connected(start, goal)
+
+    def _heuristic(self, a: int, b: int, stride: int) -> int:
+        ax, ay = divmod(a, stride)
+        bx, by = divmod(b, stride)
+        return abs(ax - bx) + abs(ay - by)
+
+    def _landmark_estimate(self, goal: int, grid: FlatGrid) -> Callable[[int], float] | None:
+        table = self.landmark_table(grid) if self.landmarks else None
+        return table.estimator(goal, grid.stride) if table else None
+
+    def _new_parents(self, grid: FlatGrid, start: int) -> array:
+        # -1 marks undiscovered cells; the start is its own parent
+        parents = array("i", [-1]) * len(grid.cells)
+        parents[start] = start
+        return parents
+
+    def _seeds(self, spec: EngineSpec, start: int, goal: int) -> Tuple[int, ...]:
+        if spec.frontier is not None:
+            return spec.frontier()
+        if spec.bidirectional and goal != start:
+            return (start, goal)
+        return (start,)
+
+    def _start_frontier(self, seeds: Tuple[int, ...]) -> FrontierLog:
+        frontier = FrontierLog()
+        for seed in seeds:
+            frontier.push(seed)
+        frontier.end_step()
+        return frontier
+
+    def _reconstruct(self, parents: array, start: int, goal: int) -> List[int]:
+        if parents[goal] < 0:
             return []
-        path: List[Coord] = []
-        node: Coord | None = goal
-        while node is not None:
-            path.append(node)
+        path: List[int] = [goal]
+        node = goal
+        while node != start:
             node = parents[node]
+            path.append(node)
         path.reverse()
         return path
 
-    def _success(
+    def _drain(self, steps: Steps, seeds: Tuple[int, ...]) -> SearchResult:
+        # frontier step k is the frontier after k expansions; the last expansion is not logged
+        frontier = self._start_frontier(seeds)
+        visited_order: List[int] = []
+        while True:
+            try:
+                step = next(steps)
+            except StopIteration as stop:
+                return SearchResult(path=stop.value, visited_order=visited_order, frontier_history=frontier)
+            visited_order.append(step.node)
+            if step.last:
+                continue
+            for cell in step.stale:
+                frontier.pop(cell)
+            frontier.pop(step.node)
+            for cell in step.pushed:
+                frontier.push(cell)
+            frontier.end_step()
+
+    def _instrumented(
         self,
-        parents: Dict[Coord, Coord | None],
-        goal: Coord,
-        visited_order: List[Coord],
-        frontier_history: List[Set[Coord]],
+        spec: EngineSpec,
+        start: int,
+        goal: int,
+        grid: FlatGrid,
+        decode: Callable[[int], Node] | None,
     ) -> SearchResult:
-        path = self._reconstruct(parents, goal)
-        if not frontier_history:
-            frontier_history = [set()]
-        return SearchResult(path=path, visited_order=visited_order, frontier_history=frontier_history)
+        # drains the step engine (never the lean loop) so every expansion can be observed;
+        # the expansion order is the same either way
+        stats = self.stats
+        stats.reset()
+        on_expand, on_push = stats.on_expand, stats.on_push
+        cells, offsets = grid.cells, grid.offsets
+        full = self._trace == "full"
+        visited_order: List[int] | None = [] if self._trace != "none" else None
+        with stats.measure():
+            steps = spec.steps(start, goal, grid)
+            seeds = self._seeds(spec, start, goal)
+            frontier = self._start_frontier(seeds) if full else FrontierLog()
+            stats.pushes = size = peak = len(seeds)
+            if on_push is not None:
+                for cell in seeds:
+                    on_push(decode(cell) if decode else cell)
+            while True:
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    path = stop.value
+                    break
+                node = step.node
+                stats.expansions += 1
+                stats.stale_pops += len(step.stale)
+                stats.pushes += len(step.pushed)
+                size += len(step.pushed) - len(step.stale) - 1
+                if size > peak:
+                    peak = size
+                if on_expand is not None:
+                    on_expand(decode(node) if decode else node)
+                if on_push is not None:
+                    for cell in step.pushed:
+                        on_push(decode(cell) if decode else cell)
+                if visited_order is not None:
+                    visited_order.append(node)
+                if step.last:
+                    continue
+                # edges scanned out of the expanded cell
+                stats.relaxations += sum(1 for offset in offsets if not cells[node + offset])
+                if full:
+                    for cell in step.stale:
+                        frontier.pop(cell)
+                    frontier.pop(node)
+                    for cell in step.pushed:
+                        frontier.push(cell)
+                    frontier.end_step()
+            stats.peak_frontier = peak
+        return SearchResult(path=path, visited_order=visited_order or [], frontier_history=frontier)
+
+    def _collect(self, steps: Steps) -> SearchResult:
+        # lean trace for engines without a dedicated lean loop
+        visited_order: List[int] | None = [] if self._trace == "visited" else None
+        while True:
+            try:
+                step = next(steps)
+            except StopIteration as stop:
+                return SearchResult(path=stop.value, visited_order=visited_order or [], frontier_history=FrontierLog())
+            if visited_order is not None:
+                visited_order.append(step.node)
 
-    def _failure(
+    def _lean_result(
         self,
-        visited_order: List[Coord],
-        frontier_history: List[Set[Coord]],
+        parents: array,
+        start: int,
+        goal: int,
+        visited_order: List[int] | None,
     ) -> SearchResult:
-        if not frontier_history:
-            frontier_history = [set()]
-        return SearchResult(path=[], visited_order=visited_order, frontier_history=frontier_history)
\ No newline at end of file
+        path = self._reconstruct(parents, start, goal) if goal >= 0 else []
+        return SearchResult(path=path, visited_order=visited_order or [], frontier_history=FrontierLog())
@@ -0,0 +1,197 @@
+"""Anytime Repairing A* (ARA*) with time and expansion budgets.
+
+A weighted A* (priority g + w * h) finds a first path quickly; w is then
+lowered step by step towards 1 and each pass reuses the previous one: only
+states whose cost improved since they were expanded (the INCONS set) and the
+remaining open states are re-queued. After every pass the path found so far
+is known to cost at most ``bound`` times the optimum, and ``bound`` reaches
+1.0 once the path is proven optimal.
+
+The search runs over the same (cell, heading) states as ``heading_search``,
+so turn penalties are priced exactly and the bound is a real guarantee.
+``AnytimeSearch.improve`` can be called once per frame with a budget; the
+search resumes where the previous call stopped.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, Generator, List, Optional, Set, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .heading import _estimator, _reconstruct
+from .trace import Node
+
+
+INF = float("inf")
+# how often (in expansions) the deadline is checked
+DEADLINE_STRIDE = 32
+
+
+@dataclass
+class AnytimeResult:
+    path: List[Node]
+    cost: float
+    # cost <= bound * optimal cost: inf while there is no path, 1.0 once it is optimal
+    bound: float
+    expansions: int
+    done: bool
+
+    @property
+    def succeeded(self) -> bool:
+        return bool(self.path)
+
+
+class AnytimeSearch:
+    def __init__(
+        self,
+        start: int,
+        goal: int,
+        grid: FlatGrid,
+        turn_penalty: float,
+        weight: float = 3.0,
+        decrement: float = 0.5,
+        decode: Optional[Callable[[int], Node]] = None,
+    ) -> None:
+        if weight < 1.0:
+            raise ValueError(f"weight must be at least 1, got {weight}")
+        if decrement <= 0.0:
+            raise ValueError(f"decrement must be positive, got {decrement}")
+        self.start = start
+        self.goal = goal
+        self.grid = grid
+        self.turn_penalty = turn_penalty
+        self.weight = weight
+        self.decrement = decrement
+        self._decode = decode
+        self.cost = INF
+        self.bound = INF
+        self.expansions = 0
+        self.done = False
+        self._path: List[int] = []
+        self._steps = self._run()
+
+    def improve(self, budget_ms: Optional[float] = None, max_expansions: Optional[int] = None) -> AnytimeResult:
+        """Search until the budget runs out or the path is proven optimal.
+
+        With neither budget set the search runs to completion.
+        """
+        deadline = perf_counter() + budget_ms / 1000.0 if budget_ms is not None else None
+        expanded = 0
+        while not self.done:
+            if max_expansions is not None and expanded >= max_expansions:
+                break
+            if deadline is not None and expanded % DEADLINE_STRIDE == 0 and perf_counter() >= deadline:
+                break
+            try:
+                next(self._steps)
+            except StopIteration:
+                self.done = True
+                break
+            expanded += 1
+        self.expansions += expanded
+        return self.result()
+
+    def result(self) -> AnytimeResult:
+        decode = self._decode
+        path = [decode(node) for node in self._path] if decode else list(self._path)
+        return AnytimeResult(path=path, cost=self.cost, bound=self.bound, expansions=self.expansions, done=self.done)
+
+    def _run(self) -> Generator[int, None, None]:
+        # yields the expanded cell once per expansion
+        start, goal = self.start, self.goal
+        if start == goal:
+            self._path, self.cost, self.bound = [start], 0.0, 1.0
+            return
+        grid = self.grid
+        cells = grid.cells
+        offsets = grid.offsets
+        move, turn = 1.0, self.turn_penalty
+        estimate = _estimator(offsets, grid.stride, goal, move, turn)
+
+        states = 4 * len(cells)
+        g = array("d", [INF]) * states
+        parents = array("i", [-1]) * states
+        closed = bytearray(states)
+        weight = self.weight
+        heap: List[Tuple[float, int]] = []
+        # lazy deletion: an entry is live only while it matches open_keys
+        open_keys: Dict[int, float] = {}
+        incons: Set[int] = set()
+
+        def relax(state: int, cost: float, parent: int) -> None:
+            g[state] = cost
+            parents[state] = parent
+            cell = state >> 2
+            if cell == goal:
+                # goal states are never expanded. Snapshot the path, and price the snapshot:
+                # parents improved since ``cost`` was computed can make it cheaper still
+                if cost < self.cost:
+                    self._path = _reconstruct(parents, state, start)
+                    self.cost = _path_cost(self._path, move, turn)
+            elif closed[state]:
+                incons.add(state)
+            else:
+                key = cost + weight * estimate(cell, state & 3)
+                open_keys[state] = key
+                heapq.heappush(heap, (key, state))
+
+        # the start has no heading: its neighbours are seeded directly
+        for k, step in enumerate(offsets):
+            if not cells[start + step]:
+                relax((start + step) * 4 + k, move, -1)
+
+        while True:
+            while heap:
+                key, state = heap[0]
+                if open_keys.get(state) != key:
+                    heapq.heappop(heap)
+                    continue
+                if key >= self.cost:
+                    break
+                heapq.heappop(heap)
+                del open_keys[state]
+                closed[state] = 1
+                cell = state >> 2
+                heading = state & 3
+                straight = g[state] + move
+                turned = straight + turn
+                for k, step in enumerate(offsets):
+                    # k ^ 1 is a U-turn, which never pays off
+                    if k == heading ^ 1 or cells[cell + step]:
+                        continue
+                    target = (cell + step) * 4 + k
+                    new_cost = straight if k == heading else turned
+                    if new_cost < g[target]:
+                        relax(target, new_cost, state)
+                yield cell
+
+            # everything still queued bounds the optimum from below
+            lower = self.cost
+            for state in (*open_keys, *incons):
+                lower = min(lower, g[state] + estimate(state >> 2, state & 3))
+            if self.cost == INF:
+                return
+            # some queued state lies on an optimal path with g + h <= optimum, hence the ratio
+            self.bound = self.cost / lower if lower > 0 else 1.0
+            if weight <= 1.0 or self.bound <= 1.0:
+                self.bound = 1.0
+                return
+            weight = max(1.0, weight - self.decrement)
+            pending = set(open_keys) | incons
+            incons.clear()
+            closed = bytearray(states)
+            open_keys = {state: g[state] + weight * estimate(state >> 2, state & 3) for state in pending}
+            heap = [(key, state) for state, key in open_keys.items()]
+            heapq.heapify(heap)
+
+
+def _path_cost(path: List[int], move: float, turn: float) -> float:
+    cost = move * (len(path) - 1)
+    for before, current, after in zip(path, path[1:], path[2:]):
+        if current - before != after - current:
+            cost += turn
+    return cost
@@ -0,0 +1,82 @@
+"""Process-pool batches of independent queries, used by ``SnakeAI.solve_many``.
+
+The grid is copied once into a SharedMemory block; every worker attaches to
+it in its initializer and keeps its own SnakeAI, so per-query messages are
+just two int indices out and, by default, an ``array("i")`` path back.
+Persistent tables (landmarks, HPA* clusters) are built once per worker and
+reused for the rest of the batch.
+"""
+
+from __future__ import annotations
+
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import multiprocessing
+
+from src.utils.grid import FlatGrid
+from .trace import FrontierLog, SearchResult
+
+
+# (start, goal) as FlatGrid indices; -1 marks a query that cannot start
+Query = Tuple[int, int]
+
+# per-process state set up by _attach
+_worker: Dict[str, Any] = {}
+
+
+def _attach(factory: type, options: Dict[str, Any], block: str, width: int, height: int, algorithm: str) -> None:
+    memory = shared_memory.SharedMemory(name=block)
+    grid = FlatGrid(width, height)
+    grid.cells[:] = memory.buf[: len(grid.cells)]
+    memory.close()
+    _worker.update(ai=factory(**options), grid=grid, algorithm=algorithm)
+
+
+def _solve(queries: Sequence[Query]) -> List[Any]:
+    ai, grid, algorithm = _worker["ai"], _worker["grid"], _worker["algorithm"]
+    return [solve_one(ai, algorithm, start, goal, grid) for start, goal in queries]
+
+
+def solve_one(ai: Any, algorithm: str, start: int, goal: int, grid: FlatGrid) -> Any:
+    """One query as shipped back to the parent: the path alone under trace "none"."""
+    if start < 0:
+        return array("i")
+    result = ai.search(algorithm, start, goal, grid)
+    if ai.trace == "none":
+        return array("i", result.path)
+    return result
+
+
+def decode(shipped: Any, grid: FlatGrid) -> SearchResult:
+    coord = grid.coord
+    if isinstance(shipped, array):
+        return SearchResult(path=[coord(node) for node in shipped], visited_order=[], frontier_history=FrontierLog())
+    shipped.path = [coord(node) for node in shipped.path]
+    shipped.visited_order = [coord(node) for node in shipped.visited_order]
+    shipped.frontier_history.decode = coord
+    return shipped
+
+
+def run_pool(
+    factory: type,
+    options: Dict[str, Any],
+    algorithm: str,
+    queries: List[Query],
+    grid: FlatGrid,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[SearchResult]:
+    """Stream decoded results in query order while the pool works ahead."""
+    memory = shared_memory.SharedMemory(create=True, size=max(1, len(grid.cells)))
+    try:
+        memory.buf[: len(grid.cells)] = grid.cells
+        chunks = [queries[begin : begin + chunk_size] for begin in range(0, len(queries), chunk_size)]
+        initargs = (factory, options, memory.name, grid.width, grid.height, algorithm)
+        with multiprocessing.get_context().Pool(workers, _attach, initargs) as pool:
+            for shipped in pool.imap(_solve, chunks):
+                for result in shipped:
+                    yield decode(result, grid)
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,280 @@
+"""Bidirectional searches that grow one tree from the start and one from the goal.
+
+Both trees store parents in path orientation: the forward tree points back
+towards the start, the backward tree points on towards the goal. With headings
+taken as ``node - parent`` on both sides, a move from ``node`` to ``node + step``
+turns exactly when ``heading and step != heading``, whichever side is expanding.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+def bidirectional_bfs(start: int, goal: int, grid: FlatGrid) -> Steps:
+    """Unit-cost BFS from both ends, one full layer of the smaller side at a time."""
+    if start == goal:
+        yield SearchStep(start, (), last=True)
+        return [start]
+
+    cells = grid.cells
+    offsets = grid.offsets
+    forward = _Tree(start, grid)
+    backward = _Tree(goal, grid)
+    layers = {forward: [start], backward: [goal]}
+    best = float("inf")
+    meeting: Optional[Tuple[int, int]] = None
+
+    while layers[forward] and layers[backward]:
+        side = forward if len(layers[forward]) <= len(layers[backward]) else backward
+        other = backward if side is forward else forward
+        next_layer: List[int] = []
+        for current in layers[side]:
+            depth = side.costs[current] + 1.0
+            pushed: List[int] = []
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
+                total = depth + other.costs[neighbor]
+                if total < best:
+                    best = total
+                    meeting = (current, neighbor) if side is forward else (neighbor, current)
+                if side.parents[neighbor] >= 0:
+                    continue
+                side.parents[neighbor] = current
+                side.costs[neighbor] = depth
+                next_layer.append(neighbor)
+                pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed))
+        layers[side] = next_layer
+        # finishing the layer that first touched the other tree guarantees the shortest link
+        if meeting is not None:
+            break
+
+    if meeting is None:
+        return []
+    return _join(forward, backward, *meeting)
+
+
+def bidirectional_bfs_path(start: int, goal: int, grid: FlatGrid) -> List[int]:
+    """Path-only ``bidirectional_bfs``: the same layers, without step reporting."""
+    if start == goal:
+        return [start]
+
+    cells = grid.cells
+    offsets = grid.offsets
+    forward = _Tree(start, grid)
+    backward = _Tree(goal, grid)
+    layers = {forward: [start], backward: [goal]}
+    best = float("inf")
+    meeting: Optional[Tuple[int, int]] = None
+
+    while layers[forward] and layers[backward]:
+        side = forward if len(layers[forward]) <= len(layers[backward]) else backward
+        other = backward if side is forward else forward
+        parents, costs = side.parents, side.costs
+        other_parents, other_costs = other.parents, other.costs
+        next_layer: List[int] = []
+        append = next_layer.append
+        for current in layers[side]:
+            depth = costs[current] + 1.0
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor]:
+                    continue
+                if other_parents[neighbor] >= 0 and depth + other_costs[neighbor] < best:
+                    best = depth + other_costs[neighbor]
+                    meeting = (current, neighbor) if side is forward else (neighbor, current)
+                if parents[neighbor] >= 0:
+                    continue
+                parents[neighbor] = current
+                costs[neighbor] = depth
+                append(neighbor)
+        layers[side] = next_layer
+        if meeting is not None:
+            break
+
+    if meeting is None:
+        return []
+    return _join(forward, backward, *meeting)
+
+
+def bidirectional_a_star(start: int, goal: int, grid: FlatGrid, turn_penalty: float) -> Steps:
+    """A* from both ends under the turn-penalty cost model.
+
+    Each side is guided by the Manhattan distance to the other end and expands in
+    turn, whichever has fewer queued entries going first. Whenever a relaxation
+    touches a cell reached by the other tree, the joined path is priced including
+    the turn made at the junction. Cells the other side has already closed are
+    not expanded again once they cannot lead to a cheaper join, nothing priced
+    at or above the best joined cost is queued, and the search stops once either
+    queue can no longer produce anything cheaper than the best joined path.
+    """
+    if start == goal:
+        yield SearchStep(start, (), last=True)
+        return [start]
+
+    cells = grid.cells
+    offsets = grid.offsets
+    stride = grid.stride
+    forward = _Tree(start, grid, target=goal)
+    backward = _Tree(goal, grid, target=start)
+    best = float("inf")
+    # joined at the time it was priced: an open cell's parent may still change later
+    best_path: List[int] = []
+    stale: List[int] = []
+
+    while forward.heap and backward.heap:
+        if forward.heap[0][0] >= best or backward.heap[0][0] >= best:
+            break
+        side = forward if len(forward.heap) <= len(backward.heap) else backward
+        other = backward if side is forward else forward
+        _, g_cost, current = heapq.heappop(side.heap)
+        if side.closed[current]:
+            stale.append(current)
+            continue
+        # a cell the other side has closed leads nowhere cheaper once its two halves cost
+        # as much as the best joined path, allowing for a turn at the junction (nipping)
+        if other.closed[current] and g_cost + other.costs[current] >= best + turn_penalty:
+            side.closed[current] = 1
+            stale.append(current)
+            continue
+        side.closed[current] = 1
+
+        heading = current - side.parents[current]
+        target_x, target_y = side.target_x, side.target_y
+        pushed: List[int] = []
+        for step in offsets:
+            neighbor = current + step
+            if cells[neighbor]:
+                continue
+            new_cost = g_cost + 1.0
+            if heading and step != heading:
+                new_cost += turn_penalty
+            reached = other.costs[neighbor]
+            if reached < float("inf"):
+                other_heading = neighbor - other.parents[neighbor]
+                junction = turn_penalty if other_heading and step + other_heading else 0.0
+                total = new_cost + junction + reached
+                if total < best:
+                    best = total
+                    if side is forward:
+                        best_path = _join(forward, backward, current, neighbor)
+                    else:
+                        best_path = _join(forward, backward, neighbor, current)
+            if new_cost < side.costs[neighbor]:
+                side.costs[neighbor] = new_cost
+                side.parents[neighbor] = current
+                x, y = divmod(neighbor, stride)
+                priority = new_cost + abs(x - target_x) + abs(y - target_y)
+                # nothing queued at or above the best joined cost can improve on it (trimming)
+                if priority < best:
+                    heapq.heappush(side.heap, (priority, new_cost, neighbor))
+                    pushed.append(neighbor)
+        yield SearchStep(current, tuple(pushed), tuple(stale))
+        stale.clear()
+
+    return best_path
+
+
+def bidirectional_a_star_path(start: int, goal: int, grid: FlatGrid, turn_penalty: float) -> List[int]:
+    """Path-only ``bidirectional_a_star``: the same expansions, without step reporting."""
+    if start == goal:
+        return [start]
+
+    cells = grid.cells
+    offsets = grid.offsets
+    stride = grid.stride
+    forward = _Tree(start, grid, target=goal)
+    backward = _Tree(goal, grid, target=start)
+    forward_heap, backward_heap = forward.heap, backward.heap
+    inf = float("inf")
+    best = inf
+    best_path: List[int] = []
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while forward_heap and backward_heap:
+        if forward_heap[0][0] >= best or backward_heap[0][0] >= best:
+            break
+        if len(forward_heap) <= len(backward_heap):
+            side, other, heap = forward, backward, forward_heap
+        else:
+            side, other, heap = backward, forward, backward_heap
+        _, g_cost, current = heappop(heap)
+        closed = side.closed
+        if closed[current]:
+            continue
+        closed[current] = 1
+        other_costs = other.costs
+        if other.closed[current] and g_cost + other_costs[current] >= best + turn_penalty:
+            continue
+
+        parents, costs = side.parents, side.costs
+        heading = current - parents[current]
+        for step in offsets:
+            neighbor = current + step
+            if cells[neighbor]:
+                continue
+            new_cost = g_cost + 1.0
+            if heading and step != heading:
+                new_cost += turn_penalty
+            reached = other_costs[neighbor]
+            if reached < inf:
+                other_heading = neighbor - other.parents[neighbor]
+                total = new_cost + reached + (turn_penalty if other_heading and step + other_heading else 0.0)
+                if total < best:
+                    best = total
+                    if side is forward:
+                        best_path = _join(forward, backward, current, neighbor)
+                    else:
+                        best_path = _join(forward, backward, neighbor, current)
+            if new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parents[neighbor] = current
+                x, y = divmod(neighbor, stride)
+                priority = new_cost + abs(x - side.target_x) + abs(y - side.target_y)
+                if priority < best:
+                    heappush(heap, (priority, new_cost, neighbor))
+
+    return best_path
+
+
+class _Tree:
+    __slots__ = ("parents", "costs", "closed", "heap", "target_x", "target_y")
+
+    def __init__(self, root: int, grid: FlatGrid, target: Optional[int] = None) -> None:
+        size = len(grid.cells)
+        self.parents = array("i", [-1]) * size
+        self.parents[root] = root
+        self.costs = array("d", [float("inf")]) * size
+        self.costs[root] = 0.0
+        self.closed = bytearray(size)
+        # only the A* variant keeps a heap, ordered by f = g + Manhattan distance to target
+        self.heap: List[Tuple[float, float, int]] = []
+        self.target_x = self.target_y = 0
+        if target is not None:
+            self.target_x, self.target_y = divmod(target, grid.stride)
+            root_x, root_y = divmod(root, grid.stride)
+            self.heap.append((abs(root_x - self.target_x) + abs(root_y - self.target_y), 0.0, root))
+
+    def chain(self, node: int) -> List[int]:
+        # node first, root last
+        chain = [node]
+        while self.parents[node] != node:
+            node = self.parents[node]
+            chain.append(node)
+        return chain
+
+
+def _join(forward: _Tree, backward: _Tree, before: int, after: int) -> List[int]:
+    # before is reached by the forward tree, after by the backward one, and they are adjacent
+    path = forward.chain(before)
+    path.reverse()
+    path.extend(backward.chain(after))
+    return path
@@ -0,0 +1,69 @@
+"""Opt-in LRU cache of search results, used by ``SnakeAI(cache_size=...)``.
+
+Keys start with a digest of the grid contents rather than a version number, so
+any change to the obstacles (through ``FlatGrid.set_blocked``, the pathfinding
+helpers or plain list assignment) produces new keys and old results can never
+be served for it; they simply age out of the LRU.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Sequence
+import hashlib
+
+from src.utils.grid import FlatGrid
+from .trace import SearchResult
+
+
+def grid_fingerprint(grid: FlatGrid | Sequence[Sequence[int]]) -> bytes:
+    """Digest of the grid size and obstacle layout."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(grid, FlatGrid):
+        digest.update(b"flat %d %d " % (grid.width, grid.height))
+        digest.update(grid.cells)
+    else:
+        digest.update(b"rows %d %d " % (len(grid[0]) if grid else 0, len(grid)))
+        for row in grid:
+            digest.update(bytes(row))
+    return digest.digest()
+
+
+class PathCache:
+    """Bounded LRU of SearchResults.
+
+    Results are copied on the way in and on the way out, so callers may consume
+    or mutate what they get (the game animates paths in place) without
+    corrupting later hits.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, SearchResult] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[SearchResult]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result.copy()
+
+    def put(self, key: Hashable, result: SearchResult) -> None:
+        self._entries[key] = result.copy()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,282 @@
+"""Windowed cooperative A* (WHCA*) for many agents on one grid.
+
+Agents plan one at a time, in priority order, through space-time: a state is
+a (cell, time step) pair, an agent may move to a free neighbour or wait, and
+every plan is written into a reservation table that later agents must avoid,
+both the cells themselves and head-on swaps along an edge. Plans only look
+``window`` steps ahead; beyond that the remaining cost is the true distance
+to the goal, ignoring other agents, from a Reverse Resumable A* that searches
+backwards from the goal and resumes only as far as queries need. Agents
+follow the first ``replan`` steps of their plans, then everyone replans from
+where they stand. Priorities rotate every round, with agents still travelling
+ahead of the ones parked on their goals, so no agent is always the one that
+gives way.
+
+Prioritized planning is not complete, but it never collides: every agent's
+cell is held for it through the first step of a round, so waiting one step
+always works, and an agent boxed in further ahead (counted in ``failures``)
+plans as far as it can and cuts the round short there. It also plans first
+in the next round. Moves cost 1, waiting costs 1 except on the agent's own
+goal, and turn_penalty is ignored, like bfs.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import Node
+
+
+class ReverseDistance:
+    """Exact move counts to ``goal``, from a backwards A* that resumes on demand.
+
+    The search is guided towards ``origin``, normally the first agent's start,
+    so the distances it needs first are found with few expansions; asking for
+    any other cell resumes it until that cell is closed. Unreachable cells
+    read -1 once the search has run dry.
+    """
+
+    __slots__ = ("goal", "origin", "_grid", "_g", "_closed", "_heap")
+
+    def __init__(self, grid: FlatGrid, goal: int, origin: int) -> None:
+        self.goal = goal
+        self.origin = origin
+        self._grid = grid
+        self._g = array("l", [-1]) * len(grid.cells)
+        self._closed = bytearray(len(grid.cells))
+        self._g[goal] = 0
+        self._heap: List[Tuple[int, int]] = [(0, goal)]
+
+    def __call__(self, cell: int) -> int:
+        if self._closed[cell]:
+            return self._g[cell]
+        cells = self._grid.cells
+        offsets = self._grid.offsets
+        g = self._g
+        closed = self._closed
+        heap = self._heap
+        stride = self._grid.stride
+        origin_x, origin_y = divmod(self.origin, stride)
+        while heap:
+            _, current = heapq.heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            cost = g[current] + 1
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or closed[neighbor]:
+                    continue
+                if g[neighbor] < 0 or cost < g[neighbor]:
+                    g[neighbor] = cost
+                    x, y = divmod(neighbor, stride)
+                    heapq.heappush(heap, (cost + abs(x - origin_x) + abs(y - origin_y), neighbor))
+            if current == cell:
+                return g[cell]
+        return -1
+
+
+class CooperativePlanner:
+    def __init__(
+        self,
+        grid: FlatGrid,
+        window: int = 16,
+        replan: Optional[int] = None,
+        decode: Optional[Callable[[int], Node]] = None,
+    ) -> None:
+        """Create a planner with no agents; add them with ``add_agent``.
+
+        window: how many steps ahead plans avoid each other.
+        replan: steps followed before everyone replans; half the window by default.
+        """
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        replan = replan if replan is not None else max(1, window // 2)
+        if not 1 <= replan <= window:
+            raise ValueError(f"replan must be between 1 and the window ({window}), got {replan}")
+        self.grid = grid
+        self.window = window
+        self.replan = replan
+        self._decode = decode
+        self.positions: List[int] = []
+        self.goals: List[int] = []
+        # each agent's cells for the current round, its position at the round start first
+        self.plans: List[List[int]] = []
+        self.time = 0
+        self.rounds = 0
+        # agents planned so far, one per agent per round
+        self.routed = 0
+        # agents left waiting because every plan ran into a reservation
+        self.failures = 0
+        # (time step * len(cells) + cell) -> agent holding that cell at that step of the round
+        self._reserved: Dict[int, int] = {}
+        self._distances: Dict[int, ReverseDistance] = {}
+        # agents that failed last round plan first in the next one
+        self._stuck: Set[int] = set()
+        # steps in the current round: ``replan``, or fewer when an agent could not plan that far
+        self.horizon = replan
+        self._step = 0
+        self._stale = True
+
+    @property
+    def agents(self) -> int:
+        return len(self.positions)
+
+    @property
+    def arrived(self) -> int:
+        return sum(1 for position, goal in zip(self.positions, self.goals) if position == goal)
+
+    @property
+    def done(self) -> bool:
+        return self.positions == self.goals
+
+    def add_agent(self, start: int, goal: int) -> int:
+        """Add an agent and return its number; it plans on the next ``step``."""
+        cells = self.grid.cells
+        for cell in (start, goal):
+            if cells[cell]:
+                raise ValueError(f"cell {cell} is blocked")
+        if start in self.positions:
+            raise ValueError(f"cell {start} already holds an agent")
+        self.positions.append(start)
+        self.goals.append(goal)
+        self.plans.append([start])
+        self._stale = True
+        return len(self.positions) - 1
+
+    def set_goal(self, agent: int, goal: int) -> None:
+        if self.grid.cells[goal]:
+            raise ValueError(f"cell {goal} is blocked")
+        self.goals[agent] = goal
+        self._stale = True
+
+    def locations(self) -> List[Node]:
+        decode = self._decode
+        return [decode(cell) for cell in self.positions] if decode else list(self.positions)
+
+    def step(self) -> List[int]:
+        """Move every agent one step, replanning first when the round is used up."""
+        if self._stale or self._step >= self.horizon:
+            self.plan()
+        self._step += 1
+        self.positions = [plan[min(self._step, len(plan) - 1)] for plan in self.plans]
+        self.time += 1
+        return self.positions
+
+    def run(self, max_steps: int) -> int:
+        """Step until every agent is on its goal or ``max_steps`` ran out; returns the steps taken."""
+        for taken in range(max_steps):
+            if self.done:
+                return taken
+            self.step()
+        return max_steps
+
+    def plan(self) -> None:
+        """Start a round: replan every agent from where it stands, in priority order."""
+        count = len(self.positions)
+        rotation = self.rounds
+        goals = self.goals
+        positions = self.positions
+        stuck = self._stuck
+        order = sorted(
+            range(count),
+            key=lambda agent: (agent not in stuck, positions[agent] == goals[agent], (agent - rotation) % count),
+        )
+        stuck.clear()
+        in_use: Set[int] = set(goals)
+        for goal in [goal for goal in self._distances if goal not in in_use]:
+            del self._distances[goal]
+        # everyone may wait through the first step, so every agent has at least a one-step plan
+        size = len(self.grid.cells)
+        reserved = self._reserved
+        reserved.clear()
+        for agent, cell in enumerate(positions):
+            reserved[size + cell] = agent
+        self.horizon = self.replan
+        for agent in order:
+            self.plans[agent] = self._plan_agent(agent)
+        self.rounds += 1
+        self.routed += count
+        self._step = 0
+        self._stale = False
+
+    def _plan_agent(self, agent: int) -> List[int]:
+        start, goal = self.positions[agent], self.goals[agent]
+        distance = self._distances.get(goal)
+        if distance is None:
+            distance = self._distances[goal] = ReverseDistance(self.grid, goal, start)
+        if distance(start) < 0:
+            # the goal is out of reach: hold the current cell, stepping aside when needed
+            goal, distance = start, ReverseDistance(self.grid, start, start)
+        path = self._space_time_search(agent, start, goal, distance, self.window)
+        if path is None:
+            # boxed in within the window: plan as far as possible and end the round there
+            self.failures += 1
+            self._stuck.add(agent)
+            depth = self.horizon
+            while path is None:
+                path = self._space_time_search(agent, start, goal, distance, depth)
+                depth //= 2
+            self.horizon = max(1, len(path) - 1)
+        size = len(self.grid.cells)
+        reserved = self._reserved
+        for step, cell in enumerate(path):
+            reserved[step * size + cell] = agent
+        return path
+
+    def _space_time_search(
+        self, agent: int, start: int, goal: int, distance: ReverseDistance, depth: int
+    ) -> Optional[List[int]]:
+        # A* over (step * len(cells) + cell) keys, down to ``depth`` steps
+        cells = self.grid.cells
+        moves = (0, *self.grid.offsets)
+        size = len(cells)
+        reserved = self._reserved
+        # distances already settled are read straight from the tables
+        known, settled = distance._g, distance._closed
+        estimate = distance(start)
+        g: Dict[int, int] = {start: 0}
+        parents: Dict[int, int] = {start: -1}
+        # ties go to the state nearer the goal, then to the later one
+        heap: List[Tuple[int, int, int]] = [(estimate, estimate, -start)]
+        while heap:
+            priority, estimate, key = heapq.heappop(heap)
+            key = -key
+            cost = g[key]
+            if cost + estimate != priority:
+                continue
+            step, cell = divmod(key, size)
+            if step == depth:
+                path = []
+                while key >= 0:
+                    path.append(key % size)
+                    key = parents[key]
+                path.reverse()
+                return path
+            here = step * size
+            there = here + size
+            for move in moves:
+                neighbor = cell + move
+                if cells[neighbor]:
+                    continue
+                target = there + neighbor
+                if reserved.get(target, agent) != agent:
+                    continue
+                if move:
+                    # an agent coming the other way along the same edge
+                    other = reserved.get(here + neighbor)
+                    if other is not None and other != agent and reserved.get(there + cell) == other:
+                        continue
+                remaining = known[neighbor] if settled[neighbor] else distance(neighbor)
+                if remaining < 0:
+                    continue
+                new_cost = cost if not move and cell == goal else cost + 1
+                if new_cost < g.get(target, new_cost + 1):
+                    g[target] = new_cost
+                    parents[target] = key
+                    heapq.heappush(heap, (new_cost + remaining, remaining, -target))
+        return None
+
@@ -0,0 +1,102 @@
+"""Single-source distance fields.
+
+One full BFS from ``source`` records the distance and the parent of every
+reachable cell. The parent array doubles as a flow field: following it from
+any cell walks a shortest path back to the source, so paths to any number of
+targets (or from any number of agents towards one target) are read off in
+O(path length) with no further search. Parents are assigned in the same order
+as ``SnakeAI.bfs``, so ``path_to`` returns exactly the path bfs would.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, List, Optional
+
+from src.utils.grid import FlatGrid
+from .trace import Coord
+
+
+class DistanceField:
+    """Distances and parents of a BFS from one source, indexed by FlatGrid index.
+
+    ``distances`` holds -1 for unreachable cells; ``parents`` holds the next
+    cell towards the source, the source itself at the source and -1 elsewhere.
+    """
+
+    __slots__ = ("grid", "source", "distances", "parents")
+
+    def __init__(self, grid: FlatGrid, source: int, distances: array, parents: array) -> None:
+        self.grid = grid
+        self.source = source
+        self.distances = distances
+        self.parents = parents
+
+    # Coordinate API
+    def distance(self, cell: Coord) -> int:
+        if not self.grid.in_bounds(*cell):
+            return -1
+        return self.distances[self.grid.index(*cell)]
+
+    def path_to(self, cell: Coord) -> List[Coord]:
+        """Shortest path from the source to ``cell``; empty if it is unreachable."""
+        if not self.grid.in_bounds(*cell):
+            return []
+        coord = self.grid.coord
+        return [coord(node) for node in self.path_to_index(self.grid.index(*cell))]
+
+    def path_from(self, cell: Coord) -> List[Coord]:
+        """Shortest path from ``cell`` to the source, following the flow field."""
+        path = self.path_to(cell)
+        path.reverse()
+        return path
+
+    def rank(self, cells: Iterable[Coord]) -> List[Coord]:
+        """Reachable ``cells`` ordered by distance from the source (ties keep input order)."""
+        reachable = [cell for cell in cells if self.distance(cell) >= 0]
+        reachable.sort(key=self.distance)
+        return reachable
+
+    def nearest(self, cells: Iterable[Coord]) -> Optional[Coord]:
+        ranked = self.rank(cells)
+        return ranked[0] if ranked else None
+
+    # Flat API
+    def path_to_index(self, index: int) -> List[int]:
+        parents = self.parents
+        if parents[index] < 0:
+            return []
+        path = [index]
+        while index != self.source:
+            index = parents[index]
+            path.append(index)
+        path.reverse()
+        return path
+
+
+def distance_field(source: int, grid: FlatGrid) -> DistanceField:
+    """BFS from ``source`` over the whole grid, one layer at a time."""
+    cells = grid.cells
+    offsets = grid.offsets
+    distances = array("l", [-1]) * len(cells)
+    parents = array("i", [-1]) * len(cells)
+    distances[source] = 0
+    parents[source] = source
+
+    layer = [source]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer: List[int] = []
+        append = next_layer.append
+        for current in layer:
+            for step in offsets:
+                neighbor = current + step
+                if cells[neighbor] or parents[neighbor] >= 0:
+                    continue
+                parents[neighbor] = current
+                distances[neighbor] = depth
+                append(neighbor)
+        layer = next_layer
+
+    return DistanceField(grid, source, distances, parents)
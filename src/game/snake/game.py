@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import random
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import pygame
-from pygame.locals import K_1, K_2, K_3, K_4, K_ESCAPE, K_r, K_LEFTBRACKET, K_RIGHTBRACKET, KEYDOWN, QUIT
+from pygame.locals import K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9, K_ESCAPE, K_r, K_v, K_LEFTBRACKET, K_RIGHTBRACKET, KEYDOWN, QUIT
 
 from src.settings import (
     CELL_SIZE,
@@ -20,108 +18,80 @@ from src.settings import (
     COLOR_WHITE,
     GRID_SIZE,
     SNAKE_FPS,
+    SPINNER,
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
-from .ai import SearchResult, SnakeAI
+from src.utils.executor import SearchExecutor
+from .simulation import FRONTIER, NONE, PATH, VISITED, AlgorithmState, SnakeSimulation
 
 
 Coord = Tuple[int, int]
+Color = Tuple[int, int, int]
 
-
-@dataclass
-class AlgorithmState:
-    result: SearchResult
-    visited_step: int = 0
-    path_step: int = 0
-
-    def advance_visited(self) -> None:
-        if self.visited_step < len(self.result.visited_order):
-            self.visited_step += 1
-
-    def visited_complete(self) -> bool:
-        return self.visited_step >= len(self.result.visited_order)
-
-    def advance_path(self) -> None:
-        if self.path_step < max(0, len(self.result.path) - 1):
-            self.path_step += 1
-
-    def next_path_coord(self) -> Optional[Coord]:
-        if not self.result.path:
-            return None
-        next_index = self.path_step + 1
-        if next_index < len(self.result.path):
-            return self.result.path[next_index]
-        return None
-
-    def visited_cells(self) -> Set[Coord]:
-        return set(self.result.visited_order[: self.visited_step])
-
-    def frontier_cells(self) -> Set[Coord]:
-        return self.result.frontier_at(self.visited_step)
-
-    def path_cells(self) -> Set[Coord]:
-        return set(self.result.path)
-
-    def path_remaining(self) -> List[Coord]:
-        if not self.result.path:
-            return []
-        start_index = min(self.path_step, len(self.result.path) - 1)
-        return self.result.path[start_index:]
+LAYER_COLORS: Dict[int, Color] = {VISITED: COLOR_VISITED, FRONTIER: COLOR_FRONTIER, PATH: COLOR_PATH}
+# rendered HUD strings kept around; the cache is dropped whole when it grows past this
+TEXT_CACHE_SIZE = 256
 
 
 class SnakeGame:
-    def __init__(self, screen: Optional[pygame.Surface] = None, grid_size: int = GRID_SIZE):
+    """Pygame front end: input, pacing and drawing around a SnakeSimulation."""
+
+    def __init__(self, screen: Optional[pygame.Surface] = None, grid_size: int = GRID_SIZE, cell_size: int | None = None):
         self.screen = screen or pygame.display.get_surface() or pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.grid_size = grid_size
+        # large grids shrink their cells to fit the window
+        self.cell_size = cell_size or max(1, min(CELL_SIZE, min(self.screen.get_size()) // grid_size))
         self.clock = pygame.time.Clock()
         self.font_small = pygame.font.Font(None, 22)
         self.font_medium = pygame.font.Font(None, 28)
+        # unanimated searches (V) run on a worker thread, so big grids never stall the frame
+        self.executor = SearchExecutor()
         # start with a noticeable default penalty so differences are visible
-        self.turn_penalty = 0.8
-        self.ai = SnakeAI(grid_size, turn_penalty=self.turn_penalty)
+        self.sim = SnakeSimulation(grid_size, turn_penalty=0.8, executor=self.executor)
+        self.running = False
+
+        # frames only repaint cells reported as changed, from a pre-rendered grid
+        self.background = self._render_background()
+        self._painted: Dict[Coord, Color] = {}
+        # what the painted cells were derived from; anything else that changes is told by the state
+        self._drawn_state: Optional[AlgorithmState] = None
+        self._drawn_snake: Coord = self.sim.snake_pos
+        self._drawn_food: Coord = self.sim.food_pos
+        self._drawn_obstacles: FrozenSet[Coord] = frozenset()
+        self._hud: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._text_cache: Dict[str, pygame.Surface] = {}
 
         self.algorithm_keys: Dict[int, str] = {
             K_1: "DFS",
             K_2: "BFS",
             K_3: "UCS",
             K_4: "A*",
+            K_5: "Bi-BFS",
+            K_6: "Bi-A*",
+            K_7: "JPS",
+            K_8: "Heading-A*",
+            K_9: "D* Lite",
         }
-        self.algorithms = {
-            "DFS": self.ai.dfs,
-            "BFS": self.ai.bfs,
-            "UCS": self.ai.ucs,
-            "A*": self.ai.a_star,
-        }
-
-        self.current_algorithm: str = "A*"
-        self.running = False
-        self.status_message: str = ""
-        self.frame_count = 0
-        self.visit_interval = 2
-        self.move_interval = 3
-
-        self.obstacles: Set[Coord] = set()
-        self.snake_pos: Coord = (self.grid_size // 2, self.grid_size // 2)
-        self.food_pos: Coord = self._random_empty_cell()
-        self.state: Optional[AlgorithmState] = None
-        self._search()
 
     # Public API
     def run(self) -> None:
         self.running = True
+        self._draw_full()
+        pygame.display.flip()
         while self.running:
             self.clock.tick(SNAKE_FPS)
-            self.frame_count += 1
             self._handle_events()
-            self._update()
-            self._draw()
-            pygame.display.flip()
+            self.sim.tick()
+            pygame.display.update(self._draw())
+        self.executor.shutdown()
 
     # Event handling
     def _handle_events(self) -> None:
         for event in pygame.event.get():
             if event.type == QUIT:
+                # a search still running would otherwise hold up interpreter exit
+                self.executor.shutdown()
                 pygame.quit()
                 raise SystemExit
             if event.type == KEYDOWN:
@@ -129,170 +99,154 @@ class SnakeGame:
                     self.running = False
                     return
                 if event.key == K_r:
-                    self._reset()
+                    self.sim.reset()
+                elif event.key == K_v:
+                    self.sim.set_animate(not self.sim.animate)
                 elif event.key in self.algorithm_keys:
-                    self.current_algorithm = self.algorithm_keys[event.key]
-                    self._search()
+                    self.sim.select_algorithm(self.algorithm_keys[event.key])
                 elif event.key == K_LEFTBRACKET:
                     # decrease penalty
-                    self.turn_penalty = max(0.0, round(self.turn_penalty - 0.1, 2))
-                    self.ai.turn_penalty = float(self.turn_penalty)
-                    self._search()
+                    self.sim.set_turn_penalty(self.sim.turn_penalty - 0.1)
                 elif event.key == K_RIGHTBRACKET:
                     # increase penalty
-                    self.turn_penalty = round(self.turn_penalty + 0.1, 2)
-                    self.ai.turn_penalty = float(self.turn_penalty)
-                    self._search()
-
-    # Game state
-    def _reset(self) -> None:
-        self.obstacles.clear()
-        self.snake_pos = (self.grid_size // 2, self.grid_size // 2)
-        self.food_pos = self._random_empty_cell()
-        self.state = None
-        self.status_message = ""
-        self.frame_count = 0
-        self._search()
-
-    def _update(self) -> None:
-        if not self.state:
-            return
-
-        if not self.state.visited_complete():
-            if self.frame_count % self.visit_interval == 0:
-                self.state.advance_visited()
-            return
-
-        if not self.state.result.succeeded:
-            return
-
-        if self.frame_count % self.move_interval == 0:
-            next_coord = self.state.next_path_coord()
-            if next_coord is None:
-                return
-            self.snake_pos = next_coord
-            self.state.advance_path()
-            if self.snake_pos == self.food_pos:
-                self._handle_food_reached()
-
-    def _handle_food_reached(self) -> None:
-        self.food_pos = self._random_empty_cell()
-        self.state = None
-        self.frame_count = 0
-        self._search()
-
-    def _search(self) -> None:
-        algorithm = self.algorithms[self.current_algorithm]
-        grid = self._build_grid()
-        result = algorithm(self.snake_pos, self.food_pos, grid)
-        self.state = AlgorithmState(result=result, visited_step=0)
-        self.frame_count = 0
-        if not result.succeeded:
-            self.status_message = "No path found. Press R to reset."
-        else:
-            length = max(0, len(result.path) - 1)
-            self.status_message = f"{self.current_algorithm} path length: {length}"
+                    self.sim.set_turn_penalty(self.sim.turn_penalty + 0.1)
 
     # Rendering
-    def _draw(self) -> None:
-        self.screen.fill(COLOR_BLACK)
-        self._draw_grid()
-        self._draw_overlays()
-        self._draw_hud()
-
-    def _draw_grid(self) -> None:
-        for y in range(self.grid_size):
-            for x in range(self.grid_size):
-                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(self.screen, COLOR_GRID, rect, 1)
-
-    def _draw_overlays(self) -> None:
-        visited = set()
-        frontier = set()
-        path_cells = set()
-        if self.state:
-            visited = self.state.visited_cells()
-            if self.state.visited_complete() and self.state.result.succeeded:
-                frontier = set()
-                path_cells = set(self.state.path_remaining())
+    def _render_background(self) -> pygame.Surface:
+        size = self.cell_size
+        background = pygame.Surface(self.screen.get_size()).convert(self.screen)
+        background.fill(COLOR_BLACK)
+        # outlines would cover tiny cells entirely
+        if size >= 4:
+            for y in range(self.grid_size):
+                for x in range(self.grid_size):
+                    pygame.draw.rect(background, COLOR_GRID, pygame.Rect(x * size, y * size, size, size), 1)
+        return background
+
+    def _draw_full(self) -> None:
+        """Repaint everything, for the first frame or after another screen used the display."""
+        self.screen.blit(self.background, (0, 0))
+        self._painted.clear()
+        self._hud = []
+        self._drawn_state = None
+        self._drawn_obstacles = frozenset()
+        self._draw()
+
+    def _draw(self) -> List[pygame.Rect]:
+        """Repaint what changed since the last frame and return the rects to update."""
+        sim = self.sim
+        state = sim.state
+        if state is not self._drawn_state:
+            # a new search: clear the old overlay and lay out the new one, once per search
+            changed = set(self._painted)
+            if state:
+                state.take_changes()
+                changed.update(state.visited_cells(), state.frontier_cells(), state.path_cells())
+            self._drawn_state = state
+        else:
+            changed = state.take_changes() if state else set()
+        changed.update((self._drawn_snake, self._drawn_food, sim.snake_pos, sim.food_pos))
+        self._drawn_snake, self._drawn_food = sim.snake_pos, sim.food_pos
+        if sim.obstacles != self._drawn_obstacles:
+            changed.update(sim.obstacles ^ self._drawn_obstacles)
+            self._drawn_obstacles = frozenset(sim.obstacles)
+
+        painted = self._painted
+        dirty: List[pygame.Rect] = []
+        for cell in changed:
+            color = self._cell_color(cell)
+            if painted.get(cell) == color:
+                continue
+            if color is None:
+                del painted[cell]
             else:
-                frontier = self.state.frontier_cells()
-
-        for cell in visited:
-            self._fill_cell(cell, COLOR_VISITED)
-        for cell in frontier:
-            self._fill_cell(cell, COLOR_FRONTIER)
-        for cell in path_cells:
-            self._fill_cell(cell, COLOR_PATH)
-        for cell in self.obstacles:
-            self._fill_cell(cell, COLOR_ALERT)
-
-        self._fill_cell(self.food_pos, COLOR_FOOD)
-        self._fill_cell(self.snake_pos, COLOR_SNAKE)
-
-    def _fill_cell(self, cell: Coord, color: Tuple[int, int, int]) -> None:
+                painted[cell] = color
+            dirty.append(self._paint_cell(cell))
+
+        previous, self._hud = self._hud, self._hud_lines()
+        for index, (surface, position) in enumerate(self._hud):
+            rect = surface.get_rect(topleft=position)
+            if index < len(previous):
+                old_surface, old_position = previous[index]
+                if old_surface is surface and rect.collidelist(dirty) < 0:
+                    continue
+                rect.union_ip(old_surface.get_rect(topleft=old_position))
+            self._repaint_area(rect)
+            dirty.append(rect)
+        return dirty
+
+    def _cell_color(self, cell: Coord) -> Optional[Color]:
+        # snake over food over obstacles over the search overlay
+        sim = self.sim
+        if cell == sim.snake_pos:
+            return COLOR_SNAKE
+        if cell == sim.food_pos:
+            return COLOR_FOOD
+        if cell in sim.obstacles:
+            return COLOR_ALERT
+        layer = sim.state.layer(cell) if sim.state else NONE
+        return LAYER_COLORS.get(layer)
+
+    def _cell_rect(self, cell: Coord) -> pygame.Rect:
         x, y = cell
-        rect = pygame.Rect(x * CELL_SIZE + 1, y * CELL_SIZE + 1, CELL_SIZE - 2, CELL_SIZE - 2)
-        pygame.draw.rect(self.screen, color, rect)
-
-    def _draw_hud(self) -> None:
+        size = self.cell_size
+        return pygame.Rect(x * size, y * size, size, size)
+
+    def _fill_cell(self, cell: Coord, color: Color) -> None:
+        # keep the outline visible when there is one
+        margin = 1 if self.cell_size >= 4 else 0
+        pygame.draw.rect(self.screen, color, self._cell_rect(cell).inflate(-2 * margin, -2 * margin))
+
+    def _paint_cell(self, cell: Coord) -> pygame.Rect:
+        rect = self._cell_rect(cell)
+        self.screen.blit(self.background, rect, rect)
+        color = self._painted.get(cell)
+        if color is not None:
+            self._fill_cell(cell, color)
+        return rect
+
+    def _repaint_area(self, rect: pygame.Rect) -> None:
+        """Background, cells and HUD text inside ``rect``, clipped to it."""
+        screen = self.screen
+        screen.set_clip(rect)
+        screen.blit(self.background, rect, rect)
+        size = self.cell_size
+        for x in range(rect.left // size, min(self.grid_size, (rect.right - 1) // size + 1)):
+            for y in range(rect.top // size, min(self.grid_size, (rect.bottom - 1) // size + 1)):
+                color = self._painted.get((x, y))
+                if color is not None:
+                    self._fill_cell((x, y), color)
+        for surface, position in self._hud:
+            if rect.colliderect(surface.get_rect(topleft=position)):
+                screen.blit(surface, position)
+        screen.set_clip(None)
+
+    def _hud_lines(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
         lines = [
-            f"Algorithm: {self.current_algorithm}",
+            f"Algorithm: {self.sim.current_algorithm}",
             "1-DFS  2-BFS  3-UCS  4-A*",
-            "R-Reset  ESC-Menu",
-            self.status_message,
-        ]
-        # show main HUD in bottom-left
-        for idx, text in enumerate(lines):
-            surface = self.font_small.render(text, True, COLOR_WHITE)
-            self.screen.blit(surface, (10, WINDOW_HEIGHT - (len(lines) - idx) * 20 - 10))
-
-        # show current turn-penalty and path cost at top-left
-        penalty_surface = self.font_small.render(f"Turn penalty: {self.turn_penalty}", True, COLOR_WHITE)
-        self.screen.blit(penalty_surface, (10, 10))
-        path_cost = self._compute_current_path_cost()
-        cost_surface = self.font_small.render(f"Path cost: {path_cost:.2f}", True, COLOR_WHITE)
-        self.screen.blit(cost_surface, (10, 32))
-        hint_surface = self.font_small.render("Adjust penalty: [  ]", True, COLOR_WHITE)
-        self.screen.blit(hint_surface, (10, 54))
-
-    def _compute_current_path_cost(self) -> float:
-        if not self.state or not self.state.result.path:
-            return 0.0
-        path = self.state.result.path
-        total = 0.0
-        # add base cost per move
-        for i in range(1, len(path)):
-            total += 1.0
-
-        # add turn penalties when direction changes
-        for i in range(1, len(path) - 1):
-            p = path[i - 1]
-            c = path[i]
-            n = path[i + 1]
-            prev_dir = (c[0] - p[0], c[1] - p[1])
-            new_dir = (n[0] - c[0], n[1] - c[1])
-            if prev_dir != new_dir:
-                total += self.turn_penalty
-
-        return total
-
-    # Grid helpers
-    def _build_grid(self) -> List[List[int]]:
-        grid = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        for ox, oy in self.obstacles:
-            grid[oy][ox] = 1
-        return grid
-
-    def _random_empty_cell(self) -> Coord:
-        candidates = [
-            (x, y)
-            for y in range(self.grid_size)
-            for x in range(self.grid_size)
-            if (x, y) not in self.obstacles
+            "5-Bi-BFS  6-Bi-A*  7-JPS  8-Heading-A*  9-D* Lite",
+            "R-Reset  V-Visualize  ESC-Menu",
+            self._status(),
         ]
-        random.shuffle(candidates)
-        for cell in candidates:
-            if cell != getattr(self, "snake_pos", None):
-                return cell
-        return (self.grid_size // 2, self.grid_size // 2)
\ No newline at end of file
+        height = self.screen.get_height()
+        # main HUD in the bottom-left
+        hud = [(self._text(text), (10, height - (len(lines) - idx) * 20 - 10)) for idx, text in enumerate(lines)]
+        # current turn penalty and path cost in the top-left
+        hud.append((self._text(f"Turn penalty: {self.sim.turn_penalty}"), (10, 10)))
+        hud.append((self._text(f"Path cost: {self.sim.path_cost():.2f}"), (10, 32)))
+        hud.append((self._text("Adjust penalty: [  ]"), (10, 54)))
+        return hud
+
+    def _status(self) -> str:
+        if self.sim.pending is None:
+            return self.sim.status_message
+        return f"{self.sim.status_message} {SPINNER[self.sim.ticks // 4 % len(SPINNER)]}"
+
+    def _text(self, text: str) -> pygame.Surface:
+        surface = self._text_cache.get(text)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surface = self._text_cache[text] = self.font_small.render(text, True, COLOR_WHITE)
+        return surface
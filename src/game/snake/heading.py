@@ -0,0 +1,279 @@
+"""Turn-penalty searches over (cell, heading) states.
+
+``SnakeAI.ucs``/``a_star`` key their tables by cell alone, so whichever heading
+reaches a cell first wins and a cheaper arrival from another direction can be
+lost. Here every cell has four states, one per arrival heading, which makes the
+cost of a move depend only on the state it leaves and so keeps the results
+optimal under the turn-penalty model.
+
+When the penalty is a multiple of ``1 / COST_SCALE`` (the ``[``/``]`` keys move
+it in 0.1 steps) all costs are scaled to integers and kept in a ``BucketQueue``
+with O(1) push and pop; any other penalty falls back to a binary heap.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+COST_SCALE = 10
+
+
+class BucketQueue:
+    """Dial's monotone priority queue for integer priorities.
+
+    Every pushed priority must lie in ``[minimum, minimum + span]`` where
+    ``minimum`` is the last popped priority (initially the given one), which
+    holds for Dijkstra/A* with a consistent heuristic when ``span`` bounds the
+    growth of f along one edge.
+    """
+
+    __slots__ = ("_buckets", "_size", "_cursor", "_count")
+
+    def __init__(self, span: int, minimum: int = 0) -> None:
+        self._size = span + 1
+        self._buckets: List[List[int]] = [[] for _ in range(self._size)]
+        self._cursor = minimum
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, priority: float, item: int) -> None:
+        self._buckets[int(priority) % self._size].append(item)
+        self._count += 1
+
+    def pop(self) -> Tuple[int, int]:
+        if not self._count:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self._buckets
+        size = self._size
+        cursor = self._cursor
+        while not buckets[cursor % size]:
+            cursor += 1
+        self._cursor = cursor
+        self._count -= 1
+        return cursor, buckets[cursor % size].pop()
+
+
+class HeapQueue:
+    """Binary-heap fallback with the BucketQueue interface."""
+
+    __slots__ = ("_heap",)
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, priority: float, item: int) -> None:
+        heapq.heappush(self._heap, (priority, item))
+
+    def pop(self) -> Tuple[float, int]:
+        return heapq.heappop(self._heap)
+
+
+def heading_search(start: int, goal: int, grid: FlatGrid, turn_penalty: float, guided: bool = True) -> Steps:
+    """Dijkstra (``guided=False``) or A* over (cell, heading) states.
+
+    State ``cell * 4 + k`` is ``cell`` entered by moving along ``grid.offsets[k]``.
+    The start has no heading, so it is expanded before the loop and its first
+    move is never charged a turn.
+    """
+    if start == goal:
+        yield SearchStep(start, (), last=True)
+        return [start]
+
+    cells = grid.cells
+    offsets = grid.offsets
+    stride = grid.stride
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+    units = turn_penalty * COST_SCALE
+    queue: BucketQueue | HeapQueue
+    if abs(units - round(units)) < 1e-9:
+        move, turn = float(COST_SCALE), float(round(units))
+        # f grows by at most one move and one turn per edge, plus as much again from h
+        span = int(move + turn) * (2 if guided else 1)
+        queue = BucketQueue(span, int(move * (abs(start_x - goal_x) + abs(start_y - goal_y)) if guided else 0))
+    else:
+        move, turn = 1.0, turn_penalty
+        queue = HeapQueue()
+    estimate = _estimator(offsets, stride, goal, move, turn) if guided else None
+
+    states = 4 * len(cells)
+    dist = array("d", [float("inf")]) * states
+    # predecessor state, or -1 for states entered straight from the start
+    parents = array("i", [-1]) * states
+    closed = bytearray(states)
+
+    pushed: List[int] = []
+    for k, step in enumerate(offsets):
+        neighbor = start + step
+        if cells[neighbor]:
+            continue
+        state = neighbor * 4 + k
+        dist[state] = move
+        queue.push(move + estimate(neighbor, k) if estimate else move, state)
+        pushed.append(neighbor)
+    yield SearchStep(start, tuple(pushed))
+
+    stale: List[int] = []
+    while queue:
+        _, state = queue.pop()
+        cell = state >> 2
+        if closed[state]:
+            stale.append(cell)
+            continue
+        closed[state] = 1
+        if cell == goal:
+            yield SearchStep(cell, (), tuple(stale), last=True)
+            return _reconstruct(parents, state, start)
+
+        heading = state & 3
+        straight = dist[state] + move
+        turned = straight + turn
+        pushed = []
+        for k, step in enumerate(offsets):
+            # offsets come in opposite pairs, so k ^ 1 is a U-turn, which never pays off
+            if k == heading ^ 1:
+                continue
+            neighbor = cell + step
+            if cells[neighbor]:
+                continue
+            new_cost = straight if k == heading else turned
+            target = neighbor * 4 + k
+            if new_cost < dist[target]:
+                dist[target] = new_cost
+                parents[target] = state
+                queue.push(new_cost + estimate(neighbor, k) if estimate else new_cost, target)
+                pushed.append(neighbor)
+        yield SearchStep(cell, tuple(pushed), tuple(stale))
+        stale.clear()
+
+    return []
+
+
+def heading_path(start: int, goal: int, grid: FlatGrid, turn_penalty: float, guided: bool = True) -> List[int]:
+    """Path-only ``heading_search``: the same search without step reporting.
+
+    With quantized costs the bucket queue and the heuristic are inlined into the
+    loop, so a push is one list append and a pop scans forward from the previous
+    minimum; other penalties drain ``heading_search`` instead.
+    """
+    units = turn_penalty * COST_SCALE
+    if abs(units - round(units)) >= 1e-9:
+        steps = heading_search(start, goal, grid, turn_penalty, guided)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+    if start == goal:
+        return [start]
+
+    cells = grid.cells
+    stride = grid.stride
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+    move = COST_SCALE
+    turn = round(units)
+    size = (move + turn) * (2 if guided else 1) + 1
+    buckets: List[List[int]] = [[] for _ in range(size)]
+    cursor = move * (abs(start_x - goal_x) + abs(start_y - goal_y)) if guided else 0
+    queued = 0
+
+    states = 4 * len(cells)
+    dist = array("l", [-1]) * states
+    parents = array("i", [-1]) * states
+    closed = bytearray(states)
+    # per heading k: offset, U-turn heading and unit direction
+    moves = tuple(
+        (k, step, k ^ 1, step // stride if step % stride == 0 else 0, 0 if step % stride == 0 else step)
+        for k, step in enumerate(grid.offsets)
+    )
+
+    # the start has no heading: seed its neighbours directly (this is the "parents == -1" case)
+    estimate = _estimator(grid.offsets, stride, goal, move, turn) if guided else None
+    for k, step, _, _, _ in moves:
+        neighbor = start + step
+        if not cells[neighbor]:
+            dist[neighbor * 4 + k] = move
+            buckets[int(move + estimate(neighbor, k) if estimate else move) % size].append(neighbor * 4 + k)
+            queued += 1
+
+    while queued:
+        bucket = buckets[cursor % size]
+        while not bucket:
+            cursor += 1
+            bucket = buckets[cursor % size]
+        state = bucket.pop()
+        queued -= 1
+        if closed[state]:
+            continue
+        closed[state] = 1
+        cell = state >> 2
+        if cell == goal:
+            return _reconstruct(parents, state, start)
+        heading = state & 3
+        straight = dist[state] + move
+        turned = straight + turn
+        for k, step, reverse, sx, sy in moves:
+            if reverse == heading:
+                continue
+            neighbor = cell + step
+            if cells[neighbor]:
+                continue
+            new_cost = straight if k == heading else turned
+            target = neighbor * 4 + k
+            previous = dist[target]
+            if previous < 0 or new_cost < previous:
+                dist[target] = new_cost
+                parents[target] = state
+                if guided:
+                    x, y = divmod(neighbor, stride)
+                    dx, dy = goal_x - x, goal_y - y
+                    new_cost += move * (abs(dx) + abs(dy))
+                    if dx * sy != dy * sx or dx * sx + dy * sy < 0:
+                        new_cost += turn
+                buckets[new_cost % size].append(target)
+                queued += 1
+
+    return []
+
+
+def _estimator(offsets: Tuple[int, ...], stride: int, goal: int, move: float, turn: float):
+    """Heuristic for state (cell, k): Manhattan moves, plus one turn unless the
+    goal lies straight ahead along heading k. Both parts are consistent: a move
+    lowers the distance by at most one, and a state can only gain "straight
+    ahead" by turning into it."""
+    goal_x, goal_y = divmod(goal, stride)
+    # unit (dx, dy) per heading index
+    directions = tuple((step // stride, 0) if step % stride == 0 else (0, step) for step in offsets)
+
+    def estimate(cell: int, k: int) -> float:
+        x, y = divmod(cell, stride)
+        dx, dy = goal_x - x, goal_y - y
+        sx, sy = directions[k]
+        cost = move * (abs(dx) + abs(dy))
+        if dx * sy != dy * sx or dx * sx + dy * sy < 0:
+            cost += turn
+        return cost
+
+    return estimate
+
+
+def _reconstruct(parents: array, state: int, start: int) -> List[int]:
+    path: List[int] = []
+    while state >= 0:
+        path.append(state >> 2)
+        state = parents[state]
+    path.append(start)
+    path.reverse()
+    return path
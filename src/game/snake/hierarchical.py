@@ -0,0 +1,268 @@
+"""Hierarchical path-finding (HPA*) over square clusters of the grid.
+
+The grid is cut into ``cluster_size`` squares. Wherever two neighbouring
+clusters share a run of free cells along their border there is an entrance,
+represented by one transition (a pair of facing cells) in its middle, or one
+at each end once the run is ``WIDE_ENTRANCE`` cells or wider. Transition cells
+form the abstract graph: facing cells are linked with cost 1, and the cells of
+one cluster are linked with their BFS distance inside that cluster.
+
+A query links start and goal to their clusters' entrances, runs A* over the
+abstract graph, and then refines each abstract edge with a BFS confined to one
+cluster. Paths are near-optimal, not optimal. Moves cost 1 and turn penalties
+are ignored, as they are by bfs.
+
+Entrances are found once, for the whole grid. Intra-cluster distances are
+computed the first time a query touches a cluster and then kept. After an
+obstacle edit, only the borders of the changed clusters are re-scanned, and
+only those clusters and their direct neighbours drop their distances.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+CLUSTER_SIZE = 10
+WIDE_ENTRANCE = 6
+
+Cluster = Tuple[int, int]
+# (cx, cy, axis): the border between cluster (cx, cy) and (cx + 1, cy) for axis 0, (cx, cy + 1) for axis 1
+Border = Tuple[int, int, int]
+
+
+class HierarchicalPlanner:
+    def __init__(self, grid: FlatGrid, cluster_size: int = CLUSTER_SIZE) -> None:
+        if cluster_size < 1:
+            raise ValueError(f"cluster size must be positive, got {cluster_size}")
+        # private copy: changes are found by diffing it against later grids
+        self.grid = grid.copy()
+        self.cluster_size = cluster_size
+        self.columns = -(-grid.width // cluster_size)
+        self.rows = -(-grid.height // cluster_size)
+        # transitions per border, as (cell in the lower cluster, cell in the upper one)
+        self._borders: Dict[Border, List[Tuple[int, int]]] = {}
+        # transition cell -> facing cells across its border(s)
+        self._partners: Dict[int, List[int]] = {}
+        # cluster -> transition cell -> {transition cell: distance}; filled on demand
+        self._intra: Dict[Cluster, Dict[int, Dict[int, int]]] = {}
+        for cx in range(self.columns):
+            for cy in range(self.rows):
+                if cx + 1 < self.columns:
+                    self._build_border((cx, cy, 0))
+                if cy + 1 < self.rows:
+                    self._build_border((cx, cy, 1))
+
+    # Updates
+    def sync(self, grid: FlatGrid) -> Set[Cluster]:
+        """Apply every cell that differs from ``grid``; returns the clusters whose distances were dropped."""
+        changed = self.grid.diff(grid)
+        for cell in changed:
+            self.grid.cells[cell] = grid.cells[cell]
+        return self.update_cells(changed)
+
+    def update_cells(self, changed: Iterable[int]) -> Set[Cluster]:
+        """Rebuild around cells whose blocked state was changed in ``self.grid``."""
+        clusters = {self.cluster_of(cell) for cell in changed}
+        dropped = set(clusters)
+        borders = set()
+        for cx, cy in clusters:
+            for border in ((cx, cy, 0), (cx - 1, cy, 0), (cx, cy, 1), (cx, cy - 1, 1)):
+                if border in self._borders:
+                    borders.add(border)
+        for border in borders:
+            self._build_border(border)
+            cx, cy, axis = border
+            # both clusters along a re-scanned border may have gained or lost transition cells
+            dropped.add((cx, cy))
+            dropped.add((cx + 1, cy) if axis == 0 else (cx, cy + 1))
+        for cluster in dropped:
+            self._intra.pop(cluster, None)
+        return dropped
+
+    # Queries
+    def search(self, start: int, goal: int) -> Steps:
+        """Abstract A*, one SearchStep per abstract node; returns the refined path."""
+        cells = self.grid.cells
+        if cells[goal]:
+            return []
+        stride = self.grid.stride
+        start_cluster = self.cluster_of(start)
+        start_dist, _ = self._local_bfs(start, start_cluster)
+        start_links = {node: start_dist[node] for node in self._nodes(start_cluster) if node in start_dist}
+        if goal in start_dist:
+            start_links[goal] = start_dist[goal]
+        goal_dist, _ = self._local_bfs(goal, self.cluster_of(goal))
+        goal_links = {node: goal_dist[node] for node in self._nodes(self.cluster_of(goal)) if node in goal_dist}
+
+        goal_x, goal_y = divmod(goal, stride)
+        start_x, start_y = divmod(start, stride)
+        heap: List[Tuple[int, int, int]] = [(abs(start_x - goal_x) + abs(start_y - goal_y), 0, start)]
+        costs: Dict[int, int] = {start: 0}
+        parents: Dict[int, int] = {start: start}
+        closed: Set[int] = set()
+        stale: List[int] = []
+
+        while heap:
+            _, g_cost, current = heapq.heappop(heap)
+            if current in closed:
+                stale.append(current)
+                continue
+            closed.add(current)
+            if current == goal:
+                yield SearchStep(current, (), tuple(stale), last=True)
+                return self._refine(self._chain(parents, start, goal))
+
+            pushed: List[int] = []
+            for neighbor, weight in self._edges(current, start, start_links, goal, goal_links):
+                new_cost = g_cost + weight
+                if new_cost < costs.get(neighbor, new_cost + 1):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = current
+                    x, y = divmod(neighbor, stride)
+                    heapq.heappush(heap, (new_cost + abs(x - goal_x) + abs(y - goal_y), new_cost, neighbor))
+                    pushed.append(neighbor)
+            yield SearchStep(current, tuple(pushed), tuple(stale))
+            stale.clear()
+
+        return []
+
+    def cluster_of(self, cell: int) -> Cluster:
+        x, y = divmod(cell, self.grid.stride)
+        return ((x - 1) // self.cluster_size, (y - 1) // self.cluster_size)
+
+    def node_count(self) -> int:
+        return len(self._partners)
+
+    # Abstract graph
+    def _edges(
+        self,
+        node: int,
+        start: int,
+        start_links: Dict[int, int],
+        goal: int,
+        goal_links: Dict[int, int],
+    ) -> Iterator[Tuple[int, int]]:
+        if node == start:
+            yield from start_links.items()
+        else:
+            yield from self._intra_edges(self.cluster_of(node)).get(node, {}).items()
+            if node in goal_links:
+                yield goal, goal_links[node]
+        for partner in self._partners.get(node, ()):
+            yield partner, 1
+
+    def _intra_edges(self, cluster: Cluster) -> Dict[int, Dict[int, int]]:
+        edges = self._intra.get(cluster)
+        if edges is None:
+            nodes = self._nodes(cluster)
+            edges = {}
+            for node in nodes:
+                distances, _ = self._local_bfs(node, cluster)
+                edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+            self._intra[cluster] = edges
+        return edges
+
+    def _nodes(self, cluster: Cluster) -> List[int]:
+        cx, cy = cluster
+        nodes: Set[int] = set()
+        for border, side in (((cx, cy, 0), 0), ((cx - 1, cy, 0), 1), ((cx, cy, 1), 0), ((cx, cy - 1, 1), 1)):
+            for transition in self._borders.get(border, ()):
+                nodes.add(transition[side])
+        return sorted(nodes)
+
+    def _build_border(self, border: Border) -> None:
+        for lower, upper in self._borders.get(border, ()):
+            self._unlink(lower, upper)
+            self._unlink(upper, lower)
+
+        grid = self.grid
+        cells = grid.cells
+        size = self.cluster_size
+        cx, cy, axis = border
+        if axis == 0:
+            x = (cx + 1) * size - 1
+            pairs = [(grid.index(x, y), grid.index(x + 1, y)) for y in range(cy * size, min((cy + 1) * size, grid.height))]
+        else:
+            y = (cy + 1) * size - 1
+            pairs = [(grid.index(x, y), grid.index(x, y + 1)) for x in range(cx * size, min((cx + 1) * size, grid.width))]
+
+        transitions: List[Tuple[int, int]] = []
+        run: List[Tuple[int, int]] = []
+        for lower, upper in pairs + [(-1, -1)]:
+            if lower >= 0 and not cells[lower] and not cells[upper]:
+                run.append((lower, upper))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self._borders[border] = transitions
+        for lower, upper in transitions:
+            self._partners.setdefault(lower, []).append(upper)
+            self._partners.setdefault(upper, []).append(lower)
+
+    def _unlink(self, cell: int, partner: int) -> None:
+        partners = self._partners[cell]
+        partners.remove(partner)
+        if not partners:
+            del self._partners[cell]
+
+    # Refinement
+    def _local_bfs(self, source: int, cluster: Cluster) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """BFS confined to ``cluster``: distances and parents of every cell it reaches."""
+        cells = self.grid.cells
+        offsets = self.grid.offsets
+        stride = self.grid.stride
+        size = self.cluster_size
+        # cluster bounds in FlatGrid column/row numbers (both shifted by the border)
+        low_x, low_y = cluster[0] * size + 1, cluster[1] * size + 1
+        high_x, high_y = low_x + size, low_y + size
+        distances = {source: 0}
+        parents = {source: source}
+        layer = [source]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer: List[int] = []
+            for current in layer:
+                for step in offsets:
+                    neighbor = current + step
+                    if cells[neighbor] or neighbor in parents:
+                        continue
+                    x, y = divmod(neighbor, stride)
+                    if not (low_x <= x < high_x and low_y <= y < high_y):
+                        continue
+                    parents[neighbor] = current
+                    distances[neighbor] = depth
+                    next_layer.append(neighbor)
+            layer = next_layer
+        return distances, parents
+
+    def _refine(self, abstract: List[int]) -> List[int]:
+        path = [abstract[0]]
+        for before, after in zip(abstract, abstract[1:]):
+            cluster = self.cluster_of(before)
+            if cluster != self.cluster_of(after):
+                # facing transition cells
+                path.append(after)
+                continue
+            _, parents = self._local_bfs(before, cluster)
+            segment = self._chain(parents, before, after)
+            path.extend(segment[1:])
+        return path
+
+    def _chain(self, parents: Dict[int, int], start: int, goal: int) -> List[int]:
+        chain = [goal]
+        node = goal
+        while node != start:
+            node = parents[node]
+            chain.append(node)
+        chain.reverse()
+        return chain
@@ -0,0 +1,179 @@
+"""D* Lite: a shortest-path planner that repairs its tables instead of replanning.
+
+The planner searches backwards from the goal, so the g/rhs tables stay valid as
+the start moves; only the key modifier ``km`` changes. When cells toggle
+between free and blocked, only those cells and their neighbours get a new rhs,
+and ``compute()`` re-expands just the region whose distances actually changed.
+A new goal invalidates every distance and needs a fresh planner. Moves cost 1
+and turn penalties are ignored, as they are by bfs.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, List, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+INF = float("inf")
+
+
+class DStarLite:
+    def __init__(self, grid: FlatGrid, start: int, goal: int) -> None:
+        # private copy: changes are found by diffing it against later grids
+        self.grid = grid.copy()
+        self.start = start
+        self.goal = goal
+        size = len(self.grid.cells)
+        self.g = array("d", [INF]) * size
+        self.rhs = array("d", [INF]) * size
+        self.rhs[goal] = 0.0
+        self.km = 0.0
+        self._last_start = start
+        # lazy priority queue: _keys holds the live key of every queued cell
+        self._heap: List[Tuple[float, float, int]] = []
+        self._keys: dict[int, Tuple[float, float]] = {}
+        self._update_vertex(goal)
+
+    # Updates
+    def move_start(self, start: int) -> None:
+        # queued keys stay valid lower bounds once km absorbs how far the start moved
+        self.km += self._h(self._last_start, start)
+        self._last_start = start
+        self.start = start
+
+    def sync(self, grid: FlatGrid) -> List[int]:
+        """Apply every cell that differs from ``grid``; returns the changed cells."""
+        changed = self.grid.diff(grid)
+        for cell in changed:
+            self.grid.cells[cell] = grid.cells[cell]
+        self.update_cells(changed)
+        return changed
+
+    def update_cells(self, changed: Iterable[int]) -> None:
+        """Re-derive rhs around cells whose blocked state was changed in ``self.grid``."""
+        offsets = self.grid.offsets
+        touched = set()
+        for cell in changed:
+            touched.add(cell)
+            touched.update(cell + step for step in offsets)
+        for cell in touched:
+            if cell != self.goal:
+                self.rhs[cell] = self._best_successor(cell)
+            self._update_vertex(cell)
+
+    # Planning
+    def compute(self) -> Steps:
+        """Expand inconsistent cells until the start is settled, one SearchStep each.
+
+        The tables are consistent between yields, so the generator may be
+        abandoned early and ``compute()`` called again later.
+        """
+        g, rhs = self.g, self.rhs
+        heap, keys = self._heap, self._keys
+        cells = self.grid.cells
+        offsets = self.grid.offsets
+        stale: List[int] = []
+        pushed: List[int] = []
+
+        while heap:
+            k1, k2, cell = heap[0]
+            if keys.get(cell) != (k1, k2):
+                heapq.heappop(heap)
+                stale.append(cell)
+                continue
+            start = self.start
+            start_key = self._key(start)
+            # the start may stay overconsistent: its rhs already follows from settled cells
+            if (k1, k2) >= start_key and rhs[start] <= g[start]:
+                break
+            new_key = self._key(cell)
+            if (k1, k2) < new_key:
+                # re-keying pops and re-pushes the same cell, which leaves the frontier as it was,
+                # so it is not reported; the cell may be expanded in this very step
+                heapq.heappop(heap)
+                keys[cell] = new_key
+                heapq.heappush(heap, (new_key[0], new_key[1], cell))
+                continue
+
+            heapq.heappop(heap)
+            del keys[cell]
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+                # only the goal can be expanded while blocked, and then it leads nowhere
+                through = INF if cells[cell] else g[cell] + 1.0
+                for step in offsets:
+                    neighbor = cell + step
+                    if neighbor != self.goal and not cells[neighbor] and through < rhs[neighbor]:
+                        rhs[neighbor] = through
+                    if self._update_vertex(neighbor):
+                        pushed.append(neighbor)
+            else:
+                old = g[cell] + 1.0
+                g[cell] = INF
+                for neighbor in (cell, *(cell + step for step in offsets)):
+                    if neighbor != self.goal and (neighbor == cell or rhs[neighbor] == old):
+                        rhs[neighbor] = self._best_successor(neighbor)
+                    if self._update_vertex(neighbor):
+                        pushed.append(neighbor)
+            yield SearchStep(cell, tuple(pushed), tuple(stale))
+            pushed.clear()
+            stale.clear()
+
+        return self.path()
+
+    def path(self) -> List[int]:
+        g = self.g
+        offsets = self.grid.offsets
+        cells = self.grid.cells
+        node = self.start
+        if self.rhs[node] == INF and node != self.goal:
+            return []
+        path = [node]
+        while node != self.goal:
+            best = min((g[node + step], node + step) for step in offsets if not cells[node + step])
+            if best[0] == INF or len(path) > len(cells):
+                return []
+            node = best[1]
+            path.append(node)
+        return path
+
+    def queued(self) -> Tuple[int, ...]:
+        """Every cell with an entry in the queue, stale entries included."""
+        return tuple(cell for _, _, cell in self._heap)
+
+    # Helpers
+    def _h(self, a: int, b: int) -> float:
+        ax, ay = divmod(a, self.grid.stride)
+        bx, by = divmod(b, self.grid.stride)
+        return float(abs(ax - bx) + abs(ay - by))
+
+    def _key(self, cell: int) -> Tuple[float, float]:
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self._h(self.start, cell) + self.km, best)
+
+    def _best_successor(self, cell: int) -> float:
+        cells = self.grid.cells
+        if cells[cell]:
+            return INF
+        best = INF
+        for step in self.grid.offsets:
+            neighbor = cell + step
+            if not cells[neighbor] and self.g[neighbor] < best:
+                best = self.g[neighbor]
+        return best + 1.0
+
+    def _update_vertex(self, cell: int) -> bool:
+        # queue cell iff it is inconsistent; returns True when a heap entry was pushed
+        if self.g[cell] != self.rhs[cell]:
+            key = self._key(cell)
+            if self._keys.get(cell) != key:
+                self._keys[cell] = key
+                heapq.heappush(self._heap, (key[0], key[1], cell))
+                return True
+        else:
+            self._keys.pop(cell, None)
+        return False
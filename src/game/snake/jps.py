@@ -0,0 +1,137 @@
+"""Jump Point Search for 4-connected, uniform-cost grids.
+
+Among the many equal-length paths on an open grid, only "horizontal first" ones
+are searched: a path may turn from horizontal to vertical anywhere, but may
+only turn from vertical to horizontal where an obstacle forces it (the cell
+diagonally behind, on that side, is blocked). Horizontal scans therefore play
+the role diagonal scans play in 8-connected JPS: every cell they pass launches
+two vertical scans, and becomes a jump point if either finds one. The result is
+optimal for unit move costs; turn penalties are ignored, as they are by BFS.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Tuple
+import heapq
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+def jump_point_search(start: int, goal: int, grid: FlatGrid) -> Steps:
+    cells = grid.cells
+    stride = grid.stride
+    horizontal = (-stride, stride)
+    vertical = (-1, 1)
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+    heap: List[Tuple[int, int, int]] = [(abs(start_x - goal_x) + abs(start_y - goal_y), 0, start)]
+    parents = array("i", [-1]) * len(cells)
+    parents[start] = start
+    costs = array("l", [-1]) * len(cells)
+    costs[start] = 0
+    closed = bytearray(len(cells))
+    stale: List[int] = []
+
+    while heap:
+        _, g_cost, current = heapq.heappop(heap)
+        if closed[current]:
+            stale.append(current)
+            continue
+        closed[current] = 1
+        if current == goal:
+            yield SearchStep(current, (), tuple(stale), last=True)
+            return _expand(parents, start, goal, stride)
+
+        pushed: List[int] = []
+        for jump_point in _successors(cells, current, current - parents[current], stride, goal, horizontal, vertical):
+            new_cost = g_cost + _distance(current, jump_point, stride)
+            if costs[jump_point] < 0 or new_cost < costs[jump_point]:
+                costs[jump_point] = new_cost
+                parents[jump_point] = current
+                x, y = divmod(jump_point, stride)
+                heapq.heappush(heap, (new_cost + abs(x - goal_x) + abs(y - goal_y), new_cost, jump_point))
+                pushed.append(jump_point)
+        yield SearchStep(current, tuple(pushed), tuple(stale))
+        stale.clear()
+
+    return []
+
+
+def _successors(
+    cells: bytearray,
+    node: int,
+    travelled: int,
+    stride: int,
+    goal: int,
+    horizontal: Tuple[int, int],
+    vertical: Tuple[int, int],
+) -> List[int]:
+    # travelled is node - parent: 0 at the start, a multiple of stride for horizontal moves
+    if not travelled:
+        scans = [(step, True) for step in horizontal] + [(step, False) for step in vertical]
+    elif travelled % stride == 0:
+        dx = stride if travelled > 0 else -stride
+        scans = [(dx, True), (-1, False), (1, False)]
+    else:
+        dy = 1 if travelled > 0 else -1
+        scans = [(dy, False)]
+        for dx in horizontal:
+            if cells[node - dy + dx] and not cells[node + dx]:
+                scans.append((dx, True))
+
+    found: List[int] = []
+    for step, is_horizontal in scans:
+        if is_horizontal:
+            jump_point = _jump_horizontal(cells, node, step, goal, horizontal)
+        else:
+            jump_point = _jump_vertical(cells, node, step, goal, horizontal)
+        if jump_point >= 0:
+            found.append(jump_point)
+    return found
+
+
+def _jump_vertical(cells: bytearray, node: int, dy: int, goal: int, horizontal: Tuple[int, int]) -> int:
+    while True:
+        node += dy
+        if cells[node]:
+            return -1
+        if node == goal:
+            return node
+        behind = node - dy
+        for dx in horizontal:
+            if cells[behind + dx] and not cells[node + dx]:
+                return node
+
+
+def _jump_horizontal(cells: bytearray, node: int, dx: int, goal: int, horizontal: Tuple[int, int]) -> int:
+    while True:
+        node += dx
+        if cells[node]:
+            return -1
+        if node == goal:
+            return node
+        if _jump_vertical(cells, node, -1, goal, horizontal) >= 0 or _jump_vertical(cells, node, 1, goal, horizontal) >= 0:
+            return node
+
+
+def _distance(a: int, b: int, stride: int) -> int:
+    ax, ay = divmod(a, stride)
+    bx, by = divmod(b, stride)
+    return abs(ax - bx) + abs(ay - by)
+
+
+def _expand(parents: array, start: int, goal: int, stride: int) -> List[int]:
+    """Fill in the straight runs between consecutive jump points."""
+    path: List[int] = [goal]
+    node = goal
+    while node != start:
+        parent = parents[node]
+        delta = parent - node
+        step = (stride if delta > 0 else -stride) if delta % stride == 0 else (1 if delta > 0 else -1)
+        while node != parent:
+            node += step
+            path.append(node)
+    path.reverse()
+    return path
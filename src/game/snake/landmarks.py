@@ -0,0 +1,85 @@
+"""ALT (A*, landmarks, triangle inequality) lower bounds for SnakeAI.a_star.
+
+A handful of landmark cells each get a full BFS distance table. For any cell n
+and goal t, ``|d(L, t) - d(L, n)|`` is a lower bound on the number of moves
+from n to t, and turn penalties only ever add cost on top of moves, so the
+bound stays admissible under the turn-penalty model. Around walls it is far
+tighter than the Manhattan distance, which A* keeps as a floor.
+
+Landmarks are picked by farthest-point selection, which puts them on the
+outskirts of the grid where the triangle inequality is tightest. A table
+describes one grid layout, identified by its ``grid_fingerprint``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, List, Tuple
+
+from src.utils.grid import FlatGrid
+from .cache import grid_fingerprint
+from .field import distance_field
+
+
+INF = float("inf")
+
+
+class LandmarkTable:
+    __slots__ = ("fingerprint", "requested", "landmarks", "distances")
+
+    def __init__(self, fingerprint: bytes, requested: int, landmarks: List[int], distances: List[array]) -> None:
+        self.fingerprint = fingerprint
+        # grids with few free cells can yield fewer landmarks than requested
+        self.requested = requested
+        self.landmarks = landmarks
+        # distances[i][cell]: moves from landmarks[i] to cell, -1 if unreachable
+        self.distances = distances
+
+    @classmethod
+    def build(cls, grid: FlatGrid, count: int) -> LandmarkTable:
+        landmarks: List[int] = []
+        distances: List[array] = []
+        seed = grid.cells.find(0)
+        if seed >= 0 and count > 0:
+            # the first landmark is the cell farthest from an arbitrary free cell
+            nearest = distance_field(seed, grid).distances
+            for _ in range(count):
+                farthest = max(nearest)
+                if farthest <= 0:
+                    break
+                landmark = nearest.index(farthest)
+                table = array("i", distance_field(landmark, grid).distances)
+                landmarks.append(landmark)
+                distances.append(table)
+                # distance to the closest landmark so far; -1 keeps cells of other components out
+                nearest = array("l", map(min, nearest, table)) if len(landmarks) > 1 else array("l", table)
+        return cls(grid_fingerprint(grid), count, landmarks, distances)
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    def nbytes(self) -> int:
+        return sum(len(table) * table.itemsize for table in self.distances)
+
+    def estimator(self, goal: int, stride: int) -> Callable[[int], float]:
+        """Heuristic towards ``goal``: the larger of Manhattan and the landmark bound.
+
+        Cells that a landmark reaches while the goal is not (or vice versa) lie
+        in another component, and get an infinite estimate.
+        """
+        goal_x, goal_y = divmod(goal, stride)
+        pairs: List[Tuple[array, int]] = [(table, table[goal]) for table in self.distances]
+
+        def estimate(cell: int) -> float:
+            x, y = divmod(cell, stride)
+            best = abs(x - goal_x) + abs(y - goal_y)
+            for table, target in pairs:
+                distance = table[cell]
+                if (distance < 0) != (target < 0):
+                    return INF
+                bound = distance - target if distance > target else target - distance
+                if bound > best:
+                    best = bound
+            return best
+
+        return estimate
@@ -0,0 +1,409 @@
+"""Snake rules without a display.
+
+SnakeSimulation owns everything SnakeGame used to decide per frame: the
+obstacles, the snake and the food, the running search and the frame counter
+that paces it. ``tick()`` advances one frame and never sleeps, so headless
+runs go as fast as the searches allow; SnakeGame only adds input, pacing and
+drawing on top.
+
+With ``animate=False`` searches run to completion through the lean loops
+(trace "none") as soon as they start, and the snake moves every tick.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import AbstractSet, Dict, List, Optional, Set, Tuple
+
+from src.settings import GRID_SIZE
+from src.utils.executor import CancelToken, SearchExecutor, SearchJob
+from src.utils.freecells import FreeCells
+from src.utils.grid import FlatGrid
+from .ai import SnakeAI
+from .trace import SearchStepper, Steps
+
+
+Coord = Tuple[int, int]
+
+# display name -> SnakeAI algorithm key
+ALGORITHMS: Dict[str, str] = {
+    "DFS": "dfs",
+    "BFS": "bfs",
+    "UCS": "ucs",
+    "A*": "a_star",
+    "Bi-BFS": "bi_bfs",
+    "Bi-A*": "bi_a_star",
+    "JPS": "jps",
+    "Heading-A*": "a_star_heading",
+    # keeps its tables in the SnakeAI, so re-running it only repairs what changed
+    "D* Lite": "d_star_lite",
+}
+
+# random draws from the free-cell index before food spawning falls back to a full pass
+SPAWN_DRAWS = 32
+
+
+def _finished(path: List[int]) -> Steps:
+    # step engine for searches that already ran: returns the path without expanding anything
+    yield from ()
+    return path
+
+
+# overlay layer of a cell, in drawing priority; cells on no layer are NONE
+NONE, VISITED, FRONTIER, PATH = 0, 1, 2, 3
+
+
+class AlgorithmState:
+    """A running search plus what the visualizer shows of it, kept up to date incrementally.
+
+    Every expansion and every move along the path updates the visited set,
+    the frontier counts and the remaining path for the handful of cells it
+    touches, and records those cells as changed. ``take_changes()`` hands the
+    changed cells to the renderer, so a frame costs what changed rather than
+    the size of the overlay. The frontier is hidden once the search is done;
+    the remaining path is shown once it succeeded.
+    """
+
+    def __init__(self, search: SearchStepper) -> None:
+        self.search = search
+        self.path_step = 0
+        self._visited: Set[Coord] = set(search.visited_order)
+        # counted like the stepper counts them, so a cell queued twice stays until both entries go
+        self._frontier: Dict[Coord, int] = search.frontier_counts()
+        self._path: Set[Coord] = set()
+        self._changed: Set[Coord] = self._visited | self._frontier.keys()
+        self._finished = False
+        if search.done:
+            self._finish()
+
+    @property
+    def path(self) -> List[Coord]:
+        return self.search.path
+
+    def advance_visited(self) -> None:
+        step = self.search.step()
+        if step is not None:
+            decode = self.search.decode
+            frontier = self._frontier
+            changed = self._changed
+            for cell in map(decode, step.stale + (step.node,)):
+                remaining = frontier[cell] - 1
+                if remaining:
+                    frontier[cell] = remaining
+                else:
+                    del frontier[cell]
+                changed.add(cell)
+            for cell in map(decode, step.pushed):
+                frontier[cell] = frontier.get(cell, 0) + 1
+                changed.add(cell)
+            self._visited.add(decode(step.node))
+        if self.search.done and not self._finished:
+            self._finish()
+
+    def visited_complete(self) -> bool:
+        return self.search.done
+
+    def advance_path(self) -> None:
+        if self.path_step < max(0, len(self.path) - 1):
+            left = self.path[self.path_step]
+            self.path_step += 1
+            self._path.discard(left)
+            self._changed.add(left)
+
+    def next_path_coord(self) -> Optional[Coord]:
+        if not self.path:
+            return None
+        next_index = self.path_step + 1
+        if next_index < len(self.path):
+            return self.path[next_index]
+        return None
+
+    def layer(self, cell: Coord) -> int:
+        if cell in self._path:
+            return PATH
+        if cell in self._frontier:
+            return FRONTIER
+        if cell in self._visited:
+            return VISITED
+        return NONE
+
+    def take_changes(self) -> Set[Coord]:
+        """Cells whose layer may have changed since the last call."""
+        changed, self._changed = self._changed, set()
+        return changed
+
+    # live views, updated in place as the search and the snake advance
+    def visited_cells(self) -> AbstractSet[Coord]:
+        return self._visited
+
+    def frontier_cells(self) -> AbstractSet[Coord]:
+        return self._frontier.keys()
+
+    def path_cells(self) -> AbstractSet[Coord]:
+        return self._path
+
+    def path_remaining(self) -> List[Coord]:
+        if not self.path:
+            return []
+        start_index = min(self.path_step, len(self.path) - 1)
+        return self.path[start_index:]
+
+    def close(self) -> None:
+        self.search.close()
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._changed.update(self._frontier)
+        self._frontier.clear()
+        if self.search.succeeded:
+            self._path = set(self.path_remaining())
+            self._changed.update(self._path)
+
+
+class SnakeSimulation:
+    def __init__(
+        self,
+        grid_size: int = GRID_SIZE,
+        turn_penalty: float = 0.8,
+        algorithm: str = "A*",
+        animate: bool = True,
+        seed: int | None = None,
+        executor: SearchExecutor | None = None,
+    ) -> None:
+        """Create a simulation and start the first search.
+
+        animate: step searches one expansion per ``visit_interval`` frames, as the game
+            shows them; False finishes every search at once and moves on every tick.
+        seed: seeds the food spawns, so runs can be replayed.
+        executor: run unanimated searches on this background worker; the snake waits, and
+            ``pending`` is set, until the path arrives. Animated searches are already
+            stepped a little per frame, so they never use it.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+        self.grid_size = grid_size
+        self.turn_penalty = turn_penalty
+        self.animate = animate
+        self.rng = random.Random(seed)
+        # animated searches are drawn frontier and all, headless ones only need the path; the
+        # component index fails searches for sealed-off food at once and steers food spawns
+        self.ai = SnakeAI(grid_size, turn_penalty=turn_penalty, trace="full" if animate else "none", components=True)
+        self.executor = executor
+        self.pending: Optional[SearchJob[List[int]]] = None
+        # background searches get their own SnakeAI and grid copy, so nothing is shared across threads
+        self._worker_ai: Optional[SnakeAI] = None
+
+        self.current_algorithm = algorithm
+        self.status_message: str = ""
+        self.frame_count = 0
+        self.visit_interval = 2 if animate else 1
+        self.move_interval = 3 if animate else 1
+        # totals since construction, kept across resets
+        self.ticks = 0
+        self.moves = 0
+        self.food_eaten = 0
+
+        self.obstacles: Set[Coord] = set()
+        self._grid = FlatGrid(grid_size, grid_size)
+        self._grid_obstacles: Set[Coord] = set()
+        self.free_cells = FreeCells.from_grid(self._grid)
+        self.snake_pos: Coord = (self.grid_size // 2, self.grid_size // 2)
+        self.food_pos: Coord = self._random_empty_cell()
+        self.state: Optional[AlgorithmState] = None
+        self._search()
+
+    # Public API
+    @property
+    def stuck(self) -> bool:
+        """The last search finished without a path; nothing changes until a reset."""
+        return self.state is not None and self.state.visited_complete() and not self.state.search.succeeded
+
+    def tick(self) -> None:
+        self.ticks += 1
+        self.frame_count += 1
+        self._update()
+
+    def run(self, ticks: int) -> int:
+        """Advance up to ``ticks`` frames, stopping early when stuck; returns the frames run."""
+        for done in range(ticks):
+            if self.stuck:
+                return done
+            self.tick()
+        return ticks
+
+    def reset(self) -> None:
+        self.obstacles.clear()
+        self.snake_pos = (self.grid_size // 2, self.grid_size // 2)
+        self.food_pos = self._random_empty_cell()
+        self.state = None
+        self.status_message = ""
+        self.frame_count = 0
+        self._search()
+
+    def select_algorithm(self, name: str) -> None:
+        if name not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {name!r}, expected one of {sorted(ALGORITHMS)}")
+        self.current_algorithm = name
+        self._search()
+
+    def set_animate(self, animate: bool) -> None:
+        self.animate = animate
+        self.ai.trace = "full" if animate else "none"
+        self.visit_interval = 2 if animate else 1
+        self.move_interval = 3 if animate else 1
+        self._search()
+
+    def set_turn_penalty(self, penalty: float) -> None:
+        self.turn_penalty = max(0.0, round(penalty, 2))
+        self.ai.turn_penalty = float(self.turn_penalty)
+        self._search()
+
+    def path_cost(self) -> float:
+        """Cost of the current path: 1 per move plus turn_penalty per change of direction."""
+        if not self.state or not self.state.path:
+            return 0.0
+        path = self.state.path
+        total = float(len(path) - 1)
+        for p, c, n in zip(path, path[1:], path[2:]):
+            if (c[0] - p[0], c[1] - p[1]) != (n[0] - c[0], n[1] - c[1]):
+                total += self.turn_penalty
+        return total
+
+    # Game state
+    def _update(self) -> None:
+        if self.pending is not None:
+            if not self.pending.done():
+                return
+            self._collect()
+        if not self.state:
+            return
+
+        if not self.state.visited_complete():
+            if self.frame_count % self.visit_interval == 0:
+                self.state.advance_visited()
+                if self.state.visited_complete():
+                    self._report_result()
+            return
+
+        if not self.state.search.succeeded:
+            return
+
+        if self.frame_count % self.move_interval == 0:
+            next_coord = self.state.next_path_coord()
+            if next_coord is None:
+                return
+            self.snake_pos = next_coord
+            self.moves += 1
+            self.state.advance_path()
+            if self.snake_pos == self.food_pos:
+                self._handle_food_reached()
+
+    def _handle_food_reached(self) -> None:
+        self.food_eaten += 1
+        self.food_pos = self._random_empty_cell()
+        self.state = None
+        self.frame_count = 0
+        self._search()
+
+    def _search(self) -> None:
+        # the search is stepped lazily from _update; drop any one still in progress
+        if self.state:
+            self.state.close()
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        algorithm = ALGORITHMS[self.current_algorithm]
+        grid = self._build_grid()
+        if self.animate:
+            search = self.ai.stepper(algorithm, self.snake_pos, self.food_pos, grid)
+        elif self.executor is not None:
+            self.state = None
+            self.frame_count = 0
+            self.status_message = f"{self.current_algorithm} searching..."
+            self._submit(algorithm, grid)
+            return
+        else:
+            result = self.ai.search(algorithm, grid.index(*self.snake_pos), grid.index(*self.food_pos), grid)
+            search = SearchStepper(_finished(result.path), (), grid.coord)
+            search.run()
+        self.state = AlgorithmState(search=search)
+        self.frame_count = 0
+        if search.done:
+            self._report_result()
+        else:
+            self.status_message = f"{self.current_algorithm} searching..."
+
+    def _submit(self, algorithm: str, grid: FlatGrid) -> None:
+        if self._worker_ai is None:
+            self._worker_ai = SnakeAI(self.grid_size, trace="none", components=True)
+        worker = self._worker_ai
+        penalty = self.turn_penalty
+        start, goal = grid.index(*self.snake_pos), grid.index(*self.food_pos)
+        snapshot = grid.copy()
+
+        def search(token: CancelToken) -> List[int]:
+            worker.turn_penalty = penalty
+            steps = worker.iter_search(algorithm, start, goal, snapshot)
+            try:
+                while True:
+                    token.check()
+                    next(steps)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                steps.close()
+
+        self.pending = self.executor.submit(search)
+
+    def _collect(self) -> None:
+        path = self.pending.result()
+        self.pending = None
+        search = SearchStepper(_finished(path), (), self._grid.coord)
+        search.run()
+        self.state = AlgorithmState(search=search)
+        self._report_result()
+
+    def _report_result(self) -> None:
+        if not self.state.search.succeeded:
+            self.status_message = "No path found. Press R to reset."
+        else:
+            length = max(0, len(self.state.path) - 1)
+            self.status_message = f"{self.current_algorithm} path length: {length}"
+
+    # Grid helpers
+    def _build_grid(self) -> FlatGrid:
+        # one grid and free-cell index per game, patched in place when the obstacles change
+        if self.obstacles != self._grid_obstacles:
+            grid, free = self._grid, self.free_cells
+            for cell in self.obstacles ^ self._grid_obstacles:
+                blocked = cell in self.obstacles
+                grid.set_blocked(*cell, blocked)
+                if blocked:
+                    free.discard(cell)
+                else:
+                    free.add(cell)
+            self._grid_obstacles = set(self.obstacles)
+        return self._grid
+
+    def _random_empty_cell(self) -> Coord:
+        grid = self._build_grid()
+        free = self.free_cells
+        snake_pos = getattr(self, "snake_pos", None)
+        components = self.ai.component_index(grid)
+        # food never spawns where the snake cannot reach it
+        home = components.label(grid.index(*snake_pos)) if snake_pos is not None else -1
+
+        def reachable(cell: Coord) -> bool:
+            return home < 0 or components.label(grid.index(*cell)) == home
+
+        # rejection sampling from the index: uniform over the accepted cells, O(1) per draw
+        for _ in range(min(SPAWN_DRAWS, len(free))):
+            cell = free.sample(self.rng)
+            if cell != snake_pos and reachable(cell):
+                return cell
+        # few free or reachable cells left: settle it with one pass over the index
+        candidates = [cell for cell in free if cell != snake_pos]
+        candidates = [cell for cell in candidates if reachable(cell)] or candidates
+        if candidates:
+            return self.rng.choice(candidates)
+        return (self.grid_size // 2, self.grid_size // 2)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Set, Tuple, Union
+
+
+Coord = Tuple[int, int]
+# tuple searches report coordinates, flat-grid searches report FlatGrid indices
+Node = Union[Coord, int]
+# step engines yield one SearchStep per expansion and return the path as FlatGrid indices
+Steps = Generator["SearchStep", None, List[int]]
+
+
+class FrontierLog:
+    """Frontier trace stored as push/pop deltas instead of a set per step.
+
+    Step 0 is the initial frontier; every later step holds the cells pushed and
+    popped by one expansion. Cells are stored as FlatGrid indices and the
+    frontier for a step is rebuilt on demand by replaying the deltas, mapped
+    through ``decode`` when one is set.
+    """
+
+    def __init__(self, decode: Optional[Callable[[int], Node]] = None) -> None:
+        self.decode = decode
+        self._pushes = array("i")
+        self._pops = array("i")
+        self._push_ends = array("l")
+        self._pop_ends = array("l")
+        # replay cursor so that walking the steps forward stays incremental
+        self._cursor = -1
+        self._counts: Dict[int, int] = {}
+
+    def push(self, node: int) -> None:
+        self._pushes.append(node)
+
+    def pop(self, node: int) -> None:
+        self._pops.append(node)
+
+    def end_step(self) -> None:
+        self._push_ends.append(len(self._pushes))
+        self._pop_ends.append(len(self._pops))
+
+    def __len__(self) -> int:
+        return len(self._push_ends)
+
+    def __getitem__(self, step: int) -> Set[Node]:
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("frontier step out of range")
+        return self.at(step)
+
+    def at(self, step: int) -> Set[Node]:
+        if step < self._cursor:
+            self._cursor = -1
+            self._counts = {}
+        counts = self._counts
+        while self._cursor < step:
+            self._cursor += 1
+            push_start = self._push_ends[self._cursor - 1] if self._cursor else 0
+            pop_start = self._pop_ends[self._cursor - 1] if self._cursor else 0
+            for cell in self._pushes[push_start : self._push_ends[self._cursor]]:
+                counts[cell] = counts.get(cell, 0) + 1
+            for cell in self._pops[pop_start : self._pop_ends[self._cursor]]:
+                remaining = counts[cell] - 1
+                if remaining:
+                    counts[cell] = remaining
+                else:
+                    del counts[cell]
+        if self.decode is None:
+            return set(counts)
+        decode = self.decode
+        return {decode(cell) for cell in counts}
+
+    def copy(self) -> FrontierLog:
+        log = FrontierLog(self.decode)
+        log._pushes = array("i", self._pushes)
+        log._pops = array("i", self._pops)
+        log._push_ends = array("l", self._push_ends)
+        log._pop_ends = array("l", self._pop_ends)
+        return log
+
+    def nbytes(self) -> int:
+        arrays = (self._pushes, self._pops, self._push_ends, self._pop_ends)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+
+@dataclass
+class SearchResult:
+    path: List[Node]
+    visited_order: List[Node]
+    frontier_history: FrontierLog
+
+    def __iter__(self) -> Iterator:
+        yield self.path
+        yield list(self.visited_order)
+        if len(self.frontier_history):
+            yield self.frontier_history[-1]
+        else:
+            yield set()
+
+    @property
+    def succeeded(self) -> bool:
+        return bool(self.path)
+
+    def copy(self) -> SearchResult:
+        return SearchResult(list(self.path), list(self.visited_order), self.frontier_history.copy())
+
+    def frontier_at(self, step: int) -> Set[Node]:
+        if not len(self.frontier_history):
+            return set()
+        index = min(step, len(self.frontier_history) - 1)
+        return self.frontier_history.at(index)
+
+
+@dataclass
+class SearchStep:
+    """One expansion: the expanded cell plus the frontier delta it caused.
+
+    The frontier loses ``node`` and every ``stale`` entry (duplicates popped
+    before ``node`` whose cell was already expanded) and gains ``pushed``.
+    """
+
+    node: int
+    pushed: Tuple[int, ...]
+    stale: Tuple[int, ...] = ()
+    # set on the expansion that ends the search (the goal, for one-sided searches)
+    last: bool = False
+
+
+class SearchStepper:
+    """Resumable search that advances one expansion per ``step()`` call.
+
+    Only the live frontier and the expansion order are kept, so memory stays
+    bounded by what is on screen rather than by the whole trace. ``close()``
+    abandons the search.
+    """
+
+    def __init__(self, steps: Steps, seeds: Tuple[int, ...], decode: Callable[[int], Node]) -> None:
+        self._steps = steps
+        self.decode = decode
+        self._frontier: Dict[int, int] = {}
+        for seed in seeds:
+            self._frontier[seed] = self._frontier.get(seed, 0) + 1
+        self.visited_order: List[Node] = []
+        self.path: List[Node] = []
+        self.done = False
+
+    @property
+    def succeeded(self) -> bool:
+        return bool(self.path)
+
+    def step(self) -> Optional[SearchStep]:
+        if self.done:
+            return None
+        try:
+            step = next(self._steps)
+        except StopIteration as stop:
+            self._finish(stop.value)
+            return None
+        frontier = self._frontier
+        for cell in step.stale:
+            self._discard(cell)
+        self._discard(step.node)
+        for cell in step.pushed:
+            frontier[cell] = frontier.get(cell, 0) + 1
+        self.visited_order.append(self.decode(step.node))
+        if step.last:
+            # the engine returns right after its last step; collect the path now
+            self.step()
+        return step
+
+    def run(self) -> List[Node]:
+        while not self.done:
+            self.step()
+        return self.path
+
+    def frontier(self) -> Set[Node]:
+        decode = self.decode
+        return {decode(cell) for cell in self._frontier}
+
+    def frontier_counts(self) -> Dict[Node, int]:
+        """Queued entries per frontier cell; engines with lazy deletion may queue a cell twice."""
+        decode = self.decode
+        return {decode(cell): count for cell, count in self._frontier.items()}
+
+    def close(self) -> None:
+        self._steps.close()
+        self._frontier.clear()
+        self.done = True
+
+    def _discard(self, cell: int) -> None:
+        remaining = self._frontier[cell] - 1
+        if remaining:
+            self._frontier[cell] = remaining
+        else:
+            del self._frontier[cell]
+
+    def _finish(self, path: List[int]) -> None:
+        decode = self.decode
+        self.path = [decode(node) for node in path]
+        self._frontier.clear()
+        self.done = True
@@ -0,0 +1,102 @@
+"""Vectorized BFS: a whole layer of the frontier is expanded per NumPy call.
+
+The obstacle mask is built from ``FlatGrid.cells`` in one call; thanks to its
+blocked border, the neighbours of a layer are just the layer plus each of the four
+offsets, with no bounds checks. Candidates are generated cell by cell in
+offset order, which is exactly the order a FIFO queue would discover them,
+and the first occurrence of each new cell wins. Layers, parents and therefore
+paths and expansion order are identical to ``SnakeAI.bfs``; only the Python
+loop over single cells is gone.
+
+Each layer costs a handful of array operations, so the speedup grows with the
+layer width: open grids gain the most, long one-cell corridors the least.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from src.utils.grid import FlatGrid
+from .trace import SearchStep, Steps
+
+
+class _Wavefront:
+    __slots__ = ("offsets", "seen", "parents", "first", "goal")
+
+    def __init__(self, start: int, goal: int, grid: FlatGrid) -> None:
+        self.offsets = np.array(grid.offsets, dtype=np.int64)
+        # blocked and already discovered cells are both "seen"
+        self.seen = np.frombuffer(grid.cells, dtype=np.uint8).astype(bool)
+        self.seen[start] = True
+        self.parents = np.full(len(grid.cells), -1, dtype=np.int64)
+        self.parents[start] = start
+        # scratch table for picking the first discovery of every cell
+        self.first = np.empty(len(grid.cells), dtype=np.int64)
+        self.goal = goal
+
+    def expand(self, layer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Next layer in FIFO order, and the position in ``layer`` of each new cell's parent."""
+        candidates = (layer[:, None] + self.offsets).ravel()
+        positions = np.flatnonzero(~self.seen[candidates])
+        candidates = candidates[positions]
+        # fancy assignment keeps the last write, so write in reverse to keep the first
+        self.first[candidates[::-1]] = positions[::-1]
+        keep = self.first[candidates] == positions
+        found = candidates[keep]
+        sources = positions[keep] // len(self.offsets)
+        self.seen[found] = True
+        self.parents[found] = layer[sources]
+        return found, sources
+
+    def path(self, start: int) -> List[int]:
+        parents = self.parents
+        node = self.goal
+        path = [node]
+        while node != start:
+            node = int(parents[node])
+            path.append(node)
+        path.reverse()
+        return path
+
+
+def wavefront_bfs(start: int, goal: int, grid: FlatGrid) -> Steps:
+    """Step engine reporting the same SearchSteps as ``SnakeAI.bfs``."""
+    wave = _Wavefront(start, goal, grid)
+    layer = np.array([start], dtype=np.int64)
+    while layer.size:
+        # the children of layer[i] are contiguous in the next layer, in discovery order
+        found, sources = wave.expand(layer)
+        ends = np.cumsum(np.bincount(sources, minlength=layer.size)).tolist()
+        children = found.tolist()
+        begin = 0
+        for cell, end in zip(layer.tolist(), ends):
+            if cell == goal:
+                yield SearchStep(cell, (), last=True)
+                return wave.path(start)
+            yield SearchStep(cell, tuple(children[begin:end]))
+            begin = end
+        layer = found
+    return []
+
+
+def wavefront_search(start: int, goal: int, grid: FlatGrid, trace: bool = False) -> Tuple[List[int], List[np.ndarray]]:
+    """Path from ``start`` to ``goal`` plus, when ``trace`` is set, the expanded layers.
+
+    Layers are returned in expansion order, the goal's layer cut right after
+    the goal, so concatenating them gives ``bfs``'s visited order.
+    """
+    wave = _Wavefront(start, goal, grid)
+    layer = np.array([start], dtype=np.int64)
+    layers: List[np.ndarray] = []
+    while layer.size:
+        if wave.parents[goal] >= 0:
+            # the goal was discovered by the previous layer, so it is in this one
+            if trace:
+                layers.append(layer[: int(np.flatnonzero(layer == goal)[0]) + 1])
+            return wave.path(start), layers
+        if trace:
+            layers.append(layer)
+        layer, _ = wave.expand(layer)
+    return [], layers
@@ -1,4 +1,12 @@
-from .game import TicTacToeGame
 from .ai import TicTacToeAI, MinimaxResult
 
-__all__ = ["TicTacToeGame", "TicTacToeAI", "MinimaxResult"]
\ No newline at end of file
+__all__ = ["TicTacToeGame", "TicTacToeAI", "MinimaxResult"]
+
+
+def __getattr__(name):
+    # the game needs pygame; importing it lazily keeps TicTacToeAI headless
+    if name == "TicTacToeGame":
+        from .game import TicTacToeGame
+
+        return TicTacToeGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
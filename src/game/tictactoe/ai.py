@@ -3,26 +3,85 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+from src.utils.executor import CancelToken
+from src.utils.stats import SearchStats
+
 
 Board = List[List[str]]
 Coord = Tuple[int, int]
 
 
+class _OutOfTime(Exception):
+    """Raised inside a depth-limited pass once the token's deadline has passed."""
+
+
 @dataclass
 class MinimaxResult:
     score: int
     move: Optional[Coord]
     nodes_explored: int
+    stats: Optional[SearchStats] = None
 
 
 class TicTacToeAI:
-    def __init__(self) -> None:
+    def __init__(self, stats: Optional[SearchStats] = None) -> None:
+        """stats: when set, best_move refills it and returns it with the result.
+
+        For minimax, an expansion is a visited position, a push is a move tried,
+        a stale pop is a move skipped by an alpha-beta cutoff, a relaxation is an
+        improvement of a node's best score and the peak frontier is the deepest
+        recursion. on_expand receives the (live) board, on_push the move.
+        """
         self._nodes = 0
-
-    def best_move(self, board: Board) -> MinimaxResult:
+        self.stats = stats
+        self._cancel: Optional[CancelToken] = None
+        # ply at which the current pass scores positions as draws; None searches to the end
+        self._limit: Optional[int] = None
+        self._cut = False
+        # the previous pass's answer, tried first by the next one
+        self._first: Optional[Coord] = None
+
+    def best_move(self, board: Board, cancel: Optional[CancelToken] = None) -> MinimaxResult:
+        """Minimax with alpha-beta for "O" on a square board of any size.
+
+        cancel: checked at every position; once cancelled the search raises
+        SearchCancelled, with ``board`` restored. When it carries a deadline the
+        search deepens one ply per pass instead, scoring positions past the
+        limit as draws, and answers from the deepest pass finished in time.
+        """
         self._nodes = 0
-        result = self._minimax(board, depth=0, maximizing=True, alpha=-float("inf"), beta=float("inf"))
-        return MinimaxResult(score=result.score, move=result.move, nodes_explored=self._nodes)
+        self._cancel = cancel
+        stats = self.stats
+        if stats is None:
+            result = self._search(board)
+            return MinimaxResult(score=result.score, move=result.move, nodes_explored=self._nodes)
+        stats.reset()
+        with stats.measure():
+            result = self._search(board)
+        stats.expansions = self._nodes
+        stats.pushes = self._nodes - 1
+        return MinimaxResult(score=result.score, move=result.move, nodes_explored=self._nodes, stats=stats)
+
+    def _search(self, board: Board) -> MinimaxResult:
+        self._limit = None
+        self._first = None
+        if self._cancel is None or self._cancel.deadline is None:
+            return self._minimax(board, depth=0, maximizing=True, alpha=-float("inf"), beta=float("inf"))
+        result: Optional[MinimaxResult] = None
+        # iterative deepening; the one-ply pass always finishes, so there is a move to play
+        for limit in range(1, max(1, len(self.get_available_moves(board))) + 1):
+            self._limit = limit
+            self._cut = False
+            try:
+                result = self._minimax(board, depth=0, maximizing=True, alpha=-float("inf"), beta=float("inf"))
+            except _OutOfTime:
+                break
+            # nothing was cut off, or a win is forced either way: deeper passes agree
+            if not self._cut or result.score:
+                break
+            self._first = result.move
+        self._limit = None
+        return result
 
     # Core minimax
     def _minimax(
@@ -34,46 +93,82 @@ class TicTacToeAI:
         beta: float,
     ) -> MinimaxResult:
         self._nodes += 1
+        if self._cancel is not None:
+            self._cancel.check()
+            if self._limit is not None and self._limit > 1 and self._cancel.expired:
+                raise _OutOfTime
+        stats = self.stats
+        if stats is not None:
+            self._observe(stats, board, depth)
         winner = self.get_winner(board)
         if winner is not None:
             score = self._score(winner, depth)
             return MinimaxResult(score=score, move=None, nodes_explored=self._nodes)
         if self.is_board_full(board):
             return MinimaxResult(score=0, move=None, nodes_explored=self._nodes)
+        if self._limit is not None and depth >= self._limit:
+            self._cut = True
+            return MinimaxResult(score=0, move=None, nodes_explored=self._nodes)
 
         moves = self.get_available_moves(board)
+        if depth == 0 and self._first in moves:
+            moves.remove(self._first)
+            moves.insert(0, self._first)
         best_move: Optional[Coord] = None
 
         if maximizing:
             best_score = -float("inf")
-            for move in moves:
+            for index, move in enumerate(moves):
                 row, col = move
                 board[row][col] = "O"
-                result = self._minimax(board, depth + 1, False, alpha, beta)
-                board[row][col] = ""
+                if stats is not None and stats.on_push is not None:
+                    stats.on_push(move)
+                try:
+                    result = self._minimax(board, depth + 1, False, alpha, beta)
+                finally:
+                    board[row][col] = ""
                 if result.score > best_score:
                     best_score = result.score
                     best_move = move
+                    if stats is not None:
+                        stats.relaxations += 1
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.stale_pops += len(moves) - index - 1
                     break
             return MinimaxResult(score=int(best_score), move=best_move, nodes_explored=self._nodes)
 
         best_score = float("inf")
-        for move in moves:
+        for index, move in enumerate(moves):
             row, col = move
             board[row][col] = "X"
-            result = self._minimax(board, depth + 1, True, alpha, beta)
-            board[row][col] = ""
+            if stats is not None and stats.on_push is not None:
+                stats.on_push(move)
+            try:
+                result = self._minimax(board, depth + 1, True, alpha, beta)
+            finally:
+                board[row][col] = ""
             if result.score < best_score:
                 best_score = result.score
                 best_move = move
+                if stats is not None:
+                    stats.relaxations += 1
             beta = min(beta, best_score)
             if beta <= alpha:
+                if stats is not None:
+                    stats.stale_pops += len(moves) - index - 1
                 break
         return MinimaxResult(score=int(best_score), move=best_move, nodes_explored=self._nodes)
 
     # Helpers
+    def _observe(self, stats: SearchStats, board: Board, depth: int) -> None:
+        # the recursion stack holds one position per level
+        if depth + 1 > stats.peak_frontier:
+            stats.peak_frontier = depth + 1
+        if stats.on_expand is not None:
+            stats.on_expand(board)
+
     def _score(self, winner: Optional[str], depth: int) -> int:
         if winner == "O":
             return 1
@@ -88,15 +183,17 @@ class TicTacToeAI:
         return None
 
     def check_winner(self, board: Board, player: str) -> bool:
+        # a full row, column or diagonal wins, whatever the board size
+        size = len(board)
         for row in board:
             if all(cell == player for cell in row):
                 return True
-        for col in range(3):
-            if all(board[row][col] == player for row in range(3)):
+        for col in range(size):
+            if all(board[row][col] == player for row in range(size)):
                 return True
-        if all(board[i][i] == player for i in range(3)):
+        if all(board[i][i] == player for i in range(size)):
             return True
-        if all(board[i][2 - i] == player for i in range(3)):
+        if all(board[i][size - 1 - i] == player for i in range(size)):
             return True
         return False
 
@@ -104,4 +201,5 @@ class TicTacToeAI:
         return all(cell != "" for row in board for cell in row)
 
     def get_available_moves(self, board: Board) -> List[Coord]:
-        return [(row, col) for row in range(3) for col in range(3) if board[row][col] == ""]
\ No newline at end of file
+        size = len(board)
+        return [(row, col) for row in range(size) for col in range(size) if board[row][col] == ""]
\ No newline at end of file
@@ -13,9 +13,12 @@ from src.settings import (
     COLOR_SNAKE,
     COLOR_WHITE,
     FPS,
+    SPINNER,
+    TIC_TAC_TOE_TIME_LIMIT,
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
+from src.utils.executor import SearchExecutor, SearchJob
 from .ai import MinimaxResult, TicTacToeAI
 
 
@@ -38,15 +41,20 @@ class Scoreboard:
 class TicTacToeGame:
     GRID_SIZE = 3
 
-    def __init__(self, screen: Optional[pygame.Surface] = None) -> None:
+    def __init__(self, screen: Optional[pygame.Surface] = None, grid_size: int = GRID_SIZE) -> None:
         self.screen = screen or pygame.display.get_surface() or pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.clock = pygame.time.Clock()
         self.font_large = pygame.font.Font(None, 72)
         self.font_medium = pygame.font.Font(None, 40)
         self.font_small = pygame.font.Font(None, 24)
 
+        self.grid_size = grid_size
         self.ai_engine = TicTacToeAI()
-        self.board: Board = [["" for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
+        # minimax runs on a worker thread so larger boards never freeze input or drawing
+        self.executor = SearchExecutor()
+        self._pending: Optional[SearchJob[MinimaxResult]] = None
+        self.frame_count = 0
+        self.board: Board = [["" for _ in range(self.grid_size)] for _ in range(self.grid_size)]
         self.scoreboard = Scoreboard()
         self.last_ai_move: Optional[Coord] = None
         self.minimax_nodes = 0
@@ -54,7 +62,7 @@ class TicTacToeGame:
         self.game_over = False
         self.winner: Optional[str] = None
         self.turn = "X"  # Player always starts
-        self.cell_size = WINDOW_HEIGHT // self.GRID_SIZE
+        self.cell_size = WINDOW_HEIGHT // self.grid_size
 
     # Public API
     def run(self) -> None:
@@ -63,6 +71,8 @@ class TicTacToeGame:
             self.clock.tick(FPS)
             for event in pygame.event.get():
                 if event.type == QUIT:
+                    # a search still running would otherwise hold up interpreter exit
+                    self.executor.shutdown()
                     pygame.quit()
                     raise SystemExit
                 if event.type == KEYDOWN:
@@ -75,9 +85,11 @@ class TicTacToeGame:
                     self._handle_click(event.pos)
 
             if running:
+                self.frame_count += 1
                 self._maybe_ai_move()
                 self._draw()
                 pygame.display.flip()
+        self.executor.shutdown()
 
     # Game logic --------------------------------------------------------
     def _handle_click(self, position: Tuple[int, int]) -> None:
@@ -85,7 +97,7 @@ class TicTacToeGame:
             return
         col = position[0] // self.cell_size
         row = position[1] // self.cell_size
-        if 0 <= row < self.GRID_SIZE and 0 <= col < self.GRID_SIZE and self.board[row][col] == "":
+        if 0 <= row < self.grid_size and 0 <= col < self.grid_size and self.board[row][col] == "":
             self.board[row][col] = "X"
             if self._evaluate_state(row, col, "X"):
                 return
@@ -94,7 +106,17 @@ class TicTacToeGame:
     def _maybe_ai_move(self) -> None:
         if self.game_over or self.turn != "O":
             return
-        result: MinimaxResult = self.ai_engine.best_move(self.board)
+        if self._pending is None:
+            # the worker searches a copy, so the board on screen is never half-played
+            board = [row[:] for row in self.board]
+            self._pending = self.executor.submit(
+                lambda token: self.ai_engine.best_move(board, token), budget=TIC_TAC_TOE_TIME_LIMIT
+            )
+            return
+        if not self._pending.done():
+            return
+        result: MinimaxResult = self._pending.result()
+        self._pending = None
         self.minimax_nodes = result.nodes_explored
         move = result.move
         if move is None:
@@ -126,7 +148,9 @@ class TicTacToeGame:
         self.winner = None
 
     def _reset(self) -> None:
-        self.board = [["" for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
+        self.executor.cancel()
+        self._pending = None
+        self.board = [["" for _ in range(self.grid_size)] for _ in range(self.grid_size)]
         self.game_over = False
         self.winner = None
         self.turn = "X"
@@ -142,26 +166,26 @@ class TicTacToeGame:
         self._draw_game_over()
 
     def _draw_grid(self) -> None:
-        for i in range(1, self.GRID_SIZE):
+        for i in range(1, self.grid_size):
             pygame.draw.line(
                 self.screen,
                 COLOR_WHITE,
                 (i * self.cell_size, 0),
-                (i * self.cell_size, self.cell_size * self.GRID_SIZE),
+                (i * self.cell_size, self.cell_size * self.grid_size),
                 4,
             )
             pygame.draw.line(
                 self.screen,
                 COLOR_WHITE,
                 (0, i * self.cell_size),
-                (self.cell_size * self.GRID_SIZE, i * self.cell_size),
+                (self.cell_size * self.grid_size, i * self.cell_size),
                 4,
             )
 
     def _draw_marks(self) -> None:
         padding = self.cell_size // 6
-        for row in range(self.GRID_SIZE):
-            for col in range(self.GRID_SIZE):
+        for row in range(self.grid_size):
+            for col in range(self.grid_size):
                 value = self.board[row][col]
                 x = col * self.cell_size
                 y = row * self.cell_size
@@ -178,8 +202,14 @@ class TicTacToeGame:
             pygame.draw.rect(self.screen, COLOR_ALERT, highlight_rect, 4)
 
     def _draw_hud(self) -> None:
+        if self.turn == "X":
+            turn = "Player (X)"
+        elif self._pending is not None:
+            turn = "AI (O) thinking " + SPINNER[self.frame_count // 8 % len(SPINNER)]
+        else:
+            turn = "AI (O)"
         lines = [
-            f"Turn: {'Player (X)' if self.turn == 'X' else 'AI (O)'}",
+            f"Turn: {turn}",
             f"Score  Player: {self.scoreboard.player}  AI: {self.scoreboard.ai}",
             f"Nodes explored: {self.minimax_nodes}",
             "R - Restart    ESC - Menu",
@@ -7,6 +7,8 @@ WINDOW_HEIGHT = GRID_SIZE * CELL_SIZE
 # Timing
 FPS = 60
 SNAKE_FPS = 12
+# frames of the progress indicator shown while a background search runs
+SPINNER = "|/-\\"
 
 # Colors
 COLOR_BLACK = (12, 12, 12)
@@ -24,4 +26,6 @@ COLOR_TICTACTOE_X = (255, 0, 0)
 COLOR_TICTACTOE_O = (0, 0, 255)
 
 # Game settings
-TIC_TAC_TOE_AI_LEVEL = 2
\ No newline at end of file
+TIC_TAC_TOE_AI_LEVEL = 2
+# seconds the AI may think per move; boards past 3x3 are searched to the depth that fits
+TIC_TAC_TOE_TIME_LIMIT = 1.0
\ No newline at end of file
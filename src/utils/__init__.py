@@ -1,5 +1,10 @@
 """Utility helpers for grid creation and manipulation."""
 
+from .components import Components
+from .executor import CancelToken, SearchCancelled, SearchExecutor, SearchJob
+from .freecells import FreeCells
+from .grid import FlatGrid
+from .movingai import Scenario, load_map, load_scenarios
 from .pathfinding import (
 	create_grid,
 	is_valid_move,
@@ -7,11 +12,23 @@ from .pathfinding import (
 	remove_obstacle,
 	print_grid,
 )
+from .stats import SearchStats
 
 __all__ = [
+	"Components",
+	"FlatGrid",
+	"FreeCells",
 	"create_grid",
 	"is_valid_move",
 	"place_obstacle",
 	"remove_obstacle",
 	"print_grid",
+	"SearchStats",
+	"Scenario",
+	"load_map",
+	"load_scenarios",
+	"CancelToken",
+	"SearchCancelled",
+	"SearchExecutor",
+	"SearchJob",
 ]
\ No newline at end of file
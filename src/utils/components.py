@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from array import array
+from typing import List
+
+from .grid import FlatGrid
+
+
+class Components:
+    """Connected components of a FlatGrid's free cells, as a union-find over grid indices.
+
+    Freeing a cell only ever merges components, so it is a union with its free
+    neighbours. Blocking a cell can split its component, so it marks the index
+    for a rebuild on the next query, unless the cell had at most one free
+    neighbour and so could not disconnect anything. Cells blocked without a
+    rebuild stay in the union-find as links, so lookups through them still
+    work; ``connected`` checks the blocked state first. Freeing such a cell
+    again keeps its old link only if one of its free neighbours shares it.
+
+    The index keeps its own copy of the grid, like the D* Lite and HPA*
+    planners, and ``update`` picks up edits made to the caller's grid.
+    """
+
+    __slots__ = ("grid", "_parent", "_size", "_dirty", "rebuilds")
+
+    def __init__(self, grid: FlatGrid) -> None:
+        self.grid = grid.copy()
+        self._parent = array("i")
+        self._size = array("i")
+        self._dirty = True
+        # full labelings so far, the first one included
+        self.rebuilds = 0
+
+    def update(self, grid: FlatGrid) -> None:
+        """Apply every cell whose blocked state differs in ``grid`` (same size as the copy)."""
+        for cell in self.grid.diff(grid):
+            if grid.cells[cell]:
+                self.block(cell)
+            else:
+                self.unblock(cell)
+
+    def block(self, cell: int) -> None:
+        cells = self.grid.cells
+        if cells[cell]:
+            return
+        cells[cell] = 1
+        if sum(1 for step in self.grid.offsets if not cells[cell + step]) > 1:
+            self._dirty = True
+
+    def unblock(self, cell: int) -> None:
+        cells = self.grid.cells
+        if not cells[cell]:
+            return
+        cells[cell] = 0
+        if self._dirty:
+            return
+        neighbors = [cell + step for step in self.grid.offsets if not cells[cell + step]]
+        if self._parent[cell] < 0:
+            self._parent[cell] = cell
+            self._size[cell] = 1
+        elif not any(self._find(neighbor) == self._find(cell) for neighbor in neighbors):
+            # a cell blocked without a rebuild is still linked into its old component,
+            # which it may no longer touch once its neighbours were blocked after it
+            self._dirty = True
+            return
+        for neighbor in neighbors:
+            self._union(cell, neighbor)
+
+    def connected(self, a: int, b: int) -> bool:
+        cells = self.grid.cells
+        if cells[a] or cells[b]:
+            return False
+        if self._dirty:
+            self._rebuild()
+        return self._find(a) == self._find(b)
+
+    def label(self, cell: int) -> int:
+        """Representative of the component holding ``cell``, or -1 for a blocked cell."""
+        if self.grid.cells[cell]:
+            return -1
+        if self._dirty:
+            self._rebuild()
+        return self._find(cell)
+
+    def _rebuild(self) -> None:
+        cells = self.grid.cells
+        stride = self.grid.stride
+        parent = self._parent = array("i", [-1]) * len(cells)
+        self._size = array("i", [1]) * len(cells)
+        self._dirty = False
+        self.rebuilds += 1
+        free: List[int] = [index for index, blocked in enumerate(cells) if not blocked]
+        for index in free:
+            parent[index] = index
+        # the border is blocked, so looking left and up never leaves the grid
+        for index in free:
+            if not cells[index - stride]:
+                self._union(index, index - stride)
+            if not cells[index - 1]:
+                self._union(index, index - 1)
+
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            # path halving
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, a: int, b: int) -> None:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        size = self._size
+        if size[a] < size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        size[a] += size[b]
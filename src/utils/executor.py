@@ -0,0 +1,118 @@
+"""Background searches for the game loops.
+
+SearchExecutor runs one search at a time on a worker thread. Submitting a new
+search cancels the one in flight, so the latest request always wins and the
+render loop only ever polls. Cancellation is cooperative: searches call
+``token.check()`` between steps, which raises SearchCancelled once the job
+has been superseded or cancelled. A job may also be given a time budget,
+which its token carries as a deadline for searches that can stop early with
+a usable answer.
+
+A thread rather than a process keeps submission cheap and lets searches read
+the caller's objects; the interpreter switches threads every few
+milliseconds, so the loop keeps drawing and handling input meanwhile.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Generic, Optional, TypeVar
+import threading
+
+
+T = TypeVar("T")
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search whose job was cancelled or superseded."""
+
+
+class CancelToken:
+    __slots__ = ("_event", "deadline")
+
+    def __init__(self, deadline: Optional[float] = None) -> None:
+        self._event = threading.Event()
+        # perf_counter() time by which a budgeted search should settle for its best answer so far
+        self.deadline = deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and perf_counter() >= self.deadline
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise SearchCancelled
+
+
+class SearchJob(Generic[T]):
+    """Handle on one submitted search; poll ``done()`` and then read ``result()``."""
+
+    __slots__ = ("future", "token")
+
+    def __init__(self, future: Future, token: CancelToken) -> None:
+        self.future = future
+        self.token = token
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> T:
+        """The search's return value; re-raises its exception, SearchCancelled included."""
+        return self.future.result(timeout)
+
+    def cancel(self) -> None:
+        self.token.cancel()
+        self.future.cancel()
+
+
+def _run(search: Callable[[CancelToken], T], token: CancelToken) -> T:
+    # a job superseded while still queued never starts its search
+    token.check()
+    return search(token)
+
+
+class SearchExecutor:
+    def __init__(self) -> None:
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._current: Optional[SearchJob] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None and not self._current.done()
+
+    def submit(self, search: Callable[[CancelToken], T], budget: Optional[float] = None) -> SearchJob[T]:
+        """Run ``search(token)`` in the background, cancelling the previous job.
+
+        budget: seconds from now until the token's deadline; no deadline by default.
+        """
+        self.cancel()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        token = CancelToken(perf_counter() + budget if budget is not None else None)
+        job: SearchJob[T] = SearchJob(self._pool.submit(_run, search, token), token)
+        self._current = job
+        return job
+
+    def cancel(self) -> None:
+        if self._current is not None:
+            self._current.cancel()
+            self._current = None
+
+    def shutdown(self) -> None:
+        """Cancel the current job and let the worker exit once it notices."""
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from random import Random
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from .grid import Coord, FlatGrid
+
+
+class FreeCells:
+    """Free (x, y) cells of a grid, kept as a swap-remove array plus a position map.
+
+    ``add``, ``discard``, membership and ``sample`` are all O(1), so placing an
+    obstacle or spawning food never scans the board. Iteration order is the
+    array order, which changes as cells are removed.
+    """
+
+    __slots__ = ("_cells", "_positions")
+
+    def __init__(self, cells: Iterable[Coord] = ()) -> None:
+        self._cells: List[Coord] = []
+        self._positions: Dict[Coord, int] = {}
+        for cell in cells:
+            self.add(cell)
+
+    @classmethod
+    def from_grid(cls, grid: FlatGrid) -> FreeCells:
+        cells = grid.cells
+        return cls((x, y) for x in range(grid.width) for y in range(grid.height) if not cells[grid.index(x, y)])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> FreeCells:
+        return cls((x, y) for y, row in enumerate(rows) for x, value in enumerate(row) if not value)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: object) -> bool:
+        return cell in self._positions
+
+    def __iter__(self) -> Iterator[Coord]:
+        return iter(self._cells)
+
+    def add(self, cell: Coord) -> None:
+        if cell not in self._positions:
+            self._positions[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def discard(self, cell: Coord) -> None:
+        position = self._positions.pop(cell, None)
+        if position is None:
+            return
+        # move the last cell into the hole so the array stays dense
+        last = self._cells.pop()
+        if position < len(self._cells):
+            self._cells[position] = last
+            self._positions[last] = position
+
+    def sample(self, rng: Random) -> Coord:
+        """A uniformly random free cell; IndexError when there is none."""
+        if not self._cells:
+            raise IndexError("no free cell to sample")
+        return self._cells[rng.randrange(len(self._cells))]
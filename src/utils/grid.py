@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Sequence, Tuple
+
+
+Coord = Tuple[int, int]
+
+
+class FlatGrid:
+    """Obstacle grid packed into a bytearray and addressed by single int indices.
+
+    The grid is surrounded by a one-cell blocked border, so the four neighbours of
+    any in-bounds cell are always valid indices and searches can expand a cell by
+    adding the precomputed ``offsets`` without bounds checks. Cells are stored
+    column-major (``index = (x + 1) * stride + (y + 1)``) so that comparing two
+    indices orders them the same way as comparing their ``(x, y)`` tuples, which
+    keeps heap tie-breaking identical to the tuple based API.
+    """
+
+    __slots__ = ("width", "height", "stride", "cells", "offsets")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.stride = height + 2
+        self.cells = bytearray(b"\x01") * ((width + 2) * self.stride)
+        for x in range(width):
+            start = (x + 1) * self.stride + 1
+            self.cells[start : start + height] = bytes(height)
+        # (-1, 0), (1, 0), (0, -1), (0, 1): the neighbour order SnakeAI has always used
+        self.offsets: Tuple[int, int, int, int] = (-self.stride, self.stride, -1, 1)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> FlatGrid:
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        grid = cls(width, height)
+        cells = grid.cells
+        stride = grid.stride
+        for y, row in enumerate(rows):
+            index = stride + y + 1
+            for value in row:
+                if value:
+                    cells[index] = 1
+                index += stride
+        return grid
+
+    def to_rows(self) -> List[List[int]]:
+        return [[self.cells[self.index(x, y)] for x in range(self.width)] for y in range(self.height)]
+
+    def copy(self) -> FlatGrid:
+        grid = FlatGrid.__new__(FlatGrid)
+        grid.width = self.width
+        grid.height = self.height
+        grid.stride = self.stride
+        grid.cells = bytearray(self.cells)
+        grid.offsets = self.offsets
+        return grid
+
+    def diff(self, other: FlatGrid, block: int = 4096) -> List[int]:
+        """Indices whose blocked state differs in ``other``, a grid of the same size.
+
+        Blocks of cells are compared as bytes first, so the cost is a memcmp of
+        the grid plus a scan of the blocks that actually changed.
+        """
+        if (self.width, self.height) != (other.width, other.height):
+            raise ValueError(f"cannot diff a {self.width}x{self.height} grid against {other.width}x{other.height}")
+        mine, theirs = self.cells, other.cells
+        changed: List[int] = []
+        if mine == theirs:
+            return changed
+        for begin in range(0, len(mine), block):
+            end = min(begin + block, len(mine))
+            if mine[begin:end] != theirs[begin:end]:
+                changed.extend(index for index in range(begin, end) if mine[index] != theirs[index])
+        return changed
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def index(self, x: int, y: int) -> int:
+        return (x + 1) * self.stride + y + 1
+
+    def coord(self, index: int) -> Coord:
+        x, y = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        return not self.in_bounds(x, y) or bool(self.cells[self.index(x, y)])
+
+    def set_blocked(self, x: int, y: int, blocked: bool = True) -> None:
+        if not self.in_bounds(x, y):
+            raise IndexError(f"cell {(x, y)} is outside the {self.width}x{self.height} grid")
+        self.cells[self.index(x, y)] = 1 if blocked else 0
+
+    def free_neighbors(self, index: int) -> Iterator[int]:
+        cells = self.cells
+        for step in self.offsets:
+            neighbor = index + step
+            if not cells[neighbor]:
+                yield neighbor
@@ -0,0 +1,97 @@
+"""Moving AI benchmark files: ``.map`` grids and ``.scen`` scenario lists.
+
+Maps are memory-mapped and decoded one row at a time straight into a
+FlatGrid, so a 1024x1024 map never exists as nested Python lists. Terrain
+follows the Moving AI conventions for land units: ``.``, ``G`` and ``S`` are
+passable, everything else (``@``, ``O``, ``T``, ``W``) is blocked.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+import mmap
+
+from .grid import Coord, FlatGrid
+
+
+PASSABLE = b".GS"
+# maps every byte to 1 (blocked) except the passable terrain, which maps to 0
+_TERRAIN = bytes(0 if value in PASSABLE else 1 for value in range(256))
+
+
+@dataclass
+class Scenario:
+    """One ``.scen`` line: a query on ``map`` with its published optimal length.
+
+    Coordinates are (x, y) with x the column, as in FlatGrid. ``optimal`` is
+    measured with the map's own movement rules, which for ``type octile`` maps
+    are eight-connected with diagonal moves costing sqrt(2).
+    """
+
+    bucket: int
+    map: str
+    width: int
+    height: int
+    start: Coord
+    goal: Coord
+    optimal: float
+
+
+def load_map(path: str) -> FlatGrid:
+    with open(path, "rb") as handle:
+        try:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{path}: empty map file") from None
+    with data:
+        header = {}
+        while True:
+            line = data.readline()
+            if not line:
+                raise ValueError(f"{path}: missing 'map' line")
+            words = line.split()
+            if words == [b"map"]:
+                break
+            if len(words) == 2:
+                header[words[0].decode()] = words[1].decode()
+        try:
+            width, height = int(header["width"]), int(header["height"])
+        except (KeyError, ValueError):
+            raise ValueError(f"{path}: header needs integer 'width' and 'height'") from None
+
+        grid = FlatGrid(width, height)
+        cells = grid.cells
+        stride = grid.stride
+        position = data.tell()
+        for y in range(height):
+            end = position + width
+            row = data[position:end]
+            if len(row) != width or b"\n" in row:
+                raise ValueError(f"{path}: row {y} is shorter than the width {width}")
+            # cells are column-major, so one map row is a strided slice of the grid
+            begin = stride + y + 1
+            cells[begin : begin + width * stride : stride] = row.translate(_TERRAIN)
+            newline = data.find(b"\n", end)
+            position = len(data) if newline < 0 else newline + 1
+    return grid
+
+
+def load_scenarios(path: str) -> List[Scenario]:
+    scenarios: List[Scenario] = []
+    with open(path) as handle:
+        for number, line in enumerate(handle, 1):
+            fields = line.rstrip("\r\n").split("\t")
+            if number == 1 and fields[0].startswith("version"):
+                continue
+            if not line.strip():
+                continue
+            if len(fields) != 9:
+                raise ValueError(f"{path}:{number}: expected 9 tab-separated fields, got {len(fields)}")
+            try:
+                bucket, width, height, start_x, start_y, goal_x, goal_y = (int(field) for field in fields[:1] + fields[2:8])
+                optimal = float(fields[8])
+            except ValueError:
+                raise ValueError(f"{path}:{number}: malformed scenario line") from None
+            scenarios.append(Scenario(bucket, fields[1], width, height, (start_x, start_y), (goal_x, goal_y), optimal))
+    return scenarios
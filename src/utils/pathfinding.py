@@ -4,13 +4,18 @@ def create_grid(rows, cols):
 def is_valid_move(grid, row, col):
     return 0 <= row < len(grid) and 0 <= col < len(grid[0]) and grid[row][col] == 0
 
-def place_obstacle(grid, row, col):
+def place_obstacle(grid, row, col, free=None):
+    """Block grid[row][col]; ``free``, a FreeCells of (x, y) = (col, row) cells, is kept in step."""
     if is_valid_move(grid, row, col):
         grid[row][col] = 1
+        if free is not None:
+            free.discard((col, row))
 
-def remove_obstacle(grid, row, col):
+def remove_obstacle(grid, row, col, free=None):
     if 0 <= row < len(grid) and 0 <= col < len(grid[0]):
         grid[row][col] = 0
+        if free is not None:
+            free.add((col, row))
 
 def print_grid(grid):
     for row in grid:
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, Optional
+import tracemalloc
+
+
+Hook = Callable[[Any], None]
+
+
+@dataclass
+class SearchStats:
+    """Counters filled in by an instrumented search.
+
+    Searches only pay for instrumentation when a stats object is attached, and
+    hooks are only called when set. ``peak_memory`` is measured with
+    tracemalloc, which slows allocation down, so it is opt-in through
+    ``track_memory``.
+    """
+
+    expansions: int = 0
+    pushes: int = 0
+    stale_pops: int = 0
+    relaxations: int = 0
+    peak_frontier: int = 0
+    # bytes allocated above the starting point, 0 unless track_memory is set
+    peak_memory: int = 0
+    # seconds
+    wall_time: float = 0.0
+    track_memory: bool = False
+    on_expand: Optional[Hook] = None
+    on_push: Optional[Hook] = None
+
+    def reset(self) -> None:
+        """Zero the counters, keeping the options and hooks."""
+        self.expansions = self.pushes = self.stale_pops = self.relaxations = 0
+        self.peak_frontier = self.peak_memory = 0
+        self.wall_time = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        skip = {"track_memory", "on_expand", "on_push"}
+        return {field.name: getattr(self, field.name) for field in fields(self) if field.name not in skip}
+
+    @contextmanager
+    def measure(self) -> Iterator[SearchStats]:
+        """Record wall time, and peak memory when track_memory is set, around the block."""
+        started = self.track_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        began = perf_counter()
+        try:
+            yield self
+        finally:
+            self.wall_time = perf_counter() - began
+            if self.track_memory:
+                self.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            if started:
+                tracemalloc.stop()
@@ -0,0 +1,51 @@
+import unittest
+
+from src.bench import GENERATORS, compare, generate, measure
+from src.bench.agents import run_agents
+from src.game.snake.field import distance_field
+
+
+class TestBench(unittest.TestCase):
+
+    def test_workloads_are_seeded_and_solvable(self):
+        for kind in GENERATORS:
+            workload = generate(kind, 40, seed=3)
+            again = generate(kind, 40, seed=3)
+            self.assertEqual(workload.grid.cells, again.grid.cells)
+            self.assertEqual((workload.start, workload.goal), (again.start, again.goal))
+            field = distance_field(workload.grid.index(*workload.start), workload.grid)
+            self.assertGreater(field.distance(workload.goal), 20)
+        self.assertNotEqual(generate("maze", 40, seed=1).grid.cells, generate("maze", 40, seed=2).grid.cells)
+
+    def test_maze_reaches_every_passage(self):
+        workload = generate("maze", 41)
+        distances = distance_field(workload.grid.index(0, 0), workload.grid).distances
+        free = [index for index, blocked in enumerate(workload.grid.cells) if not blocked]
+        self.assertTrue(all(distances[index] >= 0 for index in free))
+
+    def test_agents_are_routed_without_collisions(self):
+        reports = run_agents([1, 40], size=30, window=8)
+        self.assertEqual([report.agents for report in reports], [1, 40])
+        for report in reports:
+            self.assertEqual(report.collisions, 0)
+            self.assertEqual(report.arrived, report.agents)
+            self.assertEqual(report.routed, report.agents * report.rounds)
+            self.assertGreater(report.throughput, 0)
+
+    def test_compare_flags_regressions(self):
+        workload = generate("rooms", 30)
+        baseline = measure(workload, "a_star", repeat=1)
+        self.assertEqual(measure(workload, "bfs", repeat=1).path_length, baseline.path_length)
+        worse = measure(workload, "a_star", repeat=1)
+        self.assertEqual(compare([worse], [baseline], tolerance=100.0), [])
+        worse.expansions += 1
+        worse.time = baseline.time * 3 + 1.0
+        worse.path_cost += 1
+        metrics = [regression.metric for regression in compare([worse], [baseline])]
+        self.assertEqual(metrics, ["path_cost", "expansions", "time"])
+        worse.found = False
+        self.assertEqual([regression.metric for regression in compare([worse], [baseline])], ["found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
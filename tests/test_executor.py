@@ -0,0 +1,82 @@
+from time import perf_counter
+import threading
+import unittest
+
+from src.game.tictactoe.ai import TicTacToeAI
+from src.utils.executor import CancelToken, SearchCancelled, SearchExecutor
+
+
+def _wait_for_cancel(started: threading.Event):
+    def search(token: CancelToken) -> str:
+        started.set()
+        while True:
+            token.check()
+
+    return search
+
+
+class TestSearchExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.executor = SearchExecutor()
+        self.addCleanup(self.executor.shutdown)
+
+    def test_returns_result(self) -> None:
+        job = self.executor.submit(lambda token: 42)
+        self.assertEqual(job.result(timeout=5), 42)
+        self.assertTrue(job.done())
+        self.assertFalse(self.executor.busy)
+
+    def test_budget_sets_token_deadline(self) -> None:
+        began = perf_counter()
+        deadline = self.executor.submit(lambda token: token.deadline, budget=5).result(timeout=5)
+        self.assertGreaterEqual(deadline, began + 5)
+        self.assertIsNone(self.executor.submit(lambda token: token.deadline).result(timeout=5))
+        self.assertTrue(CancelToken(began).expired)
+        self.assertFalse(CancelToken().expired)
+
+    def test_new_search_supersedes_running_one(self) -> None:
+        started = threading.Event()
+        first = self.executor.submit(_wait_for_cancel(started))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(self.executor.busy)
+        second = self.executor.submit(lambda token: "latest")
+        self.assertTrue(first.cancelled)
+        with self.assertRaises(SearchCancelled):
+            first.result(timeout=5)
+        self.assertEqual(second.result(timeout=5), "latest")
+
+    def test_cancel_and_shutdown(self) -> None:
+        started = threading.Event()
+        job = self.executor.submit(_wait_for_cancel(started))
+        self.assertTrue(started.wait(5))
+        self.executor.cancel()
+        with self.assertRaises(SearchCancelled):
+            job.result(timeout=5)
+        self.assertFalse(self.executor.busy)
+        self.executor.shutdown()
+        # the pool is recreated on demand
+        self.assertEqual(self.executor.submit(lambda token: 1).result(timeout=5), 1)
+
+    def test_shutdown_stops_long_search_promptly(self) -> None:
+        # minimax on an empty 4x4 board runs far longer than this test may take
+        board = [[""] * 4 for _ in range(4)]
+        job = self.executor.submit(lambda token: TicTacToeAI().best_move(board, token))
+        while not job.future.running():
+            pass
+        workers = [thread for thread in threading.enumerate() if thread.name.startswith("search")]
+        self.assertTrue(workers)
+        began = perf_counter()
+        self.executor.shutdown()
+        with self.assertRaises(SearchCancelled):
+            job.result(timeout=5)
+        # the worker exits too, so it cannot hold up interpreter exit
+        for thread in workers:
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+        self.assertLess(perf_counter() - began, 1.0)
+        self.assertEqual(board, [[""] * 4 for _ in range(4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+
+from src.game.snake.ai import SnakeAI
+from random import Random
+
+from src.game.snake.field import distance_field
+from src.utils.components import Components
+from src.utils.freecells import FreeCells
+from src.utils.grid import FlatGrid
+from src.utils.pathfinding import create_grid, place_obstacle, remove_obstacle
+
+
+class TestFlatGrid(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rows = [
+            [0, 0, 0, 0],
+            [1, 1, 1, 0],
+            [0, 0, 0, 0],
+        ]
+        self.grid = FlatGrid.from_rows(self.rows)
+
+    def test_round_trip(self) -> None:
+        self.assertEqual(self.grid.to_rows(), self.rows)
+        self.assertEqual(self.grid.coord(self.grid.index(3, 2)), (3, 2))
+
+    def test_border_is_blocked(self) -> None:
+        self.assertTrue(self.grid.is_blocked(-1, 0))
+        self.assertTrue(self.grid.is_blocked(4, 2))
+        corner = self.grid.index(0, 0)
+        self.assertEqual(list(self.grid.free_neighbors(corner)), [self.grid.index(1, 0)])
+
+    def test_diff_lists_changed_cells(self) -> None:
+        other = self.grid.copy()
+        self.assertEqual(self.grid.diff(other), [])
+        other.set_blocked(3, 0)
+        other.set_blocked(0, 1, False)
+        self.assertEqual(self.grid.diff(other, block=5), sorted([self.grid.index(3, 0), self.grid.index(0, 1)]))
+        with self.assertRaises(ValueError):
+            self.grid.diff(FlatGrid(2, 2))
+
+    def test_index_search_matches_tuple_search(self) -> None:
+        ai = SnakeAI()
+        start, goal = self.grid.index(0, 0), self.grid.index(0, 2)
+        for name in ("dfs", "bfs", "ucs", "a_star"):
+            flat = ai.search(name, start, goal, self.grid)
+            coords = getattr(ai, name)((0, 0), (0, 2), self.rows)
+            self.assertEqual([self.grid.coord(node) for node in flat.path], coords.path)
+            self.assertEqual(coords.path[-1], (0, 2))
+
+    def test_unknown_algorithm(self) -> None:
+        with self.assertRaises(ValueError):
+            SnakeAI().search("greedy", 0, 0, self.grid)
+
+
+class TestFreeCells(unittest.TestCase):
+
+    def test_swap_remove_keeps_index_dense(self) -> None:
+        grid = FlatGrid.from_rows([[0, 1, 0], [0, 0, 1]])
+        free = FreeCells.from_grid(grid)
+        self.assertEqual(set(free), {(0, 0), (2, 0), (0, 1), (1, 1)})
+        free.discard((0, 0))
+        free.discard((0, 0))
+        free.add((2, 0))
+        self.assertEqual(len(free), 3)
+        self.assertNotIn((0, 0), free)
+        rng = Random(5)
+        self.assertEqual({free.sample(rng) for _ in range(100)}, {(2, 0), (0, 1), (1, 1)})
+        for cell in list(free):
+            free.discard(cell)
+        with self.assertRaises(IndexError):
+            free.sample(rng)
+
+    def test_pathfinding_helpers_keep_index_in_step(self) -> None:
+        rows = create_grid(2, 3)
+        free = FreeCells.from_rows(rows)
+        place_obstacle(rows, 1, 2, free)
+        self.assertNotIn((2, 1), free)
+        self.assertEqual(set(free), set(FreeCells.from_grid(FlatGrid.from_rows(rows))))
+        remove_obstacle(rows, 1, 2, free)
+        self.assertEqual(len(free), 6)
+
+
+class TestComponents(unittest.TestCase):
+
+    def assert_matches_bfs(self, components: Components, grid: FlatGrid) -> None:
+        free = [index for index, blocked in enumerate(grid.cells) if not blocked]
+        for source in free[::7]:
+            distances = distance_field(source, grid).distances
+            for target in free[::5]:
+                self.assertEqual(components.connected(source, target), distances[target] >= 0)
+
+    def test_random_edits_match_bfs(self) -> None:
+        rng = Random(11)
+        grid = FlatGrid(12, 9)
+        components = Components(grid)
+        for _ in range(40):
+            for _ in range(6):
+                grid.set_blocked(rng.randrange(12), rng.randrange(9), rng.random() < 0.6)
+            components.update(grid)
+            self.assert_matches_bfs(components, grid)
+
+    def test_only_splitting_blocks_rebuild(self) -> None:
+        grid = FlatGrid.from_rows([[0, 0, 0], [1, 1, 0], [0, 0, 0]])
+        components = Components(grid)
+        corner, far = grid.index(0, 0), grid.index(0, 2)
+        self.assertTrue(components.connected(corner, far))
+        self.assertEqual(components.rebuilds, 1)
+        # a dead end cannot disconnect anything
+        components.block(corner)
+        self.assertFalse(components.connected(corner, far))
+        self.assertTrue(components.connected(grid.index(1, 0), far))
+        components.unblock(corner)
+        self.assertTrue(components.connected(corner, far))
+        self.assertEqual(components.rebuilds, 1)
+        components.block(grid.index(2, 1))
+        self.assertFalse(components.connected(corner, far))
+        self.assertEqual(components.rebuilds, 2)
+
+    def test_unblocking_a_cell_cut_off_after_it(self) -> None:
+        grid = FlatGrid.from_rows([[0], [0], [0]])
+        components = Components(grid)
+        top, middle, bottom = grid.index(0, 0), grid.index(0, 1), grid.index(0, 2)
+        self.assertTrue(components.connected(top, bottom))
+        # each block is a dead end, so neither rebuilds and the top stays linked to the bottom
+        components.block(top)
+        components.block(middle)
+        components.unblock(top)
+        self.assertFalse(components.connected(top, bottom))
+        components.unblock(middle)
+        self.assertTrue(components.connected(top, bottom))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from src.bench.scenarios import run_scenarios
+from src.utils.grid import FlatGrid
+from src.utils.movingai import load_map, load_scenarios
+
+
+MAP = "type octile\r\nheight 3\r\nwidth 4\r\nmap\r\n..@.\r\nT.W.\r\n.G.S"
+SCEN = (
+    "version 1\n"
+    "0\tmaps/small.map\t4\t3\t0\t0\t3\t0\t4.41421356\n"
+    "0\tmaps/small.map\t4\t3\t0\t2\t3\t2\t3\n"
+    "1\tmaps/small.map\t4\t3\t0\t0\t2\t1\t2\n"
+)
+
+
+class TestMovingAI(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.map_path = self._write("small.map", MAP)
+        self.scen_path = self._write("small.map.scen", SCEN)
+
+    def _write(self, name: str, text: str) -> str:
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", newline="") as handle:
+            handle.write(text)
+        return path
+
+    def test_load_map_decodes_terrain(self) -> None:
+        grid = load_map(self.map_path)
+        self.assertEqual(grid.to_rows(), [[0, 0, 1, 0], [1, 0, 1, 0], [0, 0, 0, 0]])
+        self.assertEqual(grid.cells, FlatGrid.from_rows(grid.to_rows()).cells)
+
+    def test_load_map_rejects_short_rows(self) -> None:
+        with self.assertRaises(ValueError):
+            load_map(self._write("short.map", "type octile\nheight 2\nwidth 3\nmap\n...\n..\n"))
+        with self.assertRaises(ValueError):
+            load_map(self._write("empty.map", ""))
+
+    def test_load_scenarios(self) -> None:
+        scenarios = load_scenarios(self.scen_path)
+        self.assertEqual(len(scenarios), 3)
+        self.assertEqual((scenarios[0].map, scenarios[0].start, scenarios[0].goal), ("maps/small.map", (0, 0), (3, 0)))
+        self.assertAlmostEqual(scenarios[0].optimal, 4.41421356)
+
+    def test_run_scenarios_checks_optimality(self) -> None:
+        reports = {report.algorithm: report for report in run_scenarios(self.scen_path, ["bfs", "a_star", "dfs"])}
+        for report in reports.values():
+            self.assertEqual((report.queries, report.solved, report.missed), (3, 2, 0))
+        self.assertEqual(reports["bfs"].suboptimal, 0)
+        self.assertFalse(reports["a_star"].failed)
+        # the octile optimum of the first query is shorter than any four-connected path, and the
+        # published length of the last one ignores that its goal is water
+        by_scen = run_scenarios(self.scen_path, ["bfs"], map_path=self.map_path, reference="scen")
+        self.assertEqual((by_scen[0].suboptimal, by_scen[0].missed), (1, 1))
+        self.assertTrue(by_scen[0].failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import subprocess
+import sys
+import unittest
+
+from src.game.snake.ai import SnakeAI
+from src.game.snake.simulation import PATH, VISITED, AlgorithmState, SnakeSimulation
+from src.utils.executor import SearchExecutor
+
+
+class TestSnakeSimulation(unittest.TestCase):
+
+    def test_headless_run_is_seeded(self):
+        runs = []
+        for _ in range(2):
+            sim = SnakeSimulation(grid_size=15, animate=False, seed=7)
+            self.assertEqual(sim.run(500), 500)
+            runs.append((sim.food_eaten, sim.moves, sim.snake_pos, sim.food_pos))
+        self.assertEqual(runs[0], runs[1])
+        self.assertGreater(runs[0][0], 10)
+        # headless mode moves on every tick that is not spent on the food just eaten
+        self.assertEqual(runs[0][1], 500)
+
+    def test_background_search_matches_inline(self):
+        executor = SearchExecutor()
+        self.addCleanup(executor.shutdown)
+        sim = SnakeSimulation(grid_size=15, animate=False, seed=7, executor=executor)
+        inline = SnakeSimulation(grid_size=15, animate=False, seed=7)
+        self.assertIsNotNone(sim.pending)
+        self.assertIsNone(sim.state)
+        sim.pending.result(timeout=5)
+        sim.tick()
+        self.assertIsNone(sim.pending)
+        self.assertEqual(sim.state.path, inline.state.path)
+        self.assertEqual(sim.status_message, inline.status_message)
+        # a new search supersedes the one in flight
+        first = sim.pending = executor.submit(lambda token: token.check() or [])
+        sim.select_algorithm("BFS")
+        self.assertTrue(first.cancelled)
+        self.assertIsNot(sim.pending, first)
+
+    def test_animate_toggle(self):
+        sim = SnakeSimulation(grid_size=10, seed=1)
+        sim.set_animate(False)
+        self.assertTrue(sim.state.visited_complete())
+        self.assertEqual(sim.move_interval, 1)
+        sim.set_animate(True)
+        self.assertFalse(sim.state.visited_complete())
+
+    def test_animated_search_steps_before_moving(self):
+        sim = SnakeSimulation(grid_size=10, seed=1)
+        self.assertFalse(sim.state.visited_complete())
+        start = sim.snake_pos
+        while not sim.state.visited_complete():
+            sim.tick()
+            self.assertEqual(sim.snake_pos, start)
+        path = sim.state.path
+        self.assertEqual(path[0], start)
+        self.assertEqual(sim.status_message, f"A* path length: {len(path) - 1}")
+        sim.run(sim.move_interval)
+        self.assertEqual(sim.snake_pos, path[1])
+
+    def test_overlay_tracks_search_incrementally(self):
+        sim = SnakeSimulation(grid_size=12, algorithm="Bi-A*", seed=4)
+        state = sim.state
+        state.take_changes()
+        while not state.visited_complete():
+            state.advance_visited()
+            changed = state.take_changes()
+            if not state.visited_complete():
+                self.assertLessEqual(len(changed), 6)
+            self.assertEqual(set(state.visited_cells()), set(state.search.visited_order))
+            self.assertEqual(set(state.frontier_cells()), state.search.frontier())
+        self.assertEqual(set(state.frontier_cells()), set())
+        self.assertEqual(set(state.path_cells()), set(state.path))
+        self.assertEqual(state.layer(state.path[1]), PATH)
+        state.advance_path()
+        self.assertEqual(state.take_changes(), {state.path[0]})
+        self.assertEqual(state.layer(state.path[0]), VISITED)
+
+    def test_overlay_counts_duplicate_seeds(self):
+        # freeing (5, 5) leaves D* Lite with (5, 4) queued twice when the next query starts
+        grid = [[1, 0, 0, 0, 0, 0], [0, 0, 1, 1, 0, 0], [0, 1, 0, 0, 0, 0], [0, 1, 1, 0, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 1]]
+        ai = SnakeAI()
+        ai.d_star_lite((0, 1), (4, 5), grid)
+        grid[5][5] = 0
+        state = AlgorithmState(ai.stepper("d_star_lite", (2, 0), (4, 5), grid))
+        self.assertEqual(state.search.frontier_counts()[(5, 4)], 2)
+        while not state.visited_complete():
+            state.advance_visited()
+            if not state.visited_complete():
+                self.assertEqual(set(state.frontier_cells()), state.search.frontier())
+
+    def test_food_spawns_on_reachable_free_cells(self):
+        sim = SnakeSimulation(grid_size=10, animate=False, seed=2)
+        # a wall cutting off the right-hand column, with the snake on the left
+        sim.obstacles.update((8, y) for y in range(10))
+        for _ in range(50):
+            sim._handle_food_reached()
+            self.assertNotIn(sim.food_pos, sim.obstacles)
+            self.assertLess(sim.food_pos[0], 8)
+        self.assertEqual(len(sim.free_cells), 90)
+        sim.obstacles.discard((8, 0))
+        sim.select_algorithm("BFS")
+        self.assertIn((8, 0), sim.free_cells)
+
+    def test_walled_in_food_leaves_the_simulation_stuck(self):
+        sim = SnakeSimulation(grid_size=6, animate=False, seed=3)
+        sim.food_pos = (0, 0)
+        sim.obstacles.update({(1, 0), (0, 1)})
+        sim.select_algorithm("BFS")
+        self.assertTrue(sim.stuck)
+        self.assertEqual(sim.run(10), 0)
+        with self.assertRaises(ValueError):
+            sim.select_algorithm("Greedy")
+
+    def test_imports_without_pygame(self):
+        code = "import sys; sys.modules['pygame'] = None; from src import SnakeSimulation; SnakeSimulation(animate=False).run(5)"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,9 @@
+import importlib.util
 import unittest
+from src.game.snake.hierarchical import HierarchicalPlanner
+from src.utils.grid import FlatGrid
+from src.utils.pathfinding import place_obstacle
+from src.utils.stats import SearchStats
 from src.game.snake.ai import SnakeAI  # Assuming SnakeAI is the class that implements the AI
 
 class TestSnakeAI(unittest.TestCase):
@@ -38,6 +43,337 @@ class TestSnakeAI(unittest.TestCase):
         self.assertIsNotNone(path)
         self.assertIn(goal, path)
 
+    def test_frontier_replay(self):
+        grid = self.create_test_grid()
+        result = self.ai.bfs((0, 0), (5, 5), grid)
+        self.assertEqual(result.frontier_at(0), {(0, 0)})
+        self.assertEqual(result.frontier_at(1), {(1, 0), (0, 1)})
+        # stepping backwards replays from the start
+        self.assertEqual(result.frontier_at(0), {(0, 0)})
+        self.assertEqual(result.frontier_at(10**6), result.frontier_history[-1])
+
+    def test_lean_trace_keeps_path(self):
+        grid = self.create_test_grid()
+        lean = SnakeAI(trace="none")
+        for name in ("dfs", "bfs", "ucs", "a_star"):
+            full_result = getattr(self.ai, name)((0, 0), (5, 5), grid)
+            lean_result = getattr(lean, name)((0, 0), (5, 5), grid)
+            self.assertEqual(lean_result.path, full_result.path)
+            self.assertEqual(lean_result.visited_order, [])
+            self.assertEqual(lean_result.frontier_at(3), set())
+
+    def test_invalid_trace_level(self):
+        with self.assertRaises(ValueError):
+            SnakeAI(trace="frontier")
+
+    def test_stepper_matches_full_search(self):
+        grid = self.create_test_grid()
+        for name in ("dfs", "bfs", "ucs", "a_star"):
+            result = getattr(self.ai, name)((0, 0), (5, 5), grid)
+            stepper = self.ai.stepper(name, (0, 0), (5, 5), grid)
+            first = stepper.step()
+            self.assertEqual(stepper.visited_order, [(0, 0)])
+            self.assertEqual(stepper.frontier(), result.frontier_at(1))
+            self.assertTrue(first.pushed)
+            self.assertEqual(stepper.run(), result.path)
+            self.assertEqual(stepper.visited_order, result.visited_order)
+
+    def test_stepper_close_abandons_search(self):
+        stepper = self.ai.stepper("bfs", (0, 0), (9, 9), self.create_test_grid())
+        stepper.step()
+        stepper.close()
+        self.assertTrue(stepper.done)
+        self.assertIsNone(stepper.step())
+        self.assertEqual(stepper.path, [])
+
+    def test_bidirectional_bfs_matches_bfs_length(self):
+        grid = self.create_test_grid()
+        for row in range(1, 9):
+            grid[row][4] = 1
+        path = self.ai.bi_bfs((0, 5), (9, 5), grid).path
+        self.assertEqual(path[0], (0, 5))
+        self.assertEqual(path[-1], (9, 5))
+        self.assertEqual(len(path), len(self.ai.bfs((0, 5), (9, 5), grid).path))
+
+    def test_bidirectional_a_star_prices_junction_turn(self):
+        # with a steep penalty the cheapest route is a single L; pricing the junction keeps it that way
+        ai = SnakeAI(turn_penalty=3.0)
+        result = ai.bi_a_star((0, 0), (5, 5), self.create_test_grid())
+        turns = sum(
+            1
+            for a, b, c in zip(result.path, result.path[1:], result.path[2:])
+            if (b[0] - a[0], b[1] - a[1]) != (c[0] - b[0], c[1] - b[1])
+        )
+        self.assertEqual(turns, 1)
+        self.assertEqual(len(result.path), 11)
+        self.assertEqual(result.frontier_at(0), {(0, 0), (5, 5)})
+
+    def test_bidirectional_lean_loops_match_steps(self):
+        grid = [[1 if (x * 7 + y * 3) % 5 == 0 and (x, y) != (9, 9) else 0 for x in range(12)] for y in range(12)]
+        lean = SnakeAI(trace="none")
+        visited = SnakeAI(trace="visited")
+        for name in ("bi_bfs", "bi_a_star"):
+            full_result = getattr(self.ai, name)((0, 1), (9, 9), grid)
+            self.assertTrue(full_result.path)
+            self.assertEqual(getattr(lean, name)((0, 1), (9, 9), grid).path, full_result.path)
+            self.assertEqual(getattr(visited, name)((0, 1), (9, 9), grid).visited_order, full_result.visited_order)
+        self.assertEqual(len(lean.bi_bfs((0, 1), (9, 9), grid).path), len(self.ai.bfs((0, 1), (9, 9), grid).path))
+
+    def test_jps_expands_full_path(self):
+        grid = self.create_test_grid()
+        for row in range(0, 8):
+            grid[row][4] = 1
+        result = self.ai.jps((0, 0), (9, 0), grid)
+        self.assertEqual(len(result.path), len(self.ai.bfs((0, 0), (9, 0), grid).path))
+        for a, b in zip(result.path, result.path[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+        self.assertLess(len(result.visited_order), len(self.ai.a_star((0, 0), (9, 0), grid).visited_order))
+
+    def test_heading_search_finds_cheaper_turns(self):
+        # a wall with two gaps: ucs keeps the first heading to reach each cell and
+        # goes through the upper gap with three turns; the bottom edge needs one
+        grid = self.create_test_grid()
+        for row in range(10):
+            if row not in (1, 9):
+                grid[row][5] = 1
+        ai = SnakeAI(turn_penalty=3.0, trace="none")
+        self.assertEqual(self.path_cost(ai.ucs((0, 9), (9, 0), grid).path, 3.0), 24.0)
+        for name in ("ucs_heading", "a_star_heading"):
+            self.assertEqual(self.path_cost(getattr(ai, name)((0, 9), (9, 0), grid).path, 3.0), 21.0)
+
+    def test_d_star_lite_repairs_previous_search(self):
+        grid = self.create_test_grid()
+        ai = SnakeAI(trace="visited")
+        first = ai.d_star_lite((0, 0), (9, 9), grid)
+        self.assertEqual(len(first.path), 19)
+        # moving along the path needs no new expansions
+        self.assertEqual(ai.d_star_lite(first.path[3], (9, 9), grid).visited_order, [])
+        for row in range(9):
+            grid[row][5] = 1
+        repaired = ai.d_star_lite(first.path[3], (9, 9), grid)
+        self.assertEqual(len(repaired.path), len(self.ai.bfs(first.path[3], (9, 9), grid).path))
+        self.assertLess(len(repaired.visited_order), len(first.visited_order))
+        grid[9][5] = 1
+        self.assertEqual(ai.d_star_lite(first.path[3], (9, 9), grid).path, [])
+
+    def test_d_star_lite_stepper_when_start_leaves_path(self):
+        grid = self.create_test_grid()
+        grid[4][3] = grid[5][3] = grid[6][3] = 1
+        ai = SnakeAI()
+        self.assertEqual(ai.stepper("d_star_lite", (1, 1), (1, 1), grid).run(), [(1, 1)])
+        # each new start is off the previous path, so outdated keys are re-queued mid-search
+        for start in ((2, 1), (8, 8), (0, 9), (5, 5)):
+            stepper = ai.stepper("d_star_lite", start, (1, 1), grid)
+            path = stepper.run()
+            self.assertEqual(path, ai.d_star_lite(start, (1, 1), grid).path)
+            self.assertEqual(len(path), len(self.ai.bfs(start, (1, 1), grid).path))
+
+    def test_cache_hits_copies_and_invalidation(self):
+        grid = self.create_test_grid()
+        ai = SnakeAI(cache_size=2)
+        first = ai.a_star((0, 0), (9, 9), grid)
+        first.path.clear()
+        again = ai.a_star((0, 0), (9, 9), grid)
+        self.assertEqual(len(again.path), 19)
+        self.assertEqual((ai.cache.hits, ai.cache.misses), (1, 1))
+        # obstacles, penalty and algorithm are all part of the key
+        grid[0][5] = 1
+        ai.a_star((0, 0), (9, 9), grid)
+        ai.turn_penalty = 1.0
+        ai.a_star((0, 0), (9, 9), grid)
+        ai.bfs((0, 0), (9, 9), grid)
+        self.assertEqual((ai.cache.hits, ai.cache.misses), (1, 4))
+        # and so is the HPA* cluster size
+        ai.hpa_star((0, 0), (9, 9), grid)
+        ai.cluster_size = 5
+        ai.hpa_star((0, 0), (9, 9), grid)
+        self.assertEqual((ai.cache.hits, ai.cache.misses), (1, 6))
+        # and whether unreachable goals are ruled out up front
+        ai.components = True
+        ai.hpa_star((0, 0), (9, 9), grid)
+        self.assertEqual((ai.cache.hits, ai.cache.misses), (1, 7))
+        self.assertEqual(len(ai.cache), 2)
+        self.assertIsNone(SnakeAI().cache)
+
+    def test_distance_field_matches_bfs(self):
+        grid = self.create_test_grid()
+        for row in range(1, 10):
+            grid[row][4] = 1
+        grid[5][7] = 1
+        field = self.ai.distance_field((0, 9), grid)
+        for goal in ((9, 9), (4, 0), (6, 6), (0, 9)):
+            path = self.ai.bfs((0, 9), goal, grid).path
+            self.assertEqual(field.path_to(goal), path)
+            self.assertEqual(field.distance(goal), len(path) - 1)
+            self.assertEqual(field.path_from(goal), path[::-1])
+        self.assertEqual(field.distance((4, 5)), -1)
+        self.assertEqual(field.path_to((4, 5)), [])
+        self.assertEqual(field.rank([(9, 9), (4, 5), (1, 9), (4, 0)]), [(1, 9), (4, 0), (9, 9)])
+        with self.assertRaises(IndexError):
+            self.ai.distance_field((10, 0), grid)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_wavefront_matches_bfs(self):
+        grid = self.create_test_grid()
+        for row in range(1, 10):
+            grid[row][4] = 1
+        for trace in ("none", "visited", "full"):
+            ai = SnakeAI(trace=trace)
+            for goal in ((9, 9), (0, 0), (4, 5)):
+                fast, reference = ai.wavefront((0, 9), goal, grid), ai.bfs((0, 9), goal, grid)
+                self.assertEqual(fast.path, reference.path)
+                self.assertEqual(fast.visited_order, reference.visited_order)
+                self.assertEqual(fast.frontier_at(7), reference.frontier_at(7))
+
+    def test_hpa_star_path_is_valid_and_near_optimal(self):
+        grid = [[0] * 30 for _ in range(30)]
+        for row in range(25):
+            grid[row][14] = 1
+        ai = SnakeAI()
+        result = ai.hpa_star((0, 0), (29, 0), grid)
+        shortest = len(ai.bfs((0, 0), (29, 0), grid).path)
+        self.assertEqual((result.path[0], result.path[-1]), ((0, 0), (29, 0)))
+        for a, b in zip(result.path, result.path[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+            self.assertEqual(grid[b[1]][b[0]], 0)
+        self.assertGreaterEqual(len(result.path), shortest)
+        self.assertLessEqual(len(result.path), shortest * 1.2)
+        for row in range(25, 30):
+            place_obstacle(grid, row, 14)
+        self.assertEqual(ai.hpa_star((0, 0), (29, 0), grid).path, [])
+
+    def test_hpa_star_rebuilds_only_affected_clusters(self):
+        grid = [[0] * 30 for _ in range(30)]
+        planner = HierarchicalPlanner(FlatGrid.from_rows(grid), cluster_size=10)
+        place_obstacle(grid, 15, 15)
+        dropped = planner.sync(FlatGrid.from_rows(grid))
+        self.assertEqual(dropped, {(1, 1), (0, 1), (2, 1), (1, 0), (1, 2)})
+        self.assertEqual(planner.sync(FlatGrid.from_rows(grid)), set())
+
+    def test_landmarks_guide_a_star_around_walls(self):
+        # a long wall between start and goal: Manhattan distance sends A* into the dead end
+        grid = [[0] * 20 for _ in range(20)]
+        for row in range(19):
+            grid[row][10] = 1
+        plain = SnakeAI(turn_penalty=0.0, trace="visited")
+        guided = SnakeAI(turn_penalty=0.0, trace="visited", landmarks=4)
+        expected = plain.a_star((9, 0), (11, 0), grid)
+        result = guided.a_star((9, 0), (11, 0), grid)
+        self.assertEqual(len(result.path), len(expected.path))
+        self.assertLess(len(result.visited_order), len(expected.visited_order))
+        table = guided.landmark_table(grid)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.nbytes(), 4 * len(table.distances[0]) * table.distances[0].itemsize)
+        self.assertIs(guided.landmark_table(grid), table)
+        grid[19][10] = 1
+        self.assertIsNot(guided.landmark_table(grid), table)
+        self.assertIsNone(plain.landmark_table(grid))
+
+    def test_anytime_improves_to_optimal_within_budgets(self):
+        grid = self.create_test_grid()
+        for row in range(1, 10):
+            grid[row][3] = 1
+            grid[9 - row][6] = 1
+        ai = SnakeAI(turn_penalty=1.0)
+        optimal = self.path_cost(ai.a_star_heading((0, 9), (9, 0), grid).path, 1.0)
+        search = ai.anytime((0, 9), (9, 0), grid, weight=4.0)
+        costs = []
+        while True:
+            result = search.improve(max_expansions=5)
+            if result.path:
+                self.assertAlmostEqual(self.path_cost(result.path, 1.0), result.cost)
+                self.assertLessEqual(result.cost, result.bound * optimal + 1e-9)
+                costs.append(result.cost)
+            if result.done:
+                break
+        self.assertEqual(costs, sorted(costs, reverse=True))
+        self.assertEqual((result.cost, result.bound), (optimal, 1.0))
+        self.assertFalse(ai.anytime((0, 0), (5, 5), grid).improve(max_expansions=0).path)
+
+    def test_stats_count_search_without_changing_it(self):
+        grid = self.create_test_grid()
+        place_obstacle(grid, 3, 3)
+        expanded, pushed = [], []
+        stats = SearchStats(on_expand=expanded.append, on_push=pushed.append)
+        plain = self.ai.a_star((0, 0), (5, 5), grid)
+        result = SnakeAI(stats=stats).a_star((0, 0), (5, 5), grid)
+        self.assertEqual((result.path, result.visited_order), (plain.path, plain.visited_order))
+        self.assertEqual(expanded, result.visited_order)
+        self.assertEqual(stats.expansions, len(result.visited_order))
+        self.assertEqual(stats.pushes, len(pushed))
+        self.assertIn((1, 0), pushed)
+        self.assertGreater(stats.relaxations, 0)
+        self.assertGreater(stats.peak_frontier, 0)
+        self.assertGreater(stats.wall_time, 0.0)
+        # with stats attached the cache is bypassed, so every query is counted
+        cached = SnakeAI(cache_size=4, stats=stats)
+        cached.a_star((0, 0), (1, 1), grid)
+        cached.a_star((0, 0), (5, 5), grid)
+        cached.a_star((0, 0), (1, 1), grid)
+        self.assertEqual(stats.expansions, len(self.ai.a_star((0, 0), (1, 1), grid).visited_order))
+        self.assertEqual(len(cached.cache), 0)
+
+    def test_solve_many_matches_single_queries_in_order(self):
+        grid = self.create_test_grid()
+        for row in range(8):
+            place_obstacle(grid, row, 4)
+        queries = [((0, 0), (9, 9)), ((9, 0), (0, 9)), ((3, 3), (3, 3)), ((0, 0), (20, 20)), ((5, 9), (0, 0))]
+        expected = [self.ai.a_star(start, goal, grid).path for start, goal in queries]
+        for workers in (0, 2):
+            results = list(self.ai.solve_many(queries, grid, workers=workers, chunk_size=2))
+            self.assertEqual([result.path for result in results], expected)
+            self.assertEqual(results[0].visited_order, [])
+        traced = list(self.ai.solve_many(queries[:2], grid, "bfs", workers=2, trace="visited"))
+        self.assertEqual(traced[1].visited_order, self.ai.bfs((9, 0), (0, 9), grid).visited_order)
+        with self.assertRaises(ValueError):
+            self.ai.solve_many(queries, grid, "greedy")
+
+    def test_components_fail_sealed_off_goals_without_searching(self):
+        grid = self.create_test_grid()
+        for x in range(10):
+            place_obstacle(grid, 6, x)
+        stats = SearchStats()
+        ai = SnakeAI(components=True, stats=stats)
+        for name in ("bfs", "a_star", "d_star_lite"):
+            result = getattr(ai, name)((0, 0), (5, 9), grid)
+            self.assertEqual((result.path, result.visited_order, stats.expansions), ([], [], 0))
+        self.assertTrue(ai.stepper("ucs", (0, 0), (5, 9), grid).done)
+        self.assertEqual(ai.a_star((0, 0), (5, 5), grid).path, self.ai.a_star((0, 0), (5, 5), grid).path)
+        # opening the wall merges the two components without a rebuild
+        grid[6][3] = 0
+        self.assertTrue(ai.a_star((0, 0), (5, 9), grid).path)
+
+    def test_cooperative_agents_avoid_each_other(self):
+        # two agents swapping ends of a corridor with one passing bay
+        grid = [[1] * 7 for _ in range(3)]
+        grid[1] = [0] * 7
+        grid[2][3] = 0
+        planner = self.ai.cooperative([((0, 1), (6, 1)), ((6, 1), (0, 1))], grid, window=8)
+        before = planner.locations()
+        for _ in range(30):
+            if planner.done:
+                break
+            planner.step()
+            after = planner.locations()
+            self.assertNotEqual(after[0], after[1])
+            self.assertFalse(after[0] == before[1] and after[1] == before[0])
+            before = after
+        self.assertTrue(planner.done)
+        self.assertEqual(planner.locations(), [(6, 1), (0, 1)])
+        # alone, an agent walks a shortest path
+        alone = self.ai.cooperative([((0, 0), (9, 9))], self.create_test_grid())
+        self.assertEqual(alone.run(100), 18)
+        with self.assertRaises(ValueError):
+            self.ai.cooperative([((0, 0), (9, 9)), ((0, 0), (5, 5))], self.create_test_grid())
+
+    def path_cost(self, path, penalty):
+        turns = sum(
+            1
+            for a, b, c in zip(path, path[1:], path[2:])
+            if (b[0] - a[0], b[1] - a[1]) != (c[0] - b[0], c[1] - b[1])
+        )
+        return len(path) - 1 + penalty * turns
+
     def create_test_grid(self):
         # Create a simple grid for testing
         return [[0 for _ in range(10)] for _ in range(10)]  # 10x10 grid with no obstacles
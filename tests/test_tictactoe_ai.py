@@ -1,6 +1,9 @@
 import unittest
+from time import perf_counter
 
 from src.game.tictactoe.ai import TicTacToeAI
+from src.utils.executor import CancelToken, SearchCancelled
+from src.utils.stats import SearchStats
 
 
 class TestTicTacToeAI(unittest.TestCase):
@@ -36,6 +39,73 @@ class TestTicTacToeAI(unittest.TestCase):
         self.assertIsNone(result.move)
         self.assertEqual(result.score, 0)
 
+    def test_stats_match_nodes_explored(self) -> None:
+        board = [
+            ["X", "", ""],
+            ["", "O", ""],
+            ["", "", ""],
+        ]
+        moves = []
+        stats = SearchStats(on_push=moves.append)
+        result = TicTacToeAI(stats=stats).best_move(board)
+        self.assertEqual(result.move, self.ai.best_move(board).move)
+        self.assertIs(result.stats, stats)
+        self.assertEqual(stats.expansions, result.nodes_explored)
+        self.assertEqual(stats.pushes, len(moves))
+        self.assertGreater(stats.stale_pops, 0)
+        self.assertLessEqual(stats.peak_frontier, 8)
+        self.assertIsNone(self.ai.best_move(board).stats)
+
+    def test_cancelled_search_restores_board(self) -> None:
+        board = [["X", "", "", ""], ["", "", "", ""], ["", "", "", ""], ["", "", "", ""]]
+        snapshot = [row[:] for row in board]
+        token = CancelToken()
+        calls = []
+
+        def observe(move) -> None:
+            calls.append(move)
+            if len(calls) == 50:
+                token.cancel()
+
+        ai = TicTacToeAI(stats=SearchStats(on_push=observe))
+        with self.assertRaises(SearchCancelled):
+            ai.best_move(board, token)
+        self.assertEqual(board, snapshot)
+
+    def test_larger_board_wins(self) -> None:
+        self.assertTrue(self.ai.check_winner([["O"] * 4 if i == 2 else [""] * 4 for i in range(4)], "O"))
+        self.assertTrue(self.ai.check_winner([["X" if i + j == 3 else "" for j in range(4)] for i in range(4)], "X"))
+        board = [
+            ["O", "O", "O", ""],
+            ["X", "X", "X", ""],
+            ["X", "", "", ""],
+            ["", "", "", ""],
+        ]
+        self.assertEqual(self.ai.best_move(board).move, (0, 3))
+
+
+    def test_deadline_bounds_larger_boards(self) -> None:
+        board = [[""] * 4 for _ in range(4)]
+        began = perf_counter()
+        result = self.ai.best_move(board, CancelToken(perf_counter() + 0.2))
+        self.assertLess(perf_counter() - began, 1.0)
+        self.assertIsNotNone(result.move)
+        self.assertEqual(board, [[""] * 4 for _ in range(4)])
+        # a threat within the passes that fit is still blocked
+        board = [["X", "X", "X", ""], ["O", "", "", ""], ["O", "", "", ""], ["", "", "", ""]]
+        self.assertEqual(self.ai.best_move(board, CancelToken(perf_counter() + 0.2)).move, (0, 3))
+
+    def test_deadline_keeps_small_boards_exact(self) -> None:
+        board = [
+            ["X", "", ""],
+            ["", "O", ""],
+            ["", "", "X"],
+        ]
+        exact = self.ai.best_move(board)
+        deepened = self.ai.best_move(board, CancelToken(perf_counter() + 10))
+        self.assertEqual(deepened.score, exact.score)
+        self.assertIsNone(self.ai.best_move([["X", "O", "X"], ["X", "X", "O"], ["O", "X", "O"]], CancelToken(0)).move)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file